@@ -1,54 +1,40 @@
+import time
+STARTUP_START = time.perf_counter()  # Titik nol laporan waktu startup, sebelum impor PyQt6
 import sys
-import json
 import re
+import threading
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-    QMessageBox, QComboBox, QLabel, QDateEdit, QHeaderView, QSpacerItem, QSizePolicy, QInputDialog
+    QLineEdit, QPushButton, QTableView, QGridLayout,
+    QMessageBox, QComboBox, QLabel, QDateEdit, QHeaderView, QSpacerItem, QSizePolicy, QInputDialog,
+    QDialog, QTableWidget, QTableWidgetItem, QFileDialog
 )
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QColor, QPalette
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib import cm
-import numpy as np
-
-# Nama file untuk menyimpan data transaksi dan konfigurasi target tabungan
-DB_FILE = 'database.json'
-CONFIG_FILE = 'config.json'
-
-# Stack undo untuk menyimpan transaksi yang dapat dibatalkan
-undo_stack = []
-
-# Fungsi memuat data transaksi dari file JSON
-def load_data():
-    try:
-        with open(DB_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Jika file tidak ada atau corrupt, kembalikan list kosong
-        return []
-
-# Fungsi menyimpan data transaksi ke file JSON
-def save_data(data):
-    with open(DB_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
-# Fungsi memuat konfigurasi target tabungan dari file JSON
-def load_config():
-    try:
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Jika file tidak ada, buat konfigurasi default
-        conf = {'target_tabungan': 0}
-        save_config(conf)
-        return conf
-
-# Fungsi menyimpan konfigurasi target tabungan ke file JSON
-def save_config(conf):
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(conf, f, indent=2)
+from PyQt6.QtCore import Qt, QDate, QAbstractTableModel, QModelIndex, QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QPalette, QImage, QPixmap, QKeySequence, QShortcut
+
+# Seluruh logika data (penyimpanan, filter, total, peringatan) ada di paket keuangan
+from keuangan import (
+    LedgerEngine, PhaseTimer, match_filters, PROFILER, profiled, format_rupiah, parse_nominal, read_import, export_transactions, SEMUA,
+    PEMASUKAN_CATEGORIES, PENGELUARAN_CATEGORIES, BOROS_LIMIT_HARI, BOROS_BATAS_HARIAN,
+)
+
+# Perubahan kontrol filter ditunda sebentar agar beberapa perubahan beruntun cukup diproses sekali
+FILTER_DEBOUNCE_MS = 150
+
+# Jumlah transaksi terbaru yang ditampilkan selagi seluruh riwayat dimuat di background
+RECENT_PAGE_SIZE = 200
+
+# Perubahan dengan transaksi lebih banyak dari ini (misalnya impor) menyusun ulang tabel sekaligus,
+# bukan disisipkan satu per satu
+TABLE_DELTA_LIMIT = 1000
+
+# Panel performa tersembunyi, dibuka dengan shortcut ini dan diperbarui setiap interval
+PERFORMANCE_SHORTCUT = "Ctrl+Shift+P"
+PERFORMANCE_REFRESH_MS = 500
+
+# Nama perintah di riwayat undo/redo untuk pesan ke pengguna
+HISTORY_LABELS = {'add': "Penambahan transaksi", 'edit': "Edit transaksi",
+                  'delete': "Penghapusan transaksi", 'import': "Impor transaksi"}
 
 # Kelas input khusus yang memformat angka menjadi format Rupiah, misalnya 1000000 -> 1.000.000
 class RupiahLineEdit(QLineEdit):
@@ -86,6 +72,110 @@ class RupiahLineEdit(QLineEdit):
 
         self._processing = False
 
+# Model tabel transaksi. Isi sel baru dihitung di data() ketika view memintanya,
+# yaitu hanya untuk baris yang sedang terlihat, sehingga ganti filter tidak membuat ribuan item
+class TransaksiTableModel(QAbstractTableModel):
+    HEADERS = ["Jenis", "Kategori", "Nominal", "Tanggal"]
+
+    def __init__(self):
+        super().__init__()
+        self._rows = []
+        self._owned = False  # False selama _rows masih list yang sama dengan cache engine
+        self._row_of = None  # id -> nomor baris, dibangun saat pertama dicari
+
+    # Ganti seluruh isi tabel dengan list transaksi baru
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self._owned = False
+        self._row_of = None
+        self.endResetModel()
+
+    # Nomor baris transaksi dengan id ini, None jika tidak tampil. Peta id -> baris dibangun
+    # sekali dan diperbarui saat baris ditambah di akhir; sisipan atau hapus di tengah (yang
+    # menggeser nomor baris sesudahnya) membuatnya dibangun ulang pada pencarian berikutnya
+    def row_of(self, transaksi_id):
+        if self._row_of is None:
+            self._row_of = {t.id: row for row, t in enumerate(self._rows)}
+        return self._row_of.get(transaksi_id)
+
+    # List baris milik tabel sendiri. Disalin sekali sebelum diubah per baris, karena list dari
+    # engine bisa dipakai bersama cache filter atau ekspor yang sedang berjalan
+    def own_rows(self):
+        if not self._owned:
+            self._rows = list(self._rows)
+            self._owned = True
+        return self._rows
+
+    # Posisi transaksi (atau tempat sisipnya) pada baris yang urut (tanggal, id)
+    def position(self, transaksi):
+        key = (transaksi.tanggal, transaksi.id)
+        lo, hi = 0, len(self._rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (self._rows[mid].tanggal, self._rows[mid].id) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # Perubahan per baris, view hanya menggambar ulang baris yang terkena
+    def insert_row(self, row, transaksi):
+        self.beginInsertRows(QModelIndex(), row, row)
+        rows = self.own_rows()
+        rows.insert(row, transaksi)
+        if self._row_of is not None:
+            if row == len(rows) - 1:
+                self._row_of[transaksi.id] = row
+            else:
+                self._row_of = None
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        rows = self.own_rows()
+        transaksi = rows.pop(row)
+        if self._row_of is not None:
+            if row == len(rows):
+                self._row_of.pop(transaksi.id, None)
+            else:
+                self._row_of = None
+        self.endRemoveRows()
+
+    def replace_row(self, row, transaksi):
+        rows = self.own_rows()
+        if self._row_of is not None:
+            self._row_of.pop(rows[row].id, None)
+            self._row_of[transaksi.id] = row
+        rows[row] = transaksi
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        transaksi = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return transaksi['jenis']
+        if column == 1:
+            return transaksi['kategori']
+        if column == 2:
+            return format_rupiah(transaksi['nominal'])
+        return transaksi['tanggal']
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return section + 1
+
 # Dialog input dengan gaya khusus untuk input target tabungan
 class CustomInputDialog(QInputDialog):
     def __init__(self, *args, **kwargs):
@@ -113,34 +203,220 @@ class CustomInputDialog(QInputDialog):
             }
         """)
 
+# Laporan bulan ke bulan dari rollup bulanan engine, bisa dipersempit ke satu jenis/kategori
+# untuk melihat tren kategori tersebut
+class MonthlyReportDialog(QDialog):
+    COLUMNS = ["Bulan", "Pemasukan", "Pengeluaran", "Selisih", "Perubahan Pengeluaran", "Jumlah Transaksi"]
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.setWindowTitle("Laporan Bulanan")
+        self.resize(800, 500)
+
+        self.jenis_combo = QComboBox()
+        self.jenis_combo.addItems(["Semua", "pemasukan", "pengeluaran"])
+        self.kategori_combo = QComboBox()
+        self.jenis_combo.currentTextChanged.connect(self.update_kategori_options)
+        self.kategori_combo.currentTextChanged.connect(self.refresh)
+
+        self.tabel = QTableWidget(0, len(self.COLUMNS))
+        self.tabel.setHorizontalHeaderLabels(self.COLUMNS)
+        self.tabel.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.tabel.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.tabel.verticalHeader().setVisible(False)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Jenis:"))
+        filter_layout.addWidget(self.jenis_combo)
+        filter_layout.addWidget(QLabel("Kategori:"))
+        filter_layout.addWidget(self.kategori_combo)
+        layout = QVBoxLayout(self)
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.tabel)
+        self.update_kategori_options()
+
+    def update_kategori_options(self):
+        jenis = self.jenis_combo.currentText()
+        self.kategori_combo.blockSignals(True)
+        self.kategori_combo.clear()
+        self.kategori_combo.addItem("Semua")
+        if jenis in ("Semua", "pemasukan"):
+            self.kategori_combo.addItems(PEMASUKAN_CATEGORIES)
+        if jenis in ("Semua", "pengeluaran"):
+            self.kategori_combo.addItems([k for k in PENGELUARAN_CATEGORIES if k not in PEMASUKAN_CATEGORIES])
+        self.kategori_combo.blockSignals(False)
+        self.refresh()
+
+    # Satu baris per bulan, bulan terbaru di atas
+    def refresh(self):
+        laporan = self.engine.monthly_report(self.jenis_combo.currentText(), self.kategori_combo.currentText())
+        self.tabel.setRowCount(len(laporan))
+        sebelumnya = None
+        for i, (bulan, pemasukan, pengeluaran, jumlah) in enumerate(laporan):
+            if sebelumnya:
+                perubahan = f"{100 * (pengeluaran - sebelumnya) / sebelumnya:+.1f}%"
+            else:
+                perubahan = "-"
+            sebelumnya = pengeluaran
+            nilai = [bulan, f"Rp {format_rupiah(pemasukan)}", f"Rp {format_rupiah(pengeluaran)}",
+                     f"Rp {format_rupiah(pemasukan - pengeluaran)}", perubahan, str(jumlah)]
+            for kolom, teks in enumerate(nilai):
+                item = QTableWidgetItem(teks)
+                if kolom > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tabel.setItem(len(laporan) - 1 - i, kolom, item)
+
+# Panel performa: jumlah panggilan dan latensi setiap titik ukur di PROFILER, diperbarui terus
+# selama panel terbuka. Profiler dinyalakan saat panel dibuka dan bisa diekspor sebagai file trace
+class PerformanceDialog(QDialog):
+    COLUMNS = ["Titik Ukur", "Jumlah", "Total (ms)", "Rata-rata (ms)", "p50 (ms)", "p95 (ms)", "Maks (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Performa")
+        self.resize(760, 360)
+        PROFILER.enabled = True
+
+        self.tabel = QTableWidget(0, len(self.COLUMNS))
+        self.tabel.setHorizontalHeaderLabels(self.COLUMNS)
+        self.tabel.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.tabel.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.tabel.verticalHeader().setVisible(False)
+
+        self.rekam_btn = QPushButton()
+        self.rekam_btn.clicked.connect(self.toggle_recording)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        trace_btn = QPushButton("Ekspor Trace")
+        trace_btn.clicked.connect(self.export_trace)
+
+        tombol_layout = QHBoxLayout()
+        tombol_layout.addWidget(self.rekam_btn)
+        tombol_layout.addWidget(reset_btn)
+        tombol_layout.addWidget(trace_btn)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.tabel)
+        layout.addLayout(tombol_layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(PERFORMANCE_REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+        self.refresh()
+
+    def toggle_recording(self):
+        PROFILER.enabled = not PROFILER.enabled
+        self.refresh()
+
+    def reset(self):
+        PROFILER.reset()
+        self.refresh()
+
+    # Trace dalam format Chrome trace event, bisa dibuka di chrome://tracing atau ui.perfetto.dev
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Ekspor Trace", "trace.json", "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            jumlah = PROFILER.export_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Peringatan", f"Gagal mengekspor trace: {e}")
+            return
+        QMessageBox.information(self, "Informasi", f"{jumlah} event trace diekspor ke {path}")
+
+    def refresh(self):
+        self.rekam_btn.setText("Berhenti Merekam" if PROFILER.enabled else "Mulai Merekam")
+        baris = [(nama, str(jumlah), *(f"{nilai:.2f}" for nilai in nilai_ms))
+                 for nama, jumlah, *nilai_ms in PROFILER.stats()]
+        baris += [(nama, str(jumlah), "", "", "", "", "") for nama, jumlah in sorted(PROFILER.counters.items())]
+        self.tabel.setRowCount(len(baris))
+        for i, nilai in enumerate(baris):
+            for kolom, teks in enumerate(nilai):
+                item = QTableWidgetItem(teks)
+                if kolom > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tabel.setItem(i, kolom, item)
+
+# Jembatan sinyal Qt untuk PersistenceWorker: callback dari thread penyimpanan dipancarkan
+# sebagai sinyal, sehingga slot-nya dijalankan di thread GUI
+class PersistenceSignals(QObject):
+    saved = pyqtSignal(float, int)
+    failed = pyqtSignal(str)
+
+# Jembatan sinyal Qt untuk pemuatan data di background
+class LoaderSignals(QObject):
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    batch = pyqtSignal(object)
+    progress = pyqtSignal(int)  # Persen
+
+# Jembatan sinyal Qt untuk impor CSV yang dibaca dan divalidasi di background
+class ImportSignals(QObject):
+    done = pyqtSignal(object, object)  # baris valid, baris yang dilewati
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(int)  # Persen
+
+# Jembatan sinyal Qt untuk ekspor yang ditulis di background
+class ExportSignals(QObject):
+    done = pyqtSignal(int, str)  # jumlah transaksi, file tujuan
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(int)  # Persen
+
+# Jembatan sinyal Qt untuk ChartWorker: gambar diagram dari thread penggambar ke thread GUI
+class ChartSignals(QObject):
+    rendered = pyqtSignal(bytes, int, int, float)
+
 # Kelas utama aplikasi keuangan MHS
 class MHSApp(QWidget):
-    BOROS_LIMIT_HARI = 7  # Durasi hari berturut-turut untuk peringatan boros
-    BOROS_BATAS_HARIAN = 1000000  # Batas pengeluaran harian disebut boros
-
-    # Daftar kategori pemasukan dan pengeluaran standar
-    PEMASUKAN_CATEGORIES = [
-        "Uang bulanan", "Beasiswa", "Freelance",
-        "Jualan", "Bonus", "Investasi", "Lainnya"
-    ]
-    PENGELUARAN_CATEGORIES = [
-        "Makan & Minum", "Kos / Sewa Tempat Tinggal", "Transportasi",
-        "Kuota / Internet", "Alat Kuliah", "Uang Kuliah / SPP",
-        "Hiburan", "Belanja Pribadi", "Cicilan / Hutang",
-        "Tabungan / Investasi", "Lainnya"
-    ]
+    BOROS_LIMIT_HARI = BOROS_LIMIT_HARI
+    BOROS_BATAS_HARIAN = BOROS_BATAS_HARIAN
+    PEMASUKAN_CATEGORIES = PEMASUKAN_CATEGORIES
+    PENGELUARAN_CATEGORIES = PENGELUARAN_CATEGORIES
 
-    def __init__(self):
+    def __init__(self, startup=None):
         super().__init__()
         self.setWindowTitle("Catatan Keuangan Mahasiswa")
         self.setGeometry(100, 100, 900, 700)
-
-        # Muat data dan konfigurasi saat aplikasi dijalankan
-        self.transaksi_data = load_data()
-        self.filtered_data = self.transaksi_data.copy()
-        self.config = load_config()
+        self.startup = startup if startup is not None else PhaseTimer()
+
+        # Muat konfigurasi saat aplikasi dijalankan. Hasil penyimpanan di background
+        # dikirim lewat sinyal agar ditangani di thread GUI
+        self.persist_signals = PersistenceSignals()
+        self.engine = LedgerEngine(on_saved=self.persist_signals.saved.emit,
+                                   on_failed=self.persist_signals.failed.emit, load=False)
+        self.config = self.engine.config
+        self.transaksi_data = self.engine.transaksi  # dict id -> transaksi, dibagi dengan engine
+        # Setiap perubahan buku kas diterapkan ke tampilan lewat on_ledger_changed
+        self.engine.changes.subscribe(self.on_ledger_changed)
+        self.startup.mark("konfigurasi & penyimpanan")
+
+        # Jendela langsung tampil dengan halaman transaksi terbaru (jika backend bisa mengambilnya
+        # dengan cepat), sementara seluruh riwayat dimuat di background
+        self.filtered_data = self.engine.load_recent(RECENT_PAGE_SIZE) or []
+        self.current_filters = None  # Filter terakhir yang diterapkan ke tabel
+        self.startup.mark("halaman terbaru")
+
+        # Timer debounce: semua perubahan kontrol filter berujung pada satu kali apply_filters
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
 
         self.init_ui()
+        self.startup.mark("susun jendela")
+
+        self.loader_signals = LoaderSignals()
+        self.loader_signals.loaded.connect(self.on_data_loaded)
+        self.loader_signals.failed.connect(self.on_load_failed)
+        self.loader_signals.batch.connect(self.on_load_batch)
+        self.loader_signals.progress.connect(self.on_load_progress)
+        self.set_loading(True)
+        self.engine.load_in_background(
+            self.loader_signals.loaded.emit, self.loader_signals.failed.emit,
+            on_batch=self.loader_signals.batch.emit,
+            on_progress=lambda selesai, total: self.loader_signals.progress.emit(100 * selesai // max(total, 1)))
+        QTimer.singleShot(0, lambda: self.startup.mark("jendela tampil"))
 
     def init_ui(self):
         # Atur style tampilan standar
@@ -179,8 +455,13 @@ class MHSApp(QWidget):
         self.tambah_btn = self.create_styled_button("Tambah Transaksi")
         self.tambah_btn.clicked.connect(self.add_transaction)
 
-        self.undo_btn = self.create_styled_button("Undo Transaksi Terakhir")
+        self.undo_btn = self.create_styled_button("Undo")
         self.undo_btn.clicked.connect(self.undo_transaction)
+        self.undo_btn.setShortcut(QKeySequence.StandardKey.Undo)
+
+        self.redo_btn = self.create_styled_button("Redo")
+        self.redo_btn.clicked.connect(self.redo_transaction)
+        self.redo_btn.setShortcut(QKeySequence.StandardKey.Redo)
 
         self.hapus_btn = self.create_styled_button("Hapus Transaksi Terpilih")
         self.hapus_btn.clicked.connect(self.delete_selected_transaction)
@@ -189,14 +470,27 @@ class MHSApp(QWidget):
         self.edit_btn.clicked.connect(self.edit_selected_transaction)
 
         self.chart_btn = self.create_styled_button("Tampilkan Diagram Lingkaran")
-        self.chart_btn.clicked.connect(self.show_pie_chart)
+        self.chart_btn.clicked.connect(self.toggle_pie_chart)
+
+        self.report_btn = self.create_styled_button("Laporan Bulanan")
+        self.report_btn.clicked.connect(self.show_monthly_report)
+
+        self.import_btn = self.create_styled_button("Impor CSV")
+        self.import_btn.clicked.connect(self.import_transactions)
+
+        self.export_btn = self.create_styled_button("Ekspor Tampilan")
+        self.export_btn.clicked.connect(self.export_transactions)
 
         btn_input_layout = QHBoxLayout()
         btn_input_layout.addWidget(self.tambah_btn)
         btn_input_layout.addWidget(self.edit_btn)
         btn_input_layout.addWidget(self.hapus_btn)
         btn_input_layout.addWidget(self.undo_btn)
+        btn_input_layout.addWidget(self.redo_btn)
         btn_input_layout.addWidget(self.chart_btn)
+        btn_input_layout.addWidget(self.report_btn)
+        btn_input_layout.addWidget(self.import_btn)
+        btn_input_layout.addWidget(self.export_btn)
 
         # Filter data transaksi agar lebih mudah mencari
         filter_layout = QHBoxLayout()
@@ -205,22 +499,22 @@ class MHSApp(QWidget):
         self.filter_jenis_combo.addItem("Semua")  # Pilihan semua jenis
         self.filter_jenis_combo.addItems(["pemasukan", "pengeluaran"])
         self.filter_jenis_combo.currentTextChanged.connect(self.update_filter_kategori_options)
-        self.filter_jenis_combo.currentTextChanged.connect(self.apply_filters)
+        self.filter_jenis_combo.currentTextChanged.connect(self.schedule_filters)
 
         self.filter_kategori_combo = QComboBox()
         self.update_filter_kategori_options()
-        self.filter_kategori_combo.currentTextChanged.connect(self.apply_filters)
+        self.filter_kategori_combo.currentTextChanged.connect(self.schedule_filters)
 
         # Filter tanggal
         self.filter_tanggal_mulai = QDateEdit()
         self.filter_tanggal_mulai.setCalendarPopup(True)
         self.filter_tanggal_mulai.setDate(QDate.currentDate().addMonths(-1))  # Default 1 bulan lalu
-        self.filter_tanggal_mulai.dateChanged.connect(self.apply_filters)
+        self.filter_tanggal_mulai.dateChanged.connect(self.schedule_filters)
 
         self.filter_tanggal_akhir = QDateEdit()
         self.filter_tanggal_akhir.setCalendarPopup(True)
         self.filter_tanggal_akhir.setDate(QDate.currentDate())
-        self.filter_tanggal_akhir.dateChanged.connect(self.apply_filters)
+        self.filter_tanggal_akhir.dateChanged.connect(self.schedule_filters)
 
         # Tambahkan widgets ke layout filter
         filter_layout.addWidget(QLabel("Filter Jenis:"))
@@ -237,13 +531,29 @@ class MHSApp(QWidget):
         filter_layout.addWidget(self.filter_reset_btn)
 
         # Tabel menampilkan data transaksi lengkap
-        self.tabel = QTableWidget()
-        self.tabel.setColumnCount(4)
-        self.tabel.setHorizontalHeaderLabels(["Jenis", "Kategori", "Nominal", "Tanggal"])
-        self.tabel.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.tabel.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table_model = TransaksiTableModel()
+        self.tabel = QTableView()
+        self.tabel.setModel(self.table_model)
+        self.tabel.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.tabel.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.tabel.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
+        # Footer total pemasukan dan pengeluaran, terpisah dari tabel agar selalu terlihat
+        self.label_total_pemasukan = QLabel("Rp 0")
+        self.label_total_pengeluaran = QLabel("Rp 0")
+        footer = QWidget()
+        footer.setObjectName("footerTotal")
+        footer.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        footer_layout = QGridLayout(footer)
+        footer_layout.setContentsMargins(8, 4, 8, 4)
+        for row, (judul, label_total) in enumerate([("Total Pemasukan", self.label_total_pemasukan),
+                                                    ("Total Pengeluaran", self.label_total_pengeluaran)]):
+            label_judul = QLabel(judul)
+            label_judul.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            label_total.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            footer_layout.addWidget(label_judul, row, 0)
+            footer_layout.addWidget(label_total, row, 1)
+
         # Label informasi saldo dan target tabungan
         self.label_saldo = QLabel("Saldo: Rp 0")
         self.label_target = QLabel("Target Tabungan Bulanan: Rp {:,}".format(self.config.get('target_tabungan', 0)))
@@ -271,20 +581,47 @@ class MHSApp(QWidget):
         saldo_layout.addWidget(self.label_target)
         saldo_layout.addWidget(self.label_sisa_target)
         saldo_layout.addWidget(target_btn)
+
+        # Status penyimpanan di background
+        self.label_status_simpan = QLabel("")
+        self.persist_signals.saved.connect(self.on_persist_saved)
+        self.persist_signals.failed.connect(self.on_persist_failed)
+        saldo_layout.addWidget(self.label_status_simpan)
         saldo_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum))
 
+        # Diagram lingkaran tertanam di jendela, tersembunyi sampai tombol diagram ditekan.
+        # Gambarnya dibuat di thread terpisah dan ditampilkan sebagai pixmap
+        self.chart_label = QLabel()
+        self.chart_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.chart_label.setMinimumHeight(320)
+        self.chart_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
+        self.chart_label.setVisible(False)
+        self.chart_worker = None
+        self.chart_image = None
+        self.chart_resize_timer = QTimer(self)
+        self.chart_resize_timer.setSingleShot(True)
+        self.chart_resize_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.chart_resize_timer.timeout.connect(self.refresh_pie_chart)
+
+        # Panel performa tersembunyi (lihat show_performance_panel)
+        self.performance_dialog = None
+        self.performance_shortcut = QShortcut(QKeySequence(PERFORMANCE_SHORTCUT), self)
+        self.performance_shortcut.activated.connect(self.show_performance_panel)
+
         # Tambahkan semua layout ke layout utama
         main_layout.addLayout(form_layout)
         main_layout.addLayout(btn_input_layout)
         main_layout.addSpacing(20)
         main_layout.addLayout(filter_layout)
         main_layout.addWidget(self.tabel)
+        main_layout.addWidget(footer)
+        main_layout.addWidget(self.chart_label)
         main_layout.addLayout(saldo_layout)
 
         self.setLayout(main_layout)
 
-        # Tampilkan data transaksi awal
-        self.display_data(self.transaksi_data)
+        # Tampilkan halaman transaksi terbaru, seluruh data menyusul setelah selesai dimuat
+        self.display_data(self.filtered_data)
 
     # Membuat tombol dengan style konsisten
     def create_styled_button(self, text):
@@ -360,15 +697,21 @@ class MHSApp(QWidget):
                 color: black;
                 background-color: transparent;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 color: black;
                 gridline-color: #ddd;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #4caf50;
                 color: white;
             }
+            #footerTotal {
+                background-color: rgb(230, 230, 250);
+            }
+            #footerTotal QLabel {
+                font-weight: bold;
+            }
             QLineEdit {
                 background-color: white;
                 color: black;
@@ -402,113 +745,193 @@ class MHSApp(QWidget):
                 if target < 0:
                     raise ValueError
                 self.config['target_tabungan'] = target
-                save_config(self.config)
+                self.engine.save_config()
                 self.label_target.setText("Target Tabungan Bulanan: Rp {:,}".format(target))
                 self.update_sisa_target()
             except ValueError:
                 self.show_warning("Target harus berupa angka positif!")
 
-    # Mengupdate label sisa target tabungan berdasarkan saldo terkini
+    # Mengupdate label sisa target tabungan berdasarkan saldo terkini. Selama riwayat dimuat,
+    # saldo dijumlahkan dari sel rollup bulanan yang tersimpan
     def update_sisa_target(self):
-        saldo = self.calculate_saldo()
+        if not self.engine.reports_ready:
+            return
         target = self.config.get('target_tabungan', 0)
-        sisa = target - saldo
+        sisa = target - self.engine.saldo
         if sisa < 0:
             sisa = 0
         # Format angka untuk tampilan Rupiah
         self.label_sisa_target.setText(f"Sisa Untuk Target: Rp {sisa:,}".replace(',', '.'))
 
+    # Selama riwayat dimuat, tombol yang mengubah data atau butuh seluruh data dinonaktifkan
+    def set_loading(self, loading):
+        for button in [self.tambah_btn, self.edit_btn, self.hapus_btn, self.undo_btn, self.redo_btn,
+                       self.chart_btn, self.import_btn, self.export_btn]:
+            button.setEnabled(not loading)
+        # Laporan bulanan sudah bisa dibuka jika rollup tersimpan masih cocok dengan buku kas
+        self.report_btn.setEnabled(not loading or self.engine.reports_ready)
+        self.label_status_simpan.setText("Memuat riwayat transaksi..." if loading else "")
+
+    # Selama memuat, tabel diisi baris pertama yang sudah terurai sampai satu halaman penuh
+    def on_load_batch(self, batch):
+        if self.current_filters is not None:
+            return  # Tabel menampilkan (atau menunggu) hasil filter, bukan baris mentah
+        kurang = RECENT_PAGE_SIZE - len(self.filtered_data)
+        if kurang > 0:
+            self.display_data(self.filtered_data + batch[:kurang])
+
+    def on_load_progress(self, persen):
+        if not self.engine.loaded:
+            self.label_status_simpan.setText(f"Memuat riwayat transaksi... {persen}%")
+
+    # Seluruh riwayat selesai dimuat di background: pasang ke engine lalu terapkan filter
+    def on_data_loaded(self, records):
+        self.engine.attach(records)
+        self.set_loading(False)
+        # Tanpa filter yang disentuh selama memuat, tampilkan seluruh data seperti biasa
+        if self.current_filters is None:
+            self.display_data(list(self.transaksi_data.values()))
+        else:
+            self.apply_filters()
+        self.startup.mark("muat seluruh riwayat")
+        if '--startup-report' in sys.argv:
+            print(self.startup.report(), file=sys.stderr)
+
+    def on_load_failed(self, message):
+        self.label_status_simpan.setText("Gagal memuat data!")
+        self.show_warning(f"Gagal memuat data: {message}")
+
     # Menghitung saldo berdasarkan total pemasukan dikurangi pengeluaran
+    @profiled('calculate_saldo')
     def calculate_saldo(self):
-        total_pemasukan = sum(t['nominal'] for t in self.transaksi_data if t['jenis'] == 'pemasukan')
-        total_pengeluaran = sum(t['nominal'] for t in self.transaksi_data if t['jenis'] == 'pengeluaran')
-        saldo = total_pemasukan - total_pengeluaran
-        return saldo
+        return self.engine.saldo
 
-    # Menampilkan data transaksi ke tabel termasuk total pemasukan dan pengeluaran
+    # Menampilkan data transaksi ke tabel dan total pemasukan serta pengeluaran di footer
+    @profiled('display_data')
     def display_data(self, data):
         self.filtered_data = data
-        count_data = len(data)
-        # Buat baris untuk transaksi ditambah 2 baris tambahan untuk total
-        self.tabel.setRowCount(count_data + 2)
-
-        total_pemasukan = 0
-        total_pengeluaran = 0
-        for i, transaksi in enumerate(data):
-            # Isi baris tabel dengan data transaksi
-            self.tabel.setItem(i, 0, QTableWidgetItem(transaksi['jenis']))
-            self.tabel.setItem(i, 1, QTableWidgetItem(transaksi['kategori']))
-            self.tabel.setItem(i, 2, QTableWidgetItem(f"{transaksi['nominal']:,}".replace(',', '.')))
-            self.tabel.setItem(i, 3, QTableWidgetItem(transaksi['tanggal']))
-            if transaksi['jenis'] == 'pemasukan':
-                total_pemasukan += transaksi['nominal']
-            elif transaksi['jenis'] == 'pengeluaran':
-                total_pengeluaran += transaksi['nominal']
-
-        # Tambahkan baris total pemasukan dengan gaya khusus (non-editable, background khusus)
-        pemasukan_item = QTableWidgetItem("Total Pemasukan")
-        pemasukan_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        pemasukan_item.setFlags(Qt.ItemFlag.NoItemFlags)
-        total_pemasukan_item = QTableWidgetItem(f"Rp {total_pemasukan:,}".replace(',', '.'))
-        total_pemasukan_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        total_pemasukan_item.setFlags(Qt.ItemFlag.NoItemFlags)
-
-        kosong1 = QTableWidgetItem("")
-        kosong1.setFlags(Qt.ItemFlag.NoItemFlags)
-        kosong2 = QTableWidgetItem("")
-        kosong2.setFlags(Qt.ItemFlag.NoItemFlags)
-
-        row_pemasukan = count_data
-        self.tabel.setItem(row_pemasukan, 0, pemasukan_item)
-        self.tabel.setItem(row_pemasukan, 1, kosong1)
-        self.tabel.setItem(row_pemasukan, 2, total_pemasukan_item)
-        self.tabel.setItem(row_pemasukan, 3, kosong2)
-
-        # Tambahkan baris total pengeluaran dengan gaya yang sama
-        pengeluaran_item = QTableWidgetItem("Total Pengeluaran")
-        pengeluaran_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        pengeluaran_item.setFlags(Qt.ItemFlag.NoItemFlags)
-        total_pengeluaran_item = QTableWidgetItem(f"Rp {total_pengeluaran:,}".replace(',', '.'))
-        total_pengeluaran_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        total_pengeluaran_item.setFlags(Qt.ItemFlag.NoItemFlags)
-
-        kosong3 = QTableWidgetItem("")
-        kosong3.setFlags(Qt.ItemFlag.NoItemFlags)
-        kosong4 = QTableWidgetItem("")
-        kosong4.setFlags(Qt.ItemFlag.NoItemFlags)
-
-        row_pengeluaran = count_data + 1
-        self.tabel.setItem(row_pengeluaran, 0, pengeluaran_item)
-        self.tabel.setItem(row_pengeluaran, 1, kosong3)
-        self.tabel.setItem(row_pengeluaran, 2, total_pengeluaran_item)
-        self.tabel.setItem(row_pengeluaran, 3, kosong4)
-
-        # Beri warna dan font bold untuk baris total pemasukan dan pengeluaran
-        for r in (row_pemasukan, row_pengeluaran):
-            for c in range(4):
-                item = self.tabel.item(r, c)
-                if item:
-                    item.setBackground(QColor(230, 230, 250))  # Berwarna soft ungu
-                    font = item.font()
-                    font.setBold(True)
-                    item.setFont(font)
+        self.table_model.set_rows(data)
+
+        self.table_totals = self.footer_totals(data)
+        self.update_table_totals()
 
         # Update tampilan saldo dan sisa target tabungan
-        self.update_summary(total_pemasukan, total_pengeluaran)
+        self.update_summary()
         self.update_sisa_target()
 
-    # Update label saldo saat ini berdasarkan total pemasukan dan pengeluaran
-    def update_summary(self, total_pemasukan, total_pengeluaran):
-        saldo = total_pemasukan - total_pengeluaran
-        self.label_saldo.setText(f"Saldo: Rp {saldo:,}".replace(',', '.'))
+        # Diagram yang sedang tampil ikut diperbarui
+        if self.chart_label.isVisible() and self.engine.loaded:
+            self.refresh_pie_chart()
+
+    # Total footer untuk baris yang tampil. Seluruh data dan hasil filter dijawab engine (rollup,
+    # pushdown SQLite, kolom NumPy atau cache agregat) tanpa memindai barisnya; hanya halaman
+    # sebagian selama riwayat dimuat yang dijumlah per baris
+    def footer_totals(self, data):
+        if self.engine.loaded or (self.current_filters is not None and self.engine.can_query):
+            pemasukan, pengeluaran = self.engine.filter_totals(self.current_filters)
+            return {'pemasukan': pemasukan, 'pengeluaran': pengeluaran}
+        totals = {'pemasukan': 0, 'pengeluaran': 0}
+        for transaksi in data:
+            if transaksi['jenis'] in totals:
+                totals[transaksi['jenis']] += transaksi['nominal']
+        return totals
+
+    # Total pemasukan dan pengeluaran baris yang tampil di footer
+    def update_table_totals(self):
+        self.label_total_pemasukan.setText(f"Rp {format_rupiah(self.table_totals['pemasukan'])}")
+        self.label_total_pengeluaran.setText(f"Rp {format_rupiah(self.table_totals['pengeluaran'])}")
+
+    # Perubahan buku kas (tambah, edit, hapus, impor, undo, redo) diterapkan ke tampilan: baris
+    # tabel dan total footer yang terkena, saldo dan sisa target, peringatan untuk hari yang
+    # berubah, dan diagram hanya jika perubahan masuk filter diagram
+    def on_ledger_changed(self, event):
+        if len(event.changes) > TABLE_DELTA_LIMIT:
+            self.display_data(self.engine.query(self.current_filters) if self.current_filters is not None
+                              else list(self.transaksi_data.values()))
+        else:
+            self.apply_table_changes(event.changes)
+            self.update_summary()
+            self.update_sisa_target()
+            if self.chart_label.isVisible() and event.touches(self.chart_filters()):
+                self.refresh_pie_chart()
+        self.check_alerts(event.expense_days())
+
+    # Menyisipkan, menghapus atau mengganti baris tabel yang terkena perubahan. Dengan filter
+    # aktif baris urut tanggal (dicari dengan binary search); tanpa filter baris urut waktu tambah,
+    # dicari lewat peta id -> baris di model
+    def apply_table_changes(self, changes):
+        model = self.table_model
+        filters = self.current_filters
+        if filters is None:
+            self.apply_unfiltered_changes(changes)
+            return
+        for sebelum, sesudah in changes:
+            if sebelum is not None and match_filters(sebelum, filters):
+                row = model.position(sebelum)
+                if row < model.rowCount() and model.own_rows()[row].id == sebelum.id:
+                    model.remove_row(row)
+                    self.table_totals_add(sebelum, -1)
+            if sesudah is not None and match_filters(sesudah, filters):
+                model.insert_row(model.position(sesudah), sesudah)
+                self.table_totals_add(sesudah, 1)
+        self.filtered_data = model.own_rows()
+        self.update_table_totals()
+
+    # Tanpa filter: baris yang diedit diganti di tempat, baris yang dihapus dibuang dari bawah ke
+    # atas (nomor baris di atasnya tidak bergeser), lalu transaksi baru ditambahkan di akhir,
+    # sama dengan urutan data di engine. Peta id -> baris cukup dibangun paling banyak sekali
+    def apply_unfiltered_changes(self, changes):
+        model = self.table_model
+        hapus, tambah = [], []
+        for sebelum, sesudah in changes:
+            row = model.row_of(sebelum.id) if sebelum is not None else None
+            if row is not None:
+                self.table_totals_add(sebelum, -1)
+                if sesudah is None:
+                    hapus.append(row)
+                    continue
+                model.replace_row(row, sesudah)
+            elif sesudah is not None:
+                tambah.append(sesudah)
+            if sesudah is not None:
+                self.table_totals_add(sesudah, 1)
+        for row in sorted(hapus, reverse=True):
+            model.remove_row(row)
+        for transaksi in tambah:
+            model.insert_row(model.rowCount(), transaksi)
+        self.filtered_data = model.own_rows()
+        self.update_table_totals()
+
+    def table_totals_add(self, transaksi, tanda):
+        if transaksi.jenis in self.table_totals:
+            self.table_totals[transaksi.jenis] += tanda * transaksi.nominal
+
+    # Update label saldo saat ini dari total berjalan seluruh transaksi
+    def update_summary(self):
+        if not self.engine.loaded:
+            self.label_saldo.setText("Saldo: memuat...")
+            return
+        self.label_saldo.setText(f"Saldo: Rp {format_rupiah(self.engine.saldo)}")
+
+    def on_persist_saved(self, latency_ms, count):
+        self.label_status_simpan.setText(f"Tersimpan ({count} perubahan, {latency_ms:.0f} ms)")
 
-    # Mengubah string nominal format rupiah menjadi integer
-    def parse_int_nominal(self, nominal_text):
-        try:
-            clean_text = nominal_text.replace('.', '').strip()
-            return int(clean_text)
-        except:
-            return None
+    def on_persist_failed(self, message):
+        self.label_status_simpan.setText("Gagal menyimpan!")
+        self.show_warning(f"Gagal menyimpan data: {message}")
+
+    # Diagram yang tampil digambar ulang mengikuti ukuran jendela, setelah ukuran berhenti berubah
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.chart_label.isVisible():
+            self.chart_resize_timer.start()
+
+    # Tulis semua perubahan yang tertunda dan tutup backend penyimpanan sebelum aplikasi ditutup
+    def closeEvent(self, event):
+        if self.chart_worker is not None:
+            self.chart_worker.stop()
+        self.engine.close()
+        super().closeEvent(event)
 
     # Menambah transaksi baru berdasarkan input form
     def add_transaction(self):
@@ -518,34 +941,104 @@ class MHSApp(QWidget):
         tanggal_qdate = self.tanggal_input.date()
         tanggal = tanggal_qdate.toString("yyyy-MM-dd")
 
-        # Validasi input kategori tidak kosong
-        if not kategori:
-            self.show_warning("Kategori tidak boleh kosong!")
-            return
-
-        # Parsing nominal ke integer dan validasi positif
-        nominal = self.parse_int_nominal(nominal_text)
-        if nominal is None or nominal <= 0:
-            self.show_warning("Nominal harus berupa angka positif!")
+        # Validasi dan simpan lewat engine; pesan kesalahannya langsung ditampilkan. Tabel, saldo,
+        # target dan peringatan diperbarui oleh on_ledger_changed
+        try:
+            self.engine.add(jenis, kategori, parse_nominal(nominal_text), tanggal)
+        except ValueError as e:
+            self.show_warning(str(e))
             return
 
-        transaksi = {"jenis": jenis, "kategori": kategori, "nominal": nominal, "tanggal": tanggal}
-        self.transaksi_data.append(transaksi)  # Tambah ke data utama
-        undo_stack.append(transaksi)  # Tambah ke stack undo
-        save_data(self.transaksi_data)  # Simpan ke file
-
-        # Perbarui opsi kategori dan filter, reset input, terapkan filter ke tabel
-        self.update_kategori_options()
-        self.update_filter_kategori_options()
         self.reset_inputs()
-        self.apply_filters()
+        self.show_info("Transaksi berhasil ditambahkan.")
 
-        # Cek peringatan boros dan saldo negatif setelah tambah transaksi
-        self.check_boros_warning()
-        self.check_saldo_negatif()
+    # Impor transaksi dari file CSV (ekspor mutasi rekening) atau JSON Lines. File dibaca dan
+    # divalidasi di background, lalu seluruh baris valid ditambahkan sekaligus
+    def import_transactions(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Impor Transaksi", "",
+                                              "CSV (*.csv *.txt);;JSON Lines (*.jsonl *.ndjson);;Semua file (*)")
+        if not path:
+            return
+        self.import_signals = ImportSignals()
+        self.import_signals.done.connect(self.on_import_read)
+        self.import_signals.failed.connect(self.on_import_failed)
+        self.import_signals.progress.connect(
+            lambda persen: self.label_status_simpan.setText(f"Membaca file impor... {persen}%"))
+        self.import_btn.setEnabled(False)
+        self.label_status_simpan.setText("Membaca file impor...")
+        signals = self.import_signals
+
+        def run():
+            try:
+                rows, errors = read_import(
+                    path, progress=lambda selesai, total: signals.progress.emit(100 * selesai // max(total, 1)))
+            except (OSError, UnicodeDecodeError, ValueError) as e:
+                signals.failed.emit(str(e))
+                return
+            signals.done.emit(rows, errors)
+        threading.Thread(target=run, daemon=True).start()
+
+    # Semua baris valid ditambahkan dengan satu kali tulis, satu pembaruan index dan satu
+    # ChangeEvent; baris yang tidak valid dilaporkan
+    def on_import_read(self, rows, errors):
+        self.import_btn.setEnabled(True)
+        self.label_status_simpan.setText("")
+        try:
+            baru = self.engine.add_many(rows)
+        except ValueError as e:
+            self.show_warning(f"Impor dibatalkan. {e}")
+            return
 
-        self.update_sisa_target()
-        self.show_info("Transaksi berhasil ditambahkan.")
+        pesan = f"{len(baru)} transaksi berhasil diimpor."
+        if errors:
+            pesan += f"\n{len(errors)} baris dilewati:\n" + "\n".join(str(e) for e in errors[:5])
+            if len(errors) > 5:
+                pesan += f"\n... dan {len(errors) - 5} baris lainnya"
+        self.show_info(pesan)
+
+    def on_import_failed(self, message):
+        self.import_btn.setEnabled(True)
+        self.label_status_simpan.setText("")
+        self.show_warning(f"Gagal membaca file impor: {message}")
+
+    # Ekspor transaksi yang sedang tampil (filter aktif, atau seluruh data jika belum difilter)
+    # ke CSV atau JSON Lines. File ditulis per chunk di background
+    def export_transactions(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Ekspor Transaksi", "transaksi.csv",
+                                              "CSV (*.csv);;JSON Lines (*.jsonl)")
+        if not path:
+            return
+        if not path.lower().endswith(('.csv', '.jsonl', '.ndjson')):
+            path += '.csv'
+        total, chunks = self.engine.export_source(self.current_filters or SEMUA)
+        self.export_signals = ExportSignals()
+        self.export_signals.done.connect(self.on_export_done)
+        self.export_signals.failed.connect(self.on_export_failed)
+        self.export_signals.progress.connect(
+            lambda persen: self.label_status_simpan.setText(f"Mengekspor... {persen}%"))
+        self.export_btn.setEnabled(False)
+        signals = self.export_signals
+
+        def run():
+            try:
+                jumlah = export_transactions(
+                    chunks, path, total,
+                    progress=lambda selesai, total: signals.progress.emit(100 * selesai // max(total, 1)))
+            except (OSError, ValueError) as e:
+                signals.failed.emit(str(e))
+                return
+            signals.done.emit(jumlah, path)
+        threading.Thread(target=run, daemon=True).start()
+
+    def on_export_done(self, jumlah, path):
+        self.export_btn.setEnabled(True)
+        self.label_status_simpan.setText(f"{jumlah} transaksi diekspor")
+        self.show_info(f"{jumlah} transaksi berhasil diekspor ke {path}")
+
+    def on_export_failed(self, message):
+        self.export_btn.setEnabled(True)
+        self.label_status_simpan.setText("")
+        self.show_warning(f"Gagal mengekspor: {message}")
 
     # Reset field input setelah transaksi berhasil ditambahkan
     def reset_inputs(self):
@@ -556,40 +1049,37 @@ class MHSApp(QWidget):
             self.kategori_input.setCurrentIndex(0)
         self.tanggal_input.setDate(QDate.currentDate())
 
-    # Undo transaksi terakhir yang ditambahkan
+    # Undo perintah terakhir (tambah, edit, hapus atau impor)
     def undo_transaction(self):
-        if undo_stack:
-            last = undo_stack.pop()
-            try:
-                self.transaksi_data.remove(last)
-                save_data(self.transaksi_data)
-                self.apply_filters()
-                self.check_saldo_negatif()
-                self.update_sisa_target()
-                self.show_info("Transaksi terakhir berhasil di-undo.")
-            except ValueError:
-                self.show_warning("Transaksi terakhir tidak ditemukan.")
-        else:
-            self.show_info("Tidak ada transaksi yang bisa di-undo.")
+        command = self.engine.undo()
+        if command is None:
+            self.show_info("Tidak ada perubahan yang bisa di-undo.")
+            return
+        self.show_info(f"{HISTORY_LABELS[command[0]]} berhasil di-undo.")
 
-    # Mendapatkan index transaksi yang dipilih di tabel, disesuaikan dengan data yang difilter
-    def get_selected_transaction_index(self):
-        selected_items = self.tabel.selectedItems()
-        if not selected_items:
+    # Mengulang perintah yang terakhir di-undo
+    def redo_transaction(self):
+        command = self.engine.redo()
+        if command is None:
+            self.show_info("Tidak ada perubahan yang bisa di-redo.")
+            return
+        self.show_info(f"{HISTORY_LABELS[command[0]]} berhasil di-redo.")
+
+    # Mendapatkan id transaksi yang dipilih di tabel
+    def get_selected_transaction_id(self):
+        selected_rows = self.tabel.selectionModel().selectedRows()
+        if not selected_rows:
             return None
-        selected_row = selected_items[0].row()
+        selected_row = selected_rows[0].row()
         if selected_row >= len(self.filtered_data):
             return None
-        transaksi = self.filtered_data[selected_row]
-        try:
-            return self.transaksi_data.index(transaksi)  # Dapatkan index asli di data utama
-        except ValueError:
-            return None
+        transaksi_id = self.filtered_data[selected_row]['id']
+        return transaksi_id if transaksi_id in self.transaksi_data else None
 
     # Menghapus transaksi yang dipilih
     def delete_selected_transaction(self):
-        idx = self.get_selected_transaction_index()
-        if idx is None:
+        transaksi_id = self.get_selected_transaction_id()
+        if transaksi_id is None:
             self.show_warning("Tidak ada transaksi yang dipilih.")
             return
 
@@ -598,25 +1088,17 @@ class MHSApp(QWidget):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
 
         if reply == QMessageBox.StandardButton.Yes:
-            transaksi = self.transaksi_data.pop(idx)
-            if transaksi in undo_stack:
-                undo_stack.remove(transaksi)
-            save_data(self.transaksi_data)
-            self.update_kategori_options()
-            self.update_filter_kategori_options()
-            self.apply_filters()
-            self.check_saldo_negatif()
-            self.update_sisa_target()
+            self.engine.delete(transaksi_id)
             self.show_info("Transaksi berhasil dihapus.")
 
     # Mengedit transaksi yang dipilih melalui serangkaian dialog input
     def edit_selected_transaction(self):
-        idx = self.get_selected_transaction_index()
-        if idx is None:
+        transaksi_id = self.get_selected_transaction_id()
+        if transaksi_id is None:
             self.show_warning("Tidak ada transaksi yang dipilih.")
             return
 
-        transaksi = self.transaksi_data[idx]
+        transaksi = self.transaksi_data[transaksi_id]
 
         # Dialog edit jenis transaksi
         jenis_baru, ok1 = QInputDialog.getItem(
@@ -646,7 +1128,7 @@ class MHSApp(QWidget):
         nominal_baru_str, ok3 = QInputDialog.getText(self, "Edit Nominal", "Nominal:", text=nominal_lama_str)
         if not ok3:
             return
-        nominal_baru = self.parse_int_nominal(nominal_baru_str)
+        nominal_baru = parse_nominal(nominal_baru_str)
         if nominal_baru is None or nominal_baru <= 0:
             self.show_warning("Nominal harus berupa angka positif!")
             return
@@ -656,122 +1138,81 @@ class MHSApp(QWidget):
         tanggal_baru_str, ok4 = QInputDialog.getText(self, "Edit Tanggal", "Tanggal (YYYY-MM-DD):", text=tanggal_lama)
         if not ok4:
             return
+
+        # Update data transaksi lewat engine
         try:
-            datetime.strptime(tanggal_baru_str, "%Y-%m-%d")
-        except ValueError:
-            self.show_warning("Format tanggal salah! Gunakan YYYY-MM-DD")
+            self.engine.edit(transaksi_id, jenis_baru, kategori_baru, nominal_baru, tanggal_baru_str)
+        except ValueError as e:
+            self.show_warning(str(e))
             return
-
-        # Update data transaksi
-        transaksi_updated = {
-            "jenis": jenis_baru,
-            "kategori": kategori_baru.strip(),
-            "nominal": nominal_baru,
-            "tanggal": tanggal_baru_str
-        }
-        self.transaksi_data[idx] = transaksi_updated
-        save_data(self.transaksi_data)
-        self.update_kategori_options()
-        self.update_filter_kategori_options()
-        self.apply_filters()
-        self.check_saldo_negatif()
-        self.update_sisa_target()
         self.show_info("Transaksi berhasil diupdate.")
 
     # Terapkan filter data dan tampilkan sesuai filter
+    # Dipanggil oleh kontrol filter; filter baru dijalankan setelah kontrol diam sejenak
+    def schedule_filters(self):
+        self.filter_timer.start()
+
+    @profiled('apply_filters')
     def apply_filters(self):
+        self.filter_timer.stop()  # Filter yang masih terjadwal sudah terwakili oleh panggilan ini
         jenis_filter = self.filter_jenis_combo.currentText()
         kategori_filter = self.filter_kategori_combo.currentText()
         tanggal_mulai = self.filter_tanggal_mulai.date().toString("yyyy-MM-dd")
         tanggal_akhir = self.filter_tanggal_akhir.date().toString("yyyy-MM-dd")
 
-        filtered = []
-        for t in self.transaksi_data:
-            # Filter jenis
-            if jenis_filter != "Semua" and t['jenis'] != jenis_filter:
-                continue
-            # Filter kategori, abaikan case dan filter hanya jika bukan 'Semua'
-            if kategori_filter != "Semua" and t['kategori'].lower() != kategori_filter.lower():
-                continue
-            # Filter tanggal rentang mulai-akhir
-            if t['tanggal'] < tanggal_mulai or t['tanggal'] > tanggal_akhir:
-                continue
-            filtered.append(t)
+        filters = (jenis_filter, kategori_filter, tanggal_mulai, tanggal_akhir)
+        if not self.engine.can_query:
+            self.current_filters = filters  # Diterapkan setelah seluruh riwayat selesai dimuat
+            return
+        filtered = self.engine.query(filters)  # Hasil yang sama diambil dari cache engine
+        if filters == self.current_filters and filtered is self.filtered_data:
+            return  # Tabel sudah menampilkan hasil yang sama persis
+        self.current_filters = filters
         self.display_data(filtered)
 
     # Reset seluruh filter ke default dan tampilkan seluruh data
     def reset_filters(self):
+        # Sinyal diblok selama reset supaya filter hanya dijalankan sekali di akhir
+        controls = [self.filter_jenis_combo, self.filter_kategori_combo,
+                    self.filter_tanggal_mulai, self.filter_tanggal_akhir]
+        for control in controls:
+            control.blockSignals(True)
         self.filter_jenis_combo.setCurrentIndex(0)
         self.update_filter_kategori_options()
         self.filter_kategori_combo.setCurrentIndex(0)
         self.filter_tanggal_mulai.setDate(QDate.currentDate().addMonths(-1))
         self.filter_tanggal_akhir.setDate(QDate.currentDate())
+        for control in controls:
+            control.blockSignals(False)
         self.apply_filters()
 
-    # Cek apakah pengeluaran boros terjadi lebih dari batas hari berturut-turut
-    def check_boros_warning(self):
-        hari_ini = datetime.now().date()
-        consecutive_boros = 0
-
-        # Loop mundur dari hari ini mengecek total pengeluaran tiap hari
-        for hari_offset in range(self.BOROS_LIMIT_HARI):
-            cek_tanggal = hari_ini - timedelta(days=hari_offset)
-            cek_tanggal_str = cek_tanggal.strftime("%Y-%m-%d")
-            total_harian = sum(
-                t['nominal']
-                for t in self.transaksi_data
-                if t['jenis'] == 'pengeluaran' and t['tanggal'] == cek_tanggal_str
-            )
-            if total_harian > self.BOROS_BATAS_HARIAN:
-                consecutive_boros += 1
-            else:
-                break  # Jika hari tidak boros, reset hitungan
-
-        # Jika selama BOROS_LIMIT_HARI berturut-turut boros, tampilkan peringatan
-        if consecutive_boros >= self.BOROS_LIMIT_HARI:
-            msg = QMessageBox(self)
-            msg.setWindowTitle("Peringatan Pengeluaran Boros")
-            msg.setText(f"Anda telah menghabiskan pengeluaran boros selama {self.BOROS_LIMIT_HARI} hari berturut-turut.\nMari mulai hemat dan kelola keuangan Anda dengan bijak!")
-            msg.setIcon(QMessageBox.Icon.Warning)
-            msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: white;
-                    color: black;
-                }
-                QPushButton {
-                    background-color: #4caf50;
-                    color: white;
-                    border-radius: 10px;
-                    padding: 6px 12px;
-                    font-weight: bold;
-                }
-                QPushButton:hover { background-color: #388E3C; }
-            """)
-            msg.exec()
-
-    # Cek apakah saldo negatif dan tampilkan peringatan jika iya
-    def check_saldo_negatif(self):
-        saldo = self.calculate_saldo()
-        if saldo < 0:
-            msg = QMessageBox(self)
-            msg.setWindowTitle("Peringatan Saldo Negatif")
-            msg.setText(f"Saldo Anda saat ini adalah Rp {saldo:,} (negatif).\nMohon atur pengeluaran Anda dengan bijak agar tidak boros dan terhindar dari saldo minus.")
-            msg.setIcon(QMessageBox.Icon.Warning)
-            msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: white;
-                    color: black;
-                }
-                QPushButton {
-                    background-color: #4caf50;
-                    color: white;
-                    border-radius: 10px;
-                    padding: 6px 12px;
-                    font-weight: bold;
-                }
-                QPushButton:hover { background-color: #388E3C; }
-            """)
-            msg.exec()
+    # Jalankan semua aturan peringatan, hanya untuk hari yang pengeluarannya baru bertambah
+    @profiled('check_alerts')
+    def check_alerts(self, changed_days=()):
+        for alert in self.engine.check_alerts(changed_days):
+            self.show_alert(*alert)
+
+    # Menampilkan pesan peringatan dari aturan peringatan
+    def show_alert(self, title, message):
+        msg = QMessageBox(self)
+        msg.setWindowTitle(title)
+        msg.setText(message)
+        msg.setIcon(QMessageBox.Icon.Warning)
+        msg.setStyleSheet("""
+            QMessageBox {
+                background-color: white;
+                color: black;
+            }
+            QPushButton {
+                background-color: #4caf50;
+                color: white;
+                border-radius: 10px;
+                padding: 6px 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background-color: #388E3C; }
+        """)
+        msg.exec()
 
     # Fungsi menampilkan pesan informasi
     def show_info(self, message):
@@ -817,88 +1258,73 @@ class MHSApp(QWidget):
         """)
         msg.exec()
 
+    def show_monthly_report(self):
+        MonthlyReportDialog(self.engine, self).exec()
+
+    # Panel performa tidak punya tombol; dibuka lewat PERFORMANCE_SHORTCUT dan tidak memblokir jendela
+    def show_performance_panel(self):
+        if self.performance_dialog is None:
+            self.performance_dialog = PerformanceDialog(self)
+        self.performance_dialog.show()
+        self.performance_dialog.raise_()
+
+    # Menampilkan atau menyembunyikan diagram lingkaran di bawah tabel
+    def toggle_pie_chart(self):
+        if self.chart_label.isVisible():
+            self.chart_label.setVisible(False)
+            self.chart_btn.setText("Tampilkan Diagram Lingkaran")
+            return
+        self.show_pie_chart()
+
     # Menampilkan diagram lingkaran dari data pemasukan dan pengeluaran
+    @profiled('show_pie_chart')
     def show_pie_chart(self):
-        pemasukan_categories = {}
-        pengeluaran_categories = {}
-
-        # Gunakan data yang difilter jika ada, jika tidak gunakan semua data
-        data_for_chart = self.filtered_data if self.filtered_data else self.transaksi_data
-
-        for t in data_for_chart:
-            cat = t['kategori']
-            if t['jenis'] == 'pemasukan':
-                pemasukan_categories[cat] = pemasukan_categories.get(cat, 0) + t['nominal']
-            elif t['jenis'] == 'pengeluaran':
-                pengeluaran_categories[cat] = pengeluaran_categories.get(cat, 0) + t['nominal']
-
-        # Fungsi untuk men-styling grafik pie
-        def style_pie(ax, sizes, labels, title, positive):
-            if not sizes:
-                ax.text(0.5,0.5, f"Tidak ada data\n{title.lower()}", ha='center', va='center', fontsize=14, color='gray')
-                ax.set_title(title, fontsize=16, weight='bold', pad=15)
-                ax.axis('off')
-                return None, None
-
-            total = sum(sizes)
-            sorted_pairs = sorted(zip(sizes, labels), reverse=True)
-            sizes_s, labels_s = zip(*sorted_pairs)
-
-            explode = [0.05] + [0.01]*(len(sizes_s)-1)
-            cmap = cm.Greens if positive else cm.Reds
-            colors = cmap(np.linspace(0.5, 0.85, len(sizes_s)))
-
-            wedges, texts, autotexts = ax.pie(
-                sizes_s, explode=explode, labels=labels_s, autopct=lambda pct: f"{pct:.1f}%\n(Rp {int(pct*total/100):,})".replace(',', '.'),
-                shadow=True, startangle=140, colors=colors, wedgeprops=dict(width=0.4, edgecolor='w')
-            )
-            plt.setp(autotexts, size=10, weight="bold", color="white")
-            plt.setp(texts, size=11, weight="semibold")
-
-            ax.set_title(title, fontsize=18, weight='bold', pad=15)
-
-            legend_labels = [f"{lbl}: Rp {val:,}".replace(',', '.') for lbl, val in zip(labels_s, sizes_s)]
-            if ax.legend_:
-                ax.legend_.remove()
-            return wedges, legend_labels
-
-        pemasukan_labels = list(pemasukan_categories.keys())
-        pemasukan_sizes = list(pemasukan_categories.values())
-        pengeluaran_labels = list(pengeluaran_categories.keys())
-        pengeluaran_sizes = list(pengeluaran_categories.values())
-
         # Jika tidak ada data sama sekali, tampilkan info
-        if not pemasukan_sizes and not pengeluaran_sizes:
+        pemasukan_categories, pengeluaran_categories = self.engine.category_totals(self.chart_filters())
+        if not pemasukan_categories and not pengeluaran_categories:
             self.show_info("Tidak ada data pemasukan atau pengeluaran untuk ditampilkan.")
             return
-
-        # Plot dua pie chart berdampingan, pemasukan (hijau) dan pengeluaran (merah)
-        fig, axs = plt.subplots(1, 2, figsize=(14,7), subplot_kw=dict(aspect="equal"))
-
-        wedges_in, labels_in = style_pie(axs[0], pemasukan_sizes, pemasukan_labels, "Pemasukan", True)
-        wedges_out, labels_out = style_pie(axs[1], pengeluaran_sizes, pengeluaran_labels, "Pengeluaran", False)
-
-        patches = []
-        patches_labels = []
-        if wedges_in:
-            patches.extend(wedges_in)
-            patches_labels.extend(labels_in)
-        if wedges_out:
-            patches.extend(wedges_out)
-            patches_labels.extend(labels_out)
-
-        if patches:
-            fig.legend(patches, patches_labels, loc='center right', fontsize=11, title="Kategori Detail", title_fontsize=13)
-
-        plt.subplots_adjust(right=0.8)
-        fig.suptitle("Diagram Lingkaran Pemasukan dan Pengeluaran Per Kategori", fontsize=22, weight='bold', y=1.02)
-        plt.tight_layout()
-
-        plt.show()
+        self.chart_label.setVisible(True)
+        self.chart_btn.setText("Sembunyikan Diagram Lingkaran")
+        self.refresh_pie_chart()
+
+    # Gunakan filter yang aktif jika ada data yang lolos, jika tidak gunakan semua data
+    def chart_filters(self):
+        return self.current_filters if self.filtered_data else None
+
+    # Minta thread penggambar membuat ulang diagram. Total per kategori diambil dari cache engine,
+    # dan thread penggambar hanya menggeser irisan yang ada jika daftar kategorinya sama
+    @profiled('refresh_pie_chart')
+    def refresh_pie_chart(self):
+        if self.chart_worker is None:
+            # Matplotlib baru diimpor saat diagram pertama kali dibuka agar startup tetap cepat
+            from keuangan.chart import ChartWorker
+            self.chart_signals = ChartSignals()
+            self.chart_signals.rendered.connect(self.on_chart_rendered)
+            self.chart_worker = ChartWorker(self.chart_signals.rendered.emit)
+            self.chart_worker.start()
+        pemasukan_categories, pengeluaran_categories = self.engine.category_totals(self.chart_filters())
+        ukuran = self.chart_label.size()
+        self.chart_worker.request(pemasukan_categories, pengeluaran_categories,
+                                  max(ukuran.width(), 600), max(ukuran.height(), 320))
+
+    # Gambar RGBA dari thread penggambar ditampilkan di label diagram
+    def on_chart_rendered(self, rgba, lebar, tinggi, durasi_ms):
+        # QImage tidak menyalin buffer, jadi bytes-nya disimpan selama gambar dipakai
+        self.chart_image = (rgba, QImage(rgba, lebar, tinggi, QImage.Format.Format_RGBA8888))
+        self.chart_label.setPixmap(QPixmap.fromImage(self.chart_image[1]))
 
 # Inisialisasi dan jalankan aplikasi PyQt6
 if __name__ == '__main__':
+    startup = PhaseTimer(STARTUP_START)
+    startup.mark("impor modul")
     app = QApplication(sys.argv)
-    window = MHSApp()
+    startup.mark("QApplication")
+    try:
+        window = MHSApp(startup)
+    except ValueError as e:
+        # config.json yang salah (misalnya aturan peringatan) ditampilkan, bukan hanya traceback
+        QMessageBox.critical(None, "Konfigurasi Salah", str(e))
+        sys.exit(1)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,230 @@
+# Benchmark skala aplikasi dengan buku kas sintetis.
+#
+#   python benchmarks/run.py --sizes 1000 10000 100000 1000000 --output hasil.json
+#   python benchmarks/run.py --sizes 1000 10000 --ui          # ikut ukur jalur tabel (offscreen)
+#
+# Hasil ditulis sebagai JSON (satu entri per ukuran x benchmark) agar bisa dibandingkan
+# antar versi; ringkasan yang mudah dibaca dicetak ke stderr
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keuangan import (  # noqa: E402
+    LedgerEngine, BinarySnapshot, load_data, save_data, iter_data_batches, load_binary, save_binary,
+    create_storage,
+)
+from synthetic import generate_ledger  # noqa: E402
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "- PROJECT AKHIR { STD }.py")
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+# Menjalankan fn sebanyak `repeat` kali; setup (jika ada) dijalankan sebelum tiap percobaan
+# dan tidak ikut diukur
+def measure(fn, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        mulai = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - mulai) * 1000)
+    return {"min_ms": min(runs), "median_ms": statistics.median(runs), "mean_ms": statistics.fmean(runs),
+            "runs": len(runs)}
+
+
+# Filter yang mewakili pemakaian tabel: bulan terakhir, satu kategori setahun, dan semua data
+def sample_filters():
+    hari_ini = date.today()
+    bulan_lalu = hari_ini.replace(day=1).isoformat()
+    tahun_lalu = hari_ini.replace(year=hari_ini.year - 1).isoformat()
+    return {
+        "bulan_ini": ("Semua", "Semua", bulan_lalu, hari_ini.isoformat()),
+        "kategori_setahun": ("pengeluaran", "Makan & Minum", tahun_lalu, hari_ini.isoformat()),
+        "semua": ("Semua", "Semua", "1900-01-01", "2999-12-31"),
+    }
+
+
+# Benchmark tanpa GUI untuk satu ukuran buku kas
+def bench_headless(records, directory, repeat):
+    hasil = {}
+    path = os.path.join(directory, "database.json")
+    hasil["save_data"] = measure(lambda: save_data(records, path), repeat)
+    hasil["load_data"] = measure(lambda: load_data(path), repeat)
+    hasil["load_data_streaming"] = measure(lambda: sum(len(batch) for batch in iter_data_batches(path)), repeat)
+
+    # Snapshot biner: tulis, buka lewat mmap, baca semua dan agregasi langsung dari buffer
+    bin_path = os.path.join(directory, "database.bin")
+    hasil["save_binary"] = measure(lambda: save_binary(records, bin_path), repeat)
+    hasil["load_binary"] = measure(lambda: load_binary(bin_path), repeat)
+    hasil["binary_open"] = measure(lambda: BinarySnapshot(bin_path).close(), repeat)
+    with BinarySnapshot(bin_path) as snapshot:
+        hasil["binary_category_totals"] = measure(snapshot.category_totals, repeat)
+        bulan_ini = sample_filters()["bulan_ini"]
+        hasil["binary_category_totals_filtered"] = measure(lambda: snapshot.category_totals(bulan_ini), repeat)
+
+    engine = LedgerEngine(directory, config={"storage_mode": "json"}, background=False, load=False,
+                          read_only=True)
+    loaded = load_data(path)
+    hasil["engine_attach"] = measure(lambda: engine.attach(loaded), repeat)
+
+    for nama, filters in sample_filters().items():
+        hasil[f"query_{nama}"] = measure(lambda: engine.query(filters), repeat, setup=engine.filter_cache.clear)
+    filters = sample_filters()["bulan_ini"]
+    engine.query(filters)
+    hasil["query_cached"] = measure(lambda: engine.query(filters), repeat)
+
+    hasil["calculate_saldo"] = measure(lambda: engine.saldo, repeat)
+    hasil["calculate_saldo_scan"] = measure(lambda: engine.storage.totals(engine.transaksi), repeat)
+    hari_ini = [date.today()]
+    hasil["check_alerts"] = measure(lambda: engine.check_alerts(hari_ini), repeat)
+
+    def clear_caches():
+        engine.filter_cache.clear()
+        engine.aggregate_cache.clear()
+    hasil["pie_aggregation_all"] = measure(lambda: engine.category_totals(None), repeat,
+                                           setup=engine.aggregate_cache.clear)
+    hasil["pie_aggregation_filtered"] = measure(lambda: engine.category_totals(filters), repeat,
+                                                setup=clear_caches)
+    hasil["pie_aggregation_cached"] = measure(lambda: engine.category_totals(filters), repeat)
+    hasil["monthly_report"] = measure(engine.monthly_report, repeat)
+
+    # Penyimpanan kolom hanya diukur jika NumPy tersedia
+    try:
+        from keuangan.columnar import ColumnarStore
+    except ImportError:
+        ColumnarStore = None
+    if ColumnarStore is not None:
+        columnar = ColumnarStore(engine.transaksi.values())
+        hasil["pie_aggregation_columnar"] = measure(lambda: columnar.category_totals(filters), repeat)
+
+    # SQLite: migrasi sekali dari database.json, lalu query dan agregasi dijalankan oleh SQLite
+    sqlite_dir = tempfile.mkdtemp(dir=directory)
+    save_data(records, os.path.join(sqlite_dir, "database.json"))
+    storage = create_storage("sqlite", sqlite_dir)
+    hasil["sqlite_migrate"] = measure(storage.load, 1)
+    hasil["sqlite_load"] = measure(storage.load, repeat)
+    hasil["sqlite_load_recent"] = measure(lambda: storage.load_recent(200), repeat)
+    hasil["sqlite_query_bulan_ini"] = measure(lambda: storage.query(None, filters), repeat)
+    hasil["sqlite_pie_aggregation"] = measure(lambda: storage.category_totals(None, filters), repeat)
+    storage.close()
+
+    # Partisi per bulan: migrasi sekali, lalu penulisan satu transaksi hanya menulis ulang satu
+    # partisi dan query bulan ini hanya membuka partisi bulan ini
+    part_dir = tempfile.mkdtemp(dir=directory)
+    save_data(records, os.path.join(part_dir, "database.json"))
+    storage = create_storage("partitioned", part_dir)
+    hasil["partitioned_migrate"] = measure(storage.load, 1)
+    hasil["partitioned_load"] = measure(storage.load, repeat)
+    hasil["partitioned_load_recent"] = measure(lambda: storage.load_recent(200), repeat)
+    hasil["partitioned_query_bulan_ini"] = measure(lambda: storage.query(None, filters), repeat)
+    contoh = storage.load_recent(1)[-1]
+    hasil["partitioned_write_one"] = measure(lambda: storage.write_batch([("edit", contoh)]), repeat)
+    storage.close()
+    engine.close()
+    return hasil
+
+
+# Jalur tabel: MHSApp asli dijalankan offscreen dengan database.json berisi `records`
+def bench_ui(records, directory, repeat):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import importlib.util
+    from PyQt6.QtCore import QDate
+    from PyQt6.QtWidgets import QApplication
+
+    spec = importlib.util.spec_from_file_location("mhs_app", APP_FILE)
+    app_mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app_mod)
+    qapp = QApplication.instance() or QApplication([])
+
+    ui_dir = tempfile.mkdtemp(dir=directory)
+    save_data(records, os.path.join(ui_dir, "database.json"))
+    with open(os.path.join(ui_dir, "config.json"), "w") as f:
+        json.dump({"target_tabungan": 0}, f)
+    cwd = os.getcwd()
+    os.chdir(ui_dir)
+    try:
+        hasil = {}
+        mulai = time.perf_counter()
+        window = app_mod.MHSApp()
+        while not window.engine.loaded:
+            qapp.processEvents()
+            time.sleep(0.001)
+        hasil["ui_startup_until_loaded"] = {"min_ms": (time.perf_counter() - mulai) * 1000, "runs": 1}
+
+        def reset():
+            window.current_filters = None
+            window.engine.filter_cache.clear()
+        for nama, filters in sample_filters().items():
+            def apply(filters=filters):
+                jenis, kategori, tanggal_mulai, tanggal_akhir = filters
+                window.filter_jenis_combo.setCurrentText(jenis)
+                window.filter_kategori_combo.setCurrentText(kategori)
+                window.filter_tanggal_mulai.setDate(QDate.fromString(tanggal_mulai, "yyyy-MM-dd"))
+                window.filter_tanggal_akhir.setDate(QDate.fromString(tanggal_akhir, "yyyy-MM-dd"))
+                window.apply_filters()
+            hasil[f"ui_apply_filters_{nama}"] = measure(apply, repeat, setup=reset)
+        semua = list(window.transaksi_data.values())
+        hasil["ui_display_data_all"] = measure(lambda: window.display_data(semua), repeat)
+        window.close()
+    finally:
+        os.chdir(cwd)
+    return hasil
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP_FILE), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark buku kas sintetis")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ui", action="store_true", help="ikut ukur jalur tabel dengan Qt offscreen")
+    parser.add_argument("--output", help="file JSON hasil (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        records = generate_ledger(size, seed=args.seed)
+        with tempfile.TemporaryDirectory() as directory:
+            hasil = bench_headless(records, directory, args.repeat)
+            if args.ui:
+                hasil.update(bench_ui(records, directory, args.repeat))
+        for nama, ukuran in hasil.items():
+            results.append(dict(size=size, benchmark=nama, **ukuran))
+            print(f"{size:>9} {nama:<32} {ukuran['min_ms']:>10.2f} ms", file=sys.stderr)
+
+    output = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Pembuat buku kas sintetis untuk benchmark. Polanya dibuat mirip data mahasiswa sungguhan:
+# uang bulanan di awal bulan, pemasukan lain sesekali, dan banyak pengeluaran kecil setiap hari
+import random
+from datetime import date, timedelta
+
+from keuangan import PEMASUKAN_CATEGORIES, PENGELUARAN_CATEGORIES
+
+# Bobot dan rentang nominal per kategori pengeluaran (kategori yang tidak ada di sini memakai DEFAULT)
+PENGELUARAN_PROFIL = {
+    "Makan & Minum": (40, 10000, 60000),
+    "Transportasi": (15, 5000, 50000),
+    "Kuota / Internet": (4, 25000, 150000),
+    "Belanja Pribadi": (8, 20000, 400000),
+    "Hiburan": (6, 15000, 250000),
+    "Alat Kuliah": (4, 10000, 300000),
+    "Kos / Sewa Tempat Tinggal": (1, 500000, 2000000),
+    "Uang Kuliah / SPP": (1, 1000000, 8000000),
+}
+PROFIL_DEFAULT = (3, 10000, 500000)
+PEMASUKAN_PROFIL = {
+    "Uang bulanan": (0, 1000000, 3000000),  # Dibuat terjadwal di awal bulan, bukan diundi
+    "Beasiswa": (2, 500000, 5000000),
+    "Freelance": (3, 100000, 2000000),
+    "Jualan": (4, 20000, 500000),
+}
+RASIO_PEMASUKAN = 0.08  # Porsi transaksi acak yang berupa pemasukan
+
+
+# Mengundi kategori beserta rentang nominalnya sesuai bobot profil
+def _pemilih(categories, profil):
+    pilihan = [(k,) + profil.get(k, PROFIL_DEFAULT) for k in categories]
+    pilihan = [p for p in pilihan if p[1] > 0]
+    return [p[0] for p in pilihan], [p[1] for p in pilihan], {p[0]: p[2:] for p in pilihan}
+
+
+# Menghasilkan n transaksi (dict tanpa id, format database.json) yang tersebar rata
+# dalam `hari` hari terakhir sampai `akhir`, urut sesuai tanggal
+def generate_ledger(n, seed=0, hari=3 * 365, akhir=None):
+    rng = random.Random(seed)
+    akhir = akhir or date.today()
+    awal = akhir - timedelta(days=hari - 1)
+    kat_keluar, bobot_keluar, rentang_keluar = _pemilih(PENGELUARAN_CATEGORIES, PENGELUARAN_PROFIL)
+    kat_masuk, bobot_masuk, rentang_masuk = _pemilih(PEMASUKAN_CATEGORIES, PEMASUKAN_PROFIL)
+
+    # Uang bulanan tiap tanggal 1 ikut dihitung dalam n
+    bulanan = []
+    hari_ini = awal.replace(day=1)
+    while hari_ini <= akhir and len(bulanan) < n:
+        if hari_ini >= awal:
+            bulanan.append((hari_ini.toordinal(), "pemasukan", "Uang bulanan",
+                            rng.randrange(1000000, 3000001, 50000)))
+        hari_ini = (hari_ini + timedelta(days=32)).replace(day=1)
+
+    rows = bulanan
+    ordinal_awal = awal.toordinal()
+    for _ in range(n - len(bulanan)):
+        tanggal = ordinal_awal + rng.randrange(hari)
+        if rng.random() < RASIO_PEMASUKAN:
+            kategori = rng.choices(kat_masuk, bobot_masuk)[0]
+            rendah, tinggi = rentang_masuk[kategori]
+            jenis = "pemasukan"
+        else:
+            kategori = rng.choices(kat_keluar, bobot_keluar)[0]
+            rendah, tinggi = rentang_keluar[kategori]
+            jenis = "pengeluaran"
+        rows.append((tanggal, jenis, kategori, rng.randrange(rendah, tinggi + 1, 500)))
+
+    rows.sort(key=lambda row: row[0])
+    return [{"jenis": jenis, "kategori": kategori, "nominal": nominal,
+             "tanggal": date.fromordinal(tanggal).isoformat()}
+            for tanggal, jenis, kategori, nominal in rows]
@@ -0,0 +1,55 @@
+# Mesin pembukuan keuangan mahasiswa tanpa GUI. Modul ini tidak mengimpor PyQt6 maupun
+# matplotlib, sehingga bisa dipakai untuk skrip batch dan laporan
+from .rupiah import format_rupiah, parse_nominal
+from .transaksi import Transaksi, json_default, PEMASUKAN_CATEGORIES, PENGELUARAN_CATEGORIES
+from .records import match_filters, index_by_id, group_by_category
+from .storage import (
+    DB_FILE, CONFIG_FILE, STORAGE_MODE, JOURNAL_FILE, SNAPSHOT_FILE, SQLITE_FILE,
+    load_data, save_data, iter_data_batches, load_config, save_config,
+    Storage, JsonStorage, TransactionJournal, SqliteStorage, create_storage,
+)
+from .binary import BinarySnapshot, BinaryStorage, load_binary, save_binary, json_to_binary, binary_to_json
+from .partitions import PARTITION_DIR, PartitionedStorage
+from .persistence import PersistenceWorker
+from .indexes import DateIndex, RunningTotals, DailyExpenseBuckets
+from .rollup import ROLLUP_FILE, RollupCube
+from .importer import ImportRowError, parse_amount, iter_import_batches, read_import
+from .exporter import SEMUA, ExportCancelled, export_transactions
+from .history import HISTORY_FILE, CommandLog
+from .events import ChangeBus, ChangeEvent
+from .alerts import (
+    ConsecutiveSpendingRule, NegativeBalanceRule, CategoryCapRule, RollingWindowRule,
+    build_alert_rules,
+)
+from .timing import PhaseTimer, Profiler, LatencyHistogram, PROFILER, profiled
+from .engine import (
+    LedgerEngine, BOROS_LIMIT_HARI, BOROS_BATAS_HARIAN,
+)
+
+# Nama publik paket, termasuk yang dimuat saat pertama dipakai lewat __getattr__ di bawah
+__all__ = [
+    'format_rupiah', 'parse_nominal', 'Transaksi', 'json_default', 'PEMASUKAN_CATEGORIES',
+    'PENGELUARAN_CATEGORIES', 'match_filters', 'index_by_id', 'group_by_category', 'DB_FILE',
+    'CONFIG_FILE', 'STORAGE_MODE', 'JOURNAL_FILE', 'SNAPSHOT_FILE', 'SQLITE_FILE', 'load_data',
+    'save_data', 'iter_data_batches', 'load_config', 'save_config', 'Storage', 'JsonStorage',
+    'TransactionJournal', 'SqliteStorage', 'create_storage', 'BinarySnapshot', 'BinaryStorage',
+    'load_binary', 'save_binary', 'json_to_binary', 'binary_to_json', 'PARTITION_DIR',
+    'PartitionedStorage', 'PersistenceWorker', 'DateIndex', 'RunningTotals', 'DailyExpenseBuckets',
+    'ROLLUP_FILE', 'RollupCube', 'ImportRowError', 'parse_amount', 'iter_import_batches',
+    'read_import', 'SEMUA', 'ExportCancelled', 'export_transactions', 'HISTORY_FILE', 'CommandLog',
+    'ChangeBus', 'ChangeEvent', 'ConsecutiveSpendingRule', 'NegativeBalanceRule',
+    'CategoryCapRule', 'RollingWindowRule', 'build_alert_rules', 'PhaseTimer', 'Profiler',
+    'LatencyHistogram', 'PROFILER', 'profiled', 'LedgerEngine', 'BOROS_LIMIT_HARI',
+    'BOROS_BATAS_HARIAN', 'LedgerServer', 'LedgerClient', 'ServerError',
+]
+
+# Mode server dan kliennya memakai asyncio/http.client; diimpor saat pertama dipakai agar
+# `from keuangan import ...` di GUI tidak ikut memuatnya
+_LAZY = {'LedgerServer': 'server', 'LedgerClient': 'client', 'ServerError': 'client'}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
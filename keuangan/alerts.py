@@ -0,0 +1,126 @@
+# Aturan peringatan pengeluaran yang dihitung dari total pengeluaran harian
+from datetime import date, timedelta
+
+from .rupiah import format_rupiah
+
+# Aturan peringatan. Setiap aturan menerima daftar hari (objek date) yang pengeluarannya
+# baru saja bertambah, dan hanya memeriksa hari/jendela yang tersentuh perubahan tersebut.
+# Hasilnya (judul, pesan) jika peringatan perlu ditampilkan, atau None.
+
+
+# Pengeluaran harian melewati batas selama beberapa hari berturut-turut sampai hari ini
+class ConsecutiveSpendingRule:
+    def __init__(self, hari, batas_harian):
+        self.hari = hari
+        self.batas_harian = batas_harian
+
+    def check(self, buckets, totals, changed_days):
+        hari_ini = date.today()
+        awal = hari_ini - timedelta(days=self.hari - 1)
+        if not any(awal <= hari <= hari_ini for hari in changed_days):
+            return None
+        for offset in range(self.hari):
+            if buckets.day_total(hari_ini - timedelta(days=offset)) <= self.batas_harian:
+                return None
+        return ("Peringatan Pengeluaran Boros",
+                f"Anda telah menghabiskan pengeluaran boros selama {self.hari} hari berturut-turut.\n"
+                "Mari mulai hemat dan kelola keuangan Anda dengan bijak!")
+
+
+# Saldo keseluruhan negatif, diperiksa setelah setiap perubahan
+class NegativeBalanceRule:
+    def check(self, buckets, totals, changed_days):
+        saldo = totals.saldo
+        if saldo >= 0:
+            return None
+        return ("Peringatan Saldo Negatif",
+                f"Saldo Anda saat ini adalah Rp {saldo:,} (negatif).\n"
+                "Mohon atur pengeluaran Anda dengan bijak agar tidak boros dan terhindar dari saldo minus.")
+
+
+# Batas pengeluaran satu kategori per hari ('harian') atau per bulan ('bulanan')
+class CategoryCapRule:
+    def __init__(self, kategori, batas, periode='harian'):
+        self.kategori = kategori
+        self.batas = batas
+        self.periode = periode
+
+    def check(self, buckets, totals, changed_days):
+        if self.periode == 'bulanan':
+            periods = {hari.isoformat()[:7] for hari in changed_days}
+            over = [p for p in sorted(periods) if buckets.month_total(p, self.kategori) > self.batas]
+        else:
+            over = [hari.isoformat() for hari in sorted(set(changed_days))
+                    if buckets.day_total(hari, self.kategori) > self.batas]
+        if not over:
+            return None
+        return ("Peringatan Batas Kategori",
+                f"Pengeluaran kategori {self.kategori} melewati batas {self.periode} "
+                f"Rp {format_rupiah(self.batas)} pada {', '.join(over)}.")
+
+
+# Total pengeluaran dalam jendela N hari bergulir melewati batas (opsional hanya satu kategori)
+class RollingWindowRule:
+    def __init__(self, hari, batas, kategori=None):
+        self.hari = hari
+        self.batas = batas
+        self.kategori = kategori
+
+    def check(self, buckets, totals, changed_days):
+        for hari in sorted(set(changed_days)):
+            # Jendela yang memuat `hari` berakhir antara hari itu dan N-1 hari sesudahnya.
+            # Hitung jendela pertama, lalu geser satu hari demi satu hari
+            akhir = hari
+            total = sum(buckets.day_total(akhir - timedelta(days=i), self.kategori) for i in range(self.hari))
+            for _ in range(self.hari):
+                if total > self.batas:
+                    awal = akhir - timedelta(days=self.hari - 1)
+                    nama = f" kategori {self.kategori}" if self.kategori else ""
+                    return ("Peringatan Pengeluaran Bergulir",
+                            f"Pengeluaran{nama} selama {self.hari} hari ({awal.isoformat()} s/d {akhir.isoformat()}) "
+                            f"mencapai Rp {format_rupiah(total)}, melewati batas Rp {format_rupiah(self.batas)}.")
+                akhir += timedelta(days=1)
+                total += buckets.day_total(akhir, self.kategori)
+                total -= buckets.day_total(akhir - timedelta(days=self.hari), self.kategori)
+        return None
+
+
+# Kunci wajib setiap tipe aturan di 'aturan_peringatan'
+_ALERT_KEYS = {
+    'boros_beruntun': (),
+    'saldo_negatif': (),
+    'batas_kategori': ('kategori', 'batas'),
+    'jendela_bergulir': ('hari', 'batas'),
+}
+
+
+# Menyusun daftar aturan dari kunci 'aturan_peringatan' di config.json. Jika tidak ada,
+# dipakai aturan bawaan: boros beruntun dan saldo negatif. Contoh isi konfigurasi:
+#   [{"tipe": "boros_beruntun", "hari": 7, "batas_harian": 1000000},
+#    {"tipe": "saldo_negatif"},
+#    {"tipe": "batas_kategori", "kategori": "Hiburan", "periode": "bulanan", "batas": 500000},
+#    {"tipe": "jendela_bergulir", "hari": 30, "batas": 3000000}]
+# Tipe yang tidak dikenal (misalnya salah ketik) atau kunci wajib yang tidak ada menjadi
+# ValueError yang menyebut aturannya, agar peringatan tidak hilang diam-diam
+def build_alert_rules(config, boros_hari, boros_batas_harian):
+    specs = config.get('aturan_peringatan')
+    if specs is None:
+        return [ConsecutiveSpendingRule(boros_hari, boros_batas_harian), NegativeBalanceRule()]
+    rules = []
+    for spec in specs:
+        tipe = spec.get('tipe') if isinstance(spec, dict) else None
+        if tipe not in _ALERT_KEYS:
+            raise ValueError(f"Aturan peringatan tidak dikenal di config.json: {spec!r}")
+        kurang = [key for key in _ALERT_KEYS[tipe] if key not in spec]
+        if kurang:
+            raise ValueError(f"Aturan peringatan {tipe} tanpa kunci {', '.join(kurang)}: {spec!r}")
+        if tipe == 'boros_beruntun':
+            rules.append(ConsecutiveSpendingRule(spec.get('hari', boros_hari),
+                                                 spec.get('batas_harian', boros_batas_harian)))
+        elif tipe == 'saldo_negatif':
+            rules.append(NegativeBalanceRule())
+        elif tipe == 'batas_kategori':
+            rules.append(CategoryCapRule(spec['kategori'], spec['batas'], spec.get('periode', 'harian')))
+        else:
+            rules.append(RollingWindowRule(spec['hari'], spec['batas'], spec.get('kategori')))
+    return rules
@@ -0,0 +1,277 @@
+# Format snapshot biner yang ringkas dan bisa di-mmap, sebagai alternatif database.json.
+#
+# Susunan file (little-endian):
+#   header   : magic 'KEUBIN01', jumlah string (uint32), jumlah transaksi (uint64), offset data (uint64)
+#   string   : untuk setiap string, panjang (uint16) lalu isi UTF-8; berisi jenis dan kategori
+#   padding  : sampai offset data kelipatan 8
+#   data     : transaksi berukuran tetap 24 byte: id (int64, -1 jika tidak ada), nominal (int64),
+#              tanggal sebagai ordinal (int32), kode jenis (uint16), kode kategori (uint16)
+#
+# Konversi bolak-balik dengan database.json:
+#   python -m keuangan.binary ke-biner database.json database.bin
+#   python -m keuangan.binary ke-json database.bin database.json
+import argparse
+import mmap
+import os
+import struct
+from datetime import date
+
+from .storage import DB_FILE, LOAD_BATCH_SIZE, Storage, load_data, save_data
+from .transaksi import Transaksi
+
+BINARY_FILE = 'database.bin'
+MAGIC = b'KEUBIN01'
+HEADER = struct.Struct('<8sIQQ')
+RECORD = struct.Struct('<qqiHH')
+STRING_LENGTH = struct.Struct('<H')
+TANPA_ID = -1
+
+
+# Mengubah list transaksi menjadi isi file biner. ValueError jika ada transaksi yang tidak bisa
+# disimpan tanpa kehilangan informasi (kunci tambahan, nominal bukan bilangan bulat, tanggal salah)
+def encode_records(records):
+    kode = {}
+    strings = []
+
+    def string_code(teks):
+        if teks not in kode:
+            if len(strings) > 0xFFFF:
+                raise ValueError("Terlalu banyak jenis/kategori berbeda untuk format biner")
+            kode[teks] = len(strings)
+            strings.append(teks)
+        return kode[teks]
+
+    data = bytearray()
+    for t in records:
+        if set(t) - {'id', 'jenis', 'kategori', 'nominal', 'tanggal'}:
+            raise ValueError(f"Transaksi berisi kunci yang tidak didukung format biner: {t}")
+        # bool juga turunan int, ditolak seperti di LedgerEngine.validate
+        angka = (t['nominal'], t.get('id', TANPA_ID))
+        if any(isinstance(nilai, bool) or not isinstance(nilai, int) for nilai in angka):
+            raise ValueError(f"Nominal dan id harus bilangan bulat: {t}")
+        tanggal = date.fromisoformat(t['tanggal'])
+        if tanggal.isoformat() != t['tanggal']:
+            raise ValueError(f"Tanggal tidak dalam format YYYY-MM-DD: {t}")
+        try:
+            data += RECORD.pack(t.get('id', TANPA_ID), t['nominal'], tanggal.toordinal(),
+                                string_code(t['jenis']), string_code(t['kategori']))
+        except struct.error:
+            raise ValueError(f"Nominal atau id di luar jangkauan int64: {t}") from None
+
+    tabel = bytearray()
+    for teks in strings:
+        isi = teks.encode('utf-8')
+        tabel += STRING_LENGTH.pack(len(isi)) + isi
+    offset = HEADER.size + len(tabel)
+    offset += -offset % 8
+    header = HEADER.pack(MAGIC, len(strings), len(data) // RECORD.size, offset)
+    return header + tabel + bytes(offset - HEADER.size - len(tabel)) + data
+
+
+# Menulis snapshot biner secara atomik, seperti save_data
+def save_binary(records, path=BINARY_FILE):
+    isi = encode_records(records)
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(isi)
+    os.replace(tmp_file, path)
+
+
+# Snapshot biner yang dibuka lewat mmap. Transaksi hanya diubah menjadi dict saat diakses,
+# sedangkan agregasi membaca langsung dari buffer yang dipetakan
+class BinarySnapshot:
+    def __init__(self, path=BINARY_FILE):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        magic, jumlah_string, self.size, self.offset = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            self._buffer.release()
+            self._mmap.close()
+            raise ValueError(f"{path} bukan snapshot biner keuangan")
+        self.strings = []
+        self._tanggal = {}
+        pos = HEADER.size
+        for _ in range(jumlah_string):
+            (panjang,) = STRING_LENGTH.unpack_from(self._buffer, pos)
+            pos += STRING_LENGTH.size
+            self.strings.append(str(self._buffer[pos:pos + panjang], 'utf-8'))
+            pos += panjang
+        self._data = self._buffer[self.offset:self.offset + self.size * RECORD.size]
+
+    # Array dari as_numpy() harus sudah tidak dipakai sebelum snapshot ditutup
+    def close(self):
+        self._data.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    # Teks tanggal di-cache per ordinal karena banyak transaksi berbagi tanggal yang sama
+    def _to_dict(self, row):
+        transaksi_id, nominal, ordinal, jenis, kategori = row
+        tanggal = self._tanggal.get(ordinal)
+        if tanggal is None:
+            tanggal = self._tanggal[ordinal] = date.fromordinal(ordinal).isoformat()
+        if transaksi_id == TANPA_ID:
+            return {"jenis": self.strings[jenis], "kategori": self.strings[kategori],
+                    "nominal": nominal, "tanggal": tanggal}
+        return {"id": transaksi_id, "jenis": self.strings[jenis], "kategori": self.strings[kategori],
+                "nominal": nominal, "tanggal": tanggal}
+
+    def __getitem__(self, i):
+        if not -self.size <= i < self.size:
+            raise IndexError(i)
+        return self._to_dict(RECORD.unpack_from(self._data, (i % self.size) * RECORD.size))
+
+    def __iter__(self):
+        return map(self._to_dict, RECORD.iter_unpack(self._data))
+
+    # Transaksi ke-`start` sampai sebelum `stop` sebagai list dict
+    def records(self, start=0, stop=None):
+        stop = self.size if stop is None else min(stop, self.size)
+        return [self._to_dict(row) for row in
+                RECORD.iter_unpack(self._data[start * RECORD.size:max(start, stop) * RECORD.size])]
+
+    # Baris mentah (id, nominal, ordinal, jenis, kategori) yang cocok dengan filter seperti
+    # match_filters; jenis, kategori dan tanggal dibandingkan lewat kode dan ordinal
+    def _rows(self, filters=None):
+        rows = RECORD.iter_unpack(self._data)
+        if filters is None:
+            return rows
+        jenis, kategori, tanggal_mulai, tanggal_akhir = filters
+        mulai = date.fromisoformat(tanggal_mulai).toordinal()
+        akhir = date.fromisoformat(tanggal_akhir).toordinal()
+        jenis_codes = None if jenis == "Semua" else \
+            {code for code, teks in enumerate(self.strings) if teks == jenis}
+        kategori_codes = None if kategori == "Semua" else \
+            {code for code, teks in enumerate(self.strings) if teks.lower() == kategori.lower()}
+        return (row for row in rows if mulai <= row[2] <= akhir
+                and (jenis_codes is None or row[3] in jenis_codes)
+                and (kategori_codes is None or row[4] in kategori_codes))
+
+    # Transaksi yang cocok dengan filter urut (tanggal, id) seperti DateIndex; hanya baris yang
+    # cocok yang diubah menjadi Transaksi. Data lama tanpa id diurutkan setelah yang ber-id sesuai
+    # urutan file, sama dengan id baru yang nanti diberikan index_by_id
+    def query(self, filters):
+        rows = [Transaksi.from_dict(self._to_dict(row)) for row in self._rows(filters)]
+        rows.sort(key=lambda t: (t.tanggal, t.id if t.id is not None else float('inf')))
+        return rows
+
+    # Total per (jenis, kategori) langsung dari buffer tanpa membuat dict transaksi
+    def category_totals(self, filters=None):
+        per_kode = {}
+        for _, nominal, _, jenis, kategori in self._rows(filters):
+            key = (jenis, kategori)
+            per_kode[key] = per_kode.get(key, 0) + nominal
+        pemasukan, pengeluaran = {}, {}
+        for (jenis, kategori), total in per_kode.items():
+            target = {'pemasukan': pemasukan, 'pengeluaran': pengeluaran}.get(self.strings[jenis])
+            if target is not None:
+                target[self.strings[kategori]] = total
+        return pemasukan, pengeluaran
+
+    # Total pemasukan dan pengeluaran langsung dari buffer
+    def totals(self, filters=None):
+        pemasukan, pengeluaran = self.category_totals(filters)
+        return sum(pemasukan.values()), sum(pengeluaran.values())
+
+    # Tampilan NumPy tanpa salinan atas data transaksi (NumPy hanya diimpor di sini)
+    def as_numpy(self):
+        import numpy as np
+        dtype = np.dtype([('id', '<i8'), ('nominal', '<i8'), ('tanggal', '<i4'),
+                          ('jenis', '<u2'), ('kategori', '<u2')])
+        return np.frombuffer(self._data, dtype=dtype)
+
+
+# Membaca seluruh snapshot biner sebagai list transaksi
+def load_binary(path=BINARY_FILE):
+    with BinarySnapshot(path) as snapshot:
+        return snapshot.records()
+
+
+def json_to_binary(json_path=DB_FILE, binary_path=BINARY_FILE):
+    save_binary(load_data(json_path), binary_path)
+
+
+def binary_to_json(binary_path=BINARY_FILE, json_path=DB_FILE):
+    save_data(load_binary(binary_path), json_path)
+
+
+# Backend penyimpanan yang menulis ulang snapshot biner setiap batch perubahan. Jika file biner
+# belum ada, data awal diambil dari database.json
+class BinaryStorage(Storage):
+    needs_snapshot = True
+
+    def __init__(self, binary_file=BINARY_FILE, db_file=DB_FILE):
+        self.binary_file = binary_file
+        self.db_file = db_file
+
+    def load(self):
+        if not os.path.exists(self.binary_file):
+            return load_data(self.db_file)
+        return load_binary(self.binary_file)
+
+    # Snapshot dibaca per batch langsung dari mmap, progress dalam jumlah transaksi
+    def load_batches(self, batch_size=LOAD_BATCH_SIZE, progress=None):
+        if not os.path.exists(self.binary_file):
+            yield from super().load_batches(batch_size, progress)
+            return
+        with BinarySnapshot(self.binary_file) as snapshot:
+            for start in range(0, len(snapshot), batch_size):
+                yield snapshot.records(start, start + batch_size)
+                if progress is not None:
+                    progress(min(start + batch_size, len(snapshot)), len(snapshot))
+
+    # Selama riwayat dimuat, query dan total dijawab langsung dari snapshot lewat mmap. Perubahan
+    # baru bisa dibuat setelah data dimuat, jadi snapshot di disk masih sama dengan buku kas
+    @property
+    def lazy(self):
+        return os.path.exists(self.binary_file)
+
+    def query(self, data, filters):
+        if data is not None or not self.lazy:
+            return super().query(data or {}, filters)
+        with BinarySnapshot(self.binary_file) as snapshot:
+            return snapshot.query(filters)
+
+    def totals(self, data, filters=None):
+        if data is not None or not self.lazy:
+            return super().totals(data or {}, filters)
+        with BinarySnapshot(self.binary_file) as snapshot:
+            return snapshot.totals(filters)
+
+    def category_totals(self, data, filters=None):
+        if data is not None or not self.lazy:
+            return super().category_totals(data or {}, filters)
+        with BinarySnapshot(self.binary_file) as snapshot:
+            return snapshot.category_totals(filters)
+
+    def write_batch(self, ops, records=None):
+        save_binary(records, self.binary_file)
+
+    def ledger_files(self):
+        return [self.binary_file, self.db_file]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konversi database.json <-> snapshot biner")
+    parser.add_argument('arah', choices=['ke-biner', 'ke-json'])
+    parser.add_argument('sumber')
+    parser.add_argument('tujuan')
+    args = parser.parse_args(argv)
+    if args.arah == 'ke-biner':
+        json_to_binary(args.sumber, args.tujuan)
+    else:
+        binary_to_json(args.sumber, args.tujuan)
+
+
+if __name__ == '__main__':
+    main()
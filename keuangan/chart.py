@@ -0,0 +1,145 @@
+# Diagram lingkaran pemasukan dan pengeluaran per kategori, digambar dengan backend Agg
+# matplotlib (tanpa pyplot dan tanpa GUI) sehingga bisa dijalankan di thread terpisah.
+# Modul ini mengimpor matplotlib, jadi sebaiknya baru diimpor saat diagram pertama kali dibuka
+import math
+import queue
+import threading
+import time
+
+from matplotlib import cm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Wedge
+
+from .rupiah import format_rupiah
+from .timing import PROFILER
+
+START_ANGLE = 140  # Derajat awal irisan pertama, sama seperti diagram lama
+RING_WIDTH = 0.4  # Diagram donat: irisan dari radius 0.6 sampai 1
+EXPLODE = [0.05, 0.01]  # Irisan terbesar sedikit ditarik keluar, sisanya sedikit saja
+DPI = 100
+
+
+# Satu diagram donat di satu axes. Irisan disimpan per kategori, sehingga perubahan nominal
+# cukup menggeser sudut irisan yang sudah ada; axes hanya dibangun ulang jika daftar kategori berubah
+class PieAxes:
+    def __init__(self, ax, title, cmap):
+        self.ax = ax
+        self.title = title
+        self.cmap = cmap
+        self.slices = {}  # kategori -> (wedge, teks label, teks persen)
+        self.reset()
+
+    def reset(self):
+        self.ax.clear()
+        self.ax.set_aspect('equal')
+        self.ax.set_xlim(-1.45, 1.45)
+        self.ax.set_ylim(-1.3, 1.3)
+        self.ax.axis('off')
+        self.ax.set_title(self.title, fontsize=14, weight='bold', pad=8)
+        self.slices = {}
+
+    # Memperbarui diagram untuk {kategori: nominal}. Mengembalikan daftar (wedge, teks legenda)
+    # urut dari nominal terbesar
+    def update(self, totals):
+        if set(totals) != set(self.slices) or not totals:
+            self.reset()
+            if not totals:
+                self.ax.text(0, 0, f"Tidak ada data\n{self.title.lower()}", ha='center', va='center',
+                             fontsize=13, color='gray')
+                return []
+            for kategori in totals:
+                wedge = Wedge((0, 0), 1, 0, 0, width=RING_WIDTH, edgecolor='w')
+                self.ax.add_patch(wedge)
+                label = self.ax.text(0, 0, kategori, fontsize=10, weight='bold')
+                persen = self.ax.text(0, 0, '', fontsize=8, weight='bold', color='white',
+                                      ha='center', va='center')
+                self.slices[kategori] = (wedge, label, persen)
+
+        urut = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        total = sum(totals.values())
+        colors = self.cmap([0.5 + 0.35 * i / max(len(urut) - 1, 1) for i in range(len(urut))])
+        sudut = START_ANGLE
+        legend = []
+        for rank, (kategori, nominal) in enumerate(urut):
+            wedge, label, persen = self.slices[kategori]
+            lebar = 360 * nominal / total if total else 0
+            tengah = math.radians(sudut + lebar / 2)
+            arah = (math.cos(tengah), math.sin(tengah))
+            explode = EXPLODE[0] if rank == 0 else EXPLODE[1]
+            wedge.set_center((explode * arah[0], explode * arah[1]))
+            wedge.set_theta1(sudut)
+            wedge.set_theta2(sudut + lebar)
+            wedge.set_facecolor(colors[rank])
+            label.set_position((1.12 * arah[0], 1.12 * arah[1]))
+            label.set_horizontalalignment('left' if arah[0] >= 0 else 'right')
+            label.set_verticalalignment('bottom' if arah[1] >= 0 else 'top')
+            persen.set_position((0.8 * arah[0], 0.8 * arah[1]))
+            persen.set_text(f"{100 * nominal / total:.1f}%" if lebar >= 12 else '')
+            sudut += lebar
+            legend.append((wedge, f"{kategori}: Rp {format_rupiah(nominal)}"))
+        return legend
+
+
+# Figure dan canvas Agg dipakai ulang untuk setiap gambar. Hanya boleh dipakai dari satu thread
+class PieChartRenderer:
+    def __init__(self):
+        self.figure = Figure(figsize=(10, 4), dpi=DPI)
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax_in, ax_out = self.figure.subplots(1, 2)
+        self.pies = [PieAxes(ax_in, "Pemasukan", cm.Greens), PieAxes(ax_out, "Pengeluaran", cm.Reds)]
+        self.figure.subplots_adjust(left=0.02, right=0.74, top=0.9, bottom=0.04, wspace=0.25)
+        self.legend = None
+        self._legend_labels = None
+
+    # Menggambar diagram dalam ukuran piksel tertentu dan mengembalikan (rgba_bytes, lebar, tinggi)
+    def render(self, pemasukan, pengeluaran, width, height):
+        if (width, height) != self.canvas.get_width_height():
+            self.figure.set_size_inches(max(width, 200) / DPI, max(height, 150) / DPI)
+        legend = self.pies[0].update(pemasukan) + self.pies[1].update(pengeluaran)
+        labels = [teks for _, teks in legend]
+        # Legenda dibuat ulang hanya jika isinya berubah
+        if labels != self._legend_labels:
+            if self.legend is not None:
+                self.legend.remove()
+                self.legend = None
+            if legend:
+                self.legend = self.figure.legend([wedge for wedge, _ in legend], labels, loc='center right',
+                                                 fontsize=9, title="Kategori Detail", title_fontsize=10)
+            self._legend_labels = labels
+        self.canvas.draw()
+        lebar, tinggi = self.canvas.get_width_height()
+        return bytes(self.canvas.buffer_rgba()), lebar, tinggi
+
+
+# Thread penggambar diagram. Permintaan yang menumpuk digabung: hanya permintaan terakhir
+# yang digambar. on_rendered(rgba_bytes, lebar, tinggi, durasi_ms) dipanggil dari thread ini
+class ChartWorker(threading.Thread):
+    _STOP = object()
+
+    def __init__(self, on_rendered):
+        super().__init__(daemon=True)
+        self.on_rendered = on_rendered
+        self._queue = queue.Queue()
+
+    def request(self, pemasukan, pengeluaran, width, height):
+        self._queue.put((dict(pemasukan), dict(pengeluaran), width, height))
+
+    def stop(self):
+        self._queue.put(self._STOP)
+        self.join()
+
+    def run(self):
+        renderer = PieChartRenderer()
+        while True:
+            item = self._queue.get()
+            while item is not self._STOP and not self._queue.empty():
+                item = self._queue.get()
+            if item is self._STOP:
+                return
+            mulai = time.perf_counter()
+            rgba, lebar, tinggi = renderer.render(*item)
+            selesai = time.perf_counter()
+            if PROFILER.enabled:
+                PROFILER.record('render_pie_chart', mulai, selesai)
+            self.on_rendered(rgba, lebar, tinggi, (selesai - mulai) * 1000)
@@ -0,0 +1,96 @@
+# Klien untuk mode server (keuangan.server), cukup dengan pustaka standar. Satu koneksi
+# keep-alive dipakai ulang untuk semua permintaan; buat satu klien per thread.
+#
+#   klien = LedgerClient('127.0.0.1', 8765)
+#   klien.add('pengeluaran', 'Makan & Minum', 25000, '2024-05-01')
+#   klien.summary(dari='2024-05-01', sampai='2024-05-31')
+import http.client
+import json
+from urllib.parse import urlencode
+
+from .server import SERVER_HOST, SERVER_PORT
+
+
+# Jawaban server dengan status selain 2xx; message berisi pesan kesalahan dari server
+class ServerError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+def _query(jenis, kategori, dari, sampai, **extra):
+    params = {'jenis': jenis, 'kategori': kategori, 'dari': dari, 'sampai': sampai, **extra}
+    return urlencode({nama: nilai for nama, nilai in params.items() if nilai is not None})
+
+
+class LedgerClient:
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, timeout=10):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.conn = None
+
+    # Mengirim permintaan dan mengembalikan body JSON. Koneksi yang sudah ditutup server
+    # dibuka ulang sekali
+    def request(self, method, path, body=None):
+        data = None if body is None else json.dumps(body).encode('utf-8')
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        for percobaan in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request(method, path, data, headers)
+                response = self.conn.getresponse()
+                isi = json.loads(response.read() or b'null')
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if percobaan:
+                    raise
+        if response.getheader('Connection', '').lower() == 'close':
+            self.close()
+        if response.status >= 300:
+            raise ServerError(response.status, isi.get('error') if isinstance(isi, dict) else isi)
+        return isi
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    # Satu halaman transaksi yang lolos filter: {"total", "offset", "items"}
+    def query(self, jenis=None, kategori=None, dari=None, sampai=None, offset=0, limit=None):
+        return self.request('GET', '/transaksi?' + _query(jenis, kategori, dari, sampai,
+                                                          offset=offset, limit=limit))
+
+    def get(self, transaksi_id):
+        return self.request('GET', f'/transaksi/{transaksi_id}')
+
+    def add(self, jenis, kategori, nominal, tanggal):
+        return self.request('POST', '/transaksi', {'jenis': jenis, 'kategori': kategori,
+                                                   'nominal': nominal, 'tanggal': tanggal})
+
+    def edit(self, transaksi_id, jenis, kategori, nominal, tanggal):
+        return self.request('PUT', f'/transaksi/{transaksi_id}',
+                            {'jenis': jenis, 'kategori': kategori, 'nominal': nominal, 'tanggal': tanggal})
+
+    def delete(self, transaksi_id):
+        return self.request('DELETE', f'/transaksi/{transaksi_id}')
+
+    # Total pemasukan, pengeluaran dan saldo untuk filter
+    def summary(self, jenis=None, kategori=None, dari=None, sampai=None):
+        return self.request('GET', '/ringkasan?' + _query(jenis, kategori, dari, sampai))
+
+    # Total per kategori: {"pemasukan": {...}, "pengeluaran": {...}}
+    def category_totals(self, jenis=None, kategori=None, dari=None, sampai=None):
+        return self.request('GET', '/kategori?' + _query(jenis, kategori, dari, sampai))
+
+    def monthly_report(self, jenis=None, kategori=None):
+        return self.request('GET', '/laporan?' + _query(jenis, kategori, None, None))
+
+    def undo(self):
+        return self.request('POST', '/undo')
+
+    def redo(self):
+        return self.request('POST', '/redo')
@@ -0,0 +1,133 @@
+# Penyimpanan kolom berbasis NumPy untuk analitik
+from datetime import date
+
+import numpy as np
+
+
+# Penyimpanan kolom (columnar) berbasis NumPy untuk analitik: nominal int64, tanggal sebagai
+# ordinal int32, jenis uint8 dan kategori uint32 yang di-encode lewat tabel string (kategori dari
+# impor berupa teks bebas, bisa lebih dari 65535 macam). Isi kolom 25 byte per transaksi (ditambah
+# cadangan kapasitas hingga dua kali lipat), tetapi disimpan di samping objek Transaksi milik
+# engine, jadi memori total bertambah, bukan berkurang.
+# Baris diurutkan menurut id sehingga baris sebuah transaksi dicari dengan np.searchsorted tanpa
+# dict per transaksi. Menambah id baru (terbesar) cukup di akhir; id lama yang kembali lewat undo
+# menggeser baris sesudahnya. Baris yang dihapus ditandai JENIS_DIHAPUS (dipakai lagi jika id yang
+# sama ditambahkan, misalnya edit atau undo hapus) dan dibuang sekaligus setelah mencapai separuh isi.
+class ColumnarStore:
+    JENIS_CODES = {'pemasukan': 0, 'pengeluaran': 1}
+    JENIS_LAIN = 255  # Jenis di luar pemasukan/pengeluaran, tidak ikut dijumlah
+    JENIS_DIHAPUS = 254  # Baris transaksi yang sudah dihapus
+
+    def __init__(self, data=(), capacity=1024):
+        data = sorted(data, key=lambda t: t.id)
+        capacity = max(capacity, len(data))
+        self.size = 0
+        self.dead = 0  # Jumlah baris JENIS_DIHAPUS
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.nominal = np.zeros(capacity, dtype=np.int64)
+        self.tanggal = np.zeros(capacity, dtype=np.int32)
+        self.jenis = np.zeros(capacity, dtype=np.uint8)
+        self.kategori = np.zeros(capacity, dtype=np.uint32)
+        self.kategori_names = []  # kode -> nama kategori
+        self._kategori_codes = {}  # nama kategori -> kode
+        for t in data:
+            self.add(t)
+
+    def _columns(self):
+        return (self.ids, self.nominal, self.tanggal, self.jenis, self.kategori)
+
+    def _kategori_code(self, kategori):
+        code = self._kategori_codes.get(kategori)
+        if code is None:
+            code = self._kategori_codes[kategori] = len(self.kategori_names)
+            self.kategori_names.append(kategori)
+        return code
+
+    # Posisi baris untuk id (posisi sisipan jika id belum ada)
+    def _position(self, id):
+        return int(np.searchsorted(self.ids[:self.size], id))
+
+    def _set(self, row, t):
+        self.ids[row] = t.id
+        self.nominal[row] = t.nominal
+        self.tanggal[row] = date.fromisoformat(t.tanggal).toordinal()
+        self.jenis[row] = self.JENIS_CODES.get(t.jenis, self.JENIS_LAIN)
+        self.kategori[row] = self._kategori_code(t.kategori)
+
+    # Id baru biasanya terbesar sehingga cukup ditambahkan di akhir; id lama yang kembali lewat
+    # undo disisipkan dengan menggeser baris sesudahnya
+    def add(self, t):
+        row = self._position(t.id)
+        if row < self.size and self.ids[row] == t.id:
+            if self.jenis[row] == self.JENIS_DIHAPUS:
+                self.dead -= 1
+            self._set(row, t)
+            return
+        if self.size == len(self.ids):
+            self.ids, self.nominal, self.tanggal, self.jenis, self.kategori = (
+                np.resize(column, 2 * len(column)) for column in self._columns())
+        if row < self.size:
+            for column in self._columns():
+                column[row + 1:self.size + 1] = column[row:self.size]
+        self._set(row, t)
+        self.size += 1
+
+    def remove(self, t):
+        row = self._position(t.id)
+        if row == self.size or self.ids[row] != t.id or self.jenis[row] == self.JENIS_DIHAPUS:
+            raise KeyError(t.id)
+        self.jenis[row] = self.JENIS_DIHAPUS
+        self.dead += 1
+        if self.dead * 2 > self.size:
+            self._compact()
+
+    # Membuang baris JENIS_DIHAPUS, urutan id tetap
+    def _compact(self):
+        keep = self.jenis[:self.size] != self.JENIS_DIHAPUS
+        size = int(keep.sum())
+        for column in self._columns():
+            column[:size] = column[:self.size][keep]
+        self.size = size
+        self.dead = 0
+
+    # Mask boolean untuk baris yang cocok dengan filter (None berarti semua baris yang belum dihapus)
+    def mask(self, filters=None):
+        mask = self.jenis[:self.size] != self.JENIS_DIHAPUS
+        if filters is None:
+            return mask
+        jenis, kategori, tanggal_mulai, tanggal_akhir = filters
+        tanggal = self.tanggal[:self.size]
+        mask &= ((tanggal >= date.fromisoformat(tanggal_mulai).toordinal()) &
+                 (tanggal <= date.fromisoformat(tanggal_akhir).toordinal()))
+        if jenis != "Semua":
+            mask &= self.jenis[:self.size] == self.JENIS_CODES.get(jenis, self.JENIS_LAIN)
+        if kategori != "Semua":
+            # Kategori dibandingkan tanpa membedakan huruf besar/kecil, bisa cocok ke beberapa kode
+            codes = [code for code, name in enumerate(self.kategori_names) if name.lower() == kategori.lower()]
+            mask &= np.isin(self.kategori[:self.size], codes)
+        return mask
+
+    # Total pemasukan dan pengeluaran
+    def totals(self, filters=None):
+        mask = self.mask(filters)
+        jenis = self.jenis[:self.size]
+        nominal = self.nominal[:self.size]
+        return (int(nominal[mask & (jenis == 0)].sum()), int(nominal[mask & (jenis == 1)].sum()))
+
+    def saldo(self, filters=None):
+        pemasukan, pengeluaran = self.totals(filters)
+        return pemasukan - pengeluaran
+
+    # Total per kategori untuk pemasukan dan pengeluaran, dikelompokkan dengan bincount
+    def category_totals(self, filters=None):
+        mask = self.mask(filters)
+        result = []
+        for code in (0, 1):
+            selected = mask & (self.jenis[:self.size] == code)
+            # Bobot bincount berupa float64, masih tepat untuk total di bawah 2**53
+            sums = np.bincount(self.kategori[:self.size][selected],
+                               weights=self.nominal[:self.size][selected],
+                               minlength=len(self.kategori_names))
+            counts = np.bincount(self.kategori[:self.size][selected], minlength=len(self.kategori_names))
+            result.append({self.kategori_names[c]: int(sums[c]) for c in np.flatnonzero(counts)})
+        return result[0], result[1]
@@ -0,0 +1,567 @@
+# Mesin pembukuan tanpa GUI: memuat dan menyimpan transaksi, menambah/mengedit/menghapus/undo,
+# filter, total, peringatan dan agregasi diagram. Bisa dipakai dari skrip tanpa QApplication
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
+
+from .alerts import build_alert_rules
+from .events import ChangeBus, ChangeEvent
+from .exporter import EXPORT_CHUNK_SIZE
+from .history import HISTORY_FILE, HISTORY_MAX_RECORDS, CommandLog
+from .indexes import DateIndex, RunningTotals, DailyExpenseBuckets
+from .persistence import PersistenceWorker
+from .records import index_by_id, group_by_category, match_filters
+from .rollup import ROLLUP_FILE, RollupCube, ledger_stamp, next_month, previous_month, month_end
+from .storage import CONFIG_FILE, STORAGE_MODE, create_storage, load_config, save_config
+from .timing import PROFILER
+from .transaksi import Transaksi
+
+BOROS_LIMIT_HARI = 7  # Durasi hari berturut-turut untuk peringatan boros
+BOROS_BATAS_HARIAN = 1000000  # Batas pengeluaran harian disebut boros
+
+# Jumlah hasil filter terakhir yang disimpan di cache
+FILTER_CACHE_SIZE = 8
+
+
+# True jika tanggal berformat YYYY-MM-DD. Di-cache karena impor massal berisi banyak tanggal yang sama
+@lru_cache(maxsize=4096)
+def valid_tanggal(tanggal):
+    try:
+        datetime.strptime(tanggal, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+# Buku kas berisi seluruh transaksi beserta index dan total berjalan. Semua file (database.json,
+# config.json, jurnal, SQLite) dibaca dari `directory`. Dengan background=False setiap perubahan
+# langsung ditulis di thread pemanggil, cocok untuk skrip batch. Dengan load=False data belum
+# dimuat: panggil storage.load() sendiri (misalnya di thread lain) lalu serahkan hasilnya ke attach().
+# Dengan read_only=True (ekspor, benchmark) engine hanya membaca: config.json dan rollup tidak
+# dibuat di folder pengguna dan perubahan transaksi ditolak
+class LedgerEngine:
+    def __init__(self, directory='.', config=None, on_saved=None, on_failed=None, background=True,
+                 load=True, read_only=False):
+        self.read_only = read_only
+        self.config_file = os.path.join(directory, CONFIG_FILE)
+        self.config = load_config(self.config_file, create=not read_only) if config is None else config
+        self.storage = create_storage(self.config.get('storage_mode', STORAGE_MODE), directory, self.config)
+        # Dipegang selama transaksi diubah dan op-nya dikirim ke penyimpanan, dan saat
+        # PersistenceWorker mengambil salinan data untuk batch (lihat write_snapshot)
+        self.lock = threading.Lock()
+        self.persistence = None
+        if background:
+            self.persistence = PersistenceWorker(self.storage, on_saved=on_saved, on_failed=on_failed,
+                                                 after_write=self.save_rollup, snapshot=self.write_snapshot,
+                                                 lock=self.lock)
+            self.persistence.start()
+        self.alert_rules = build_alert_rules(self.config, BOROS_LIMIT_HARI, BOROS_BATAS_HARIAN)
+        self.transaksi = {}  # dict id -> transaksi, urut sesuai waktu ditambahkan
+        self.next_id = 1
+        self.loaded = False
+        # Riwayat tambah/edit/hapus/impor untuk undo dan redo, disimpan di samping buku kas
+        self.history = CommandLog(os.path.join(directory, HISTORY_FILE),
+                                  self.config.get('undo_max_records', HISTORY_MAX_RECORDS))
+        self.history.load()
+        if background:
+            # Riwayat ditulis di thread sendiri, terpisah dari buku kas
+            self.history.writer = PersistenceWorker(self.history.file, on_failed=on_failed, span='save_history')
+            self.history.writer.start()
+        self.generation = 0  # Bertambah setiap data berubah, dipakai sebagai kunci cache filter
+        self.filter_cache = OrderedDict()  # (filter, generasi) -> hasil filter
+        self.aggregate_cache = OrderedDict()  # (filter, generasi) -> total per kategori untuk diagram
+        self.changes = ChangeBus()  # Pendengar ChangeEvent setiap kali buku kas berubah
+        # Rollup bulanan yang tersimpan dipakai untuk laporan selama riwayat belum dimuat,
+        # asalkan file buku kas belum berubah sejak rollup itu ditulis
+        self.rollup_file = os.path.join(directory, ROLLUP_FILE)
+        stored_rollup = RollupCube.load(self.rollup_file, ledger_stamp(self.storage.ledger_files()))
+        self.rollup_current = stored_rollup is not None
+        with PROFILER.span('load_data'):
+            records = self.storage.load() if load else ()
+        self.attach(records)
+        self.loaded = load
+        if not load and stored_rollup is not None:
+            self.rollup = stored_rollup
+
+    # Memasang hasil storage.load() sebagai data utama dan membangun ulang index serta total.
+    # Dict transaksi diisi ulang di tempat, sehingga referensi ke self.transaksi tetap berlaku
+    def attach(self, records):
+        transaksi, self.next_id = index_by_id(records)
+        # Id transaksi yang masih bisa dikembalikan lewat undo/redo tidak boleh dipakai ulang
+        self.next_id = max(self.next_id, self.history.max_id() + 1)
+        self.transaksi.clear()
+        self.transaksi.update(transaksi)
+        records = self.transaksi.values()
+        self.date_index = DateIndex(records)
+        self.totals = RunningTotals(records)
+        self.expense_buckets = DailyExpenseBuckets(records)
+        self.rollup = RollupCube(records)
+        # Penyimpanan kolom NumPy opsional untuk saldo, total filter dan agregasi diagram, aktifkan lewat
+        # 'columnar_store'. NumPy hanya diimpor jika opsi ini aktif
+        self.columnar = None
+        if self.config.get('columnar_store', False):
+            from .columnar import ColumnarStore
+            self.columnar = ColumnarStore(records)
+        self.generation += 1
+        self.filter_cache.clear()
+        self.aggregate_cache.clear()
+        self.loaded = True
+        # Rollup yang belum pernah disimpan (atau sudah tidak cocok) ditulis sekali agar startup
+        # berikutnya bisa langsung memakainya
+        if self.transaksi and not self.rollup_current and not self.read_only:
+            self.save_rollup()
+
+    # Transaksi terbaru untuk tampilan awal, None jika backend harus membaca semua data dulu
+    def load_recent(self, limit):
+        return self.storage.load_recent(limit)
+
+    # Memuat seluruh riwayat di thread terpisah, dibaca bertahap per batch. on_batch menerima
+    # setiap batch begitu selesai diurai (untuk menampilkan baris pertama lebih cepat),
+    # on_progress menerima (selesai, total), on_loaded menerima list seluruh transaksi yang harus
+    # diserahkan ke attach() dari thread pemakai engine, on_failed menerima pesan kesalahan
+    def load_in_background(self, on_loaded, on_failed=None, on_batch=None, on_progress=None):
+        def run():
+            records = []
+            mulai = time.perf_counter()
+            try:
+                for batch in self.storage.load_batches(progress=on_progress):
+                    # Diubah menjadi Transaksi per batch agar dict hasil parsing segera dibuang
+                    batch = [Transaksi.from_dict(t) for t in batch]
+                    records.extend(batch)
+                    if on_batch is not None:
+                        on_batch(batch)
+            except Exception as e:
+                if on_failed is not None:
+                    on_failed(str(e))
+                return
+            if PROFILER.enabled:
+                PROFILER.record('load_data', mulai, time.perf_counter())
+            on_loaded(records)
+        threading.Thread(target=run, daemon=True).start()
+
+    # Perubahan sebelum seluruh data dimuat bisa memakai id yang sudah terpakai
+    def require_loaded(self):
+        if not self.loaded:
+            raise RuntimeError("Data transaksi belum selesai dimuat")
+
+    # Dipanggil sebelum setiap perubahan transaksi
+    def require_writable(self):
+        if self.read_only:
+            raise RuntimeError("Buku kas dibuka hanya untuk dibaca")
+        self.require_loaded()
+
+    # Simpan konfigurasi (misalnya target tabungan) ke config.json
+    def save_config(self):
+        save_config(self.config, self.config_file)
+
+    # Kirim perubahan ke penyimpanan. Di background cukup op-nya; salinan seluruh transaksi (untuk
+    # backend json/biner) dan sel rollup diambil PersistenceWorker lewat write_snapshot sekali per
+    # batch, bukan di thread GUI untuk setiap perubahan
+    def persist(self, op, value):
+        self.persist_many([(op, value)])
+
+    # Banyak perubahan sekaligus, ditulis sebagai satu batch
+    def persist_many(self, ops):
+        if self.persistence is None:
+            records = list(self.transaksi.values()) if self.storage.needs_snapshot else None
+            with PROFILER.span('save_data'):
+                self.storage.write_batch(ops, records)
+            self.save_rollup()
+        else:
+            self.persistence.submit_many(ops)
+
+    # Dipanggil PersistenceWorker di bawah self.lock saat batch akan ditulis: (salinan transaksi
+    # untuk backend yang menulis ulang semuanya, salinan sel rollup). Karena setiap perubahan
+    # beserta op-nya dibuat di bawah kunci yang sama, salinan ini cocok dengan ops batch tersebut
+    def write_snapshot(self):
+        records = list(self.transaksi.values()) if self.storage.needs_snapshot else None
+        return records, self.rollup.cells.copy()
+
+    # Menulis rollup bulanan beserta penanda file buku kas. Dipanggil setelah buku kas ditulis.
+    # Dari thread penyimpanan, `cells` adalah salinan sel yang diambil bersama batch yang baru
+    # ditulis, agar perubahan yang masih antre tidak ikut tercap cocok dengan file di disk
+    def save_rollup(self, cells=None):
+        cells = self.rollup.cells.copy() if cells is None else cells
+        self.rollup.save(self.rollup_file, ledger_stamp(self.storage.ledger_files()), cells)
+        self.rollup_current = True
+
+    # Laporan dan target tabungan sudah bisa dijawab: seluruh data sudah dimuat, atau rollup
+    # yang tersimpan masih cocok dengan buku kas
+    @property
+    def reports_ready(self):
+        return self.loaded or self.rollup_current
+
+    # query() sudah bisa dipakai: seluruh data sudah dimuat, atau backend bisa menjawab filter
+    # langsung dari file (penyimpanan berpartisi)
+    @property
+    def can_query(self):
+        return self.loaded or self.storage.lazy
+
+    # Query SQLite hanya dipakai jika semua perubahan sudah tertulis, jika belum pakai index di memori
+    def use_pushdown(self):
+        return self.storage.pushdown and (self.persistence is None or not self.persistence.has_pending())
+
+    # Tulis semua perubahan yang tertunda tanpa menutup penyimpanan
+    def flush(self):
+        if self.persistence is not None:
+            self.persistence.flush()
+        if self.history.writer is not None:
+            self.history.writer.flush()
+
+    # Tulis semua perubahan yang tertunda dan tutup backend penyimpanan
+    def close(self):
+        if self.persistence is not None:
+            self.persistence.stop()
+        if self.history.writer is not None:
+            self.history.writer.stop()
+        self.storage.close()
+
+    # Perbarui index dan total berjalan untuk transaksi yang baru masuk ke data utama
+    def index_add(self, transaksi):
+        self.generation += 1
+        self.date_index.add(transaksi)
+        self.totals.add(transaksi)
+        self.expense_buckets.add(transaksi)
+        self.rollup.add(transaksi)
+        if self.columnar is not None:
+            self.columnar.add(transaksi)
+
+    # Perbarui index dan total berjalan untuk transaksi yang keluar dari data utama
+    def index_remove(self, transaksi):
+        self.generation += 1
+        self.date_index.remove(transaksi)
+        self.totals.remove(transaksi)
+        self.expense_buckets.remove(transaksi)
+        self.rollup.remove(transaksi)
+        if self.columnar is not None:
+            self.columnar.remove(transaksi)
+
+    # Validasi isi transaksi, ValueError berisi pesan yang bisa langsung ditampilkan ke pengguna
+    def validate(self, jenis, kategori, nominal, tanggal):
+        if not isinstance(jenis, str) or jenis not in ('pemasukan', 'pengeluaran'):
+            raise ValueError("Jenis harus pemasukan atau pengeluaran!")
+        if not isinstance(kategori, str) or not kategori.strip():
+            raise ValueError("Kategori tidak boleh kosong!")
+        # bool juga turunan int, tetapi true/false dari JSON bukan nominal
+        if isinstance(nominal, bool) or not isinstance(nominal, int) or nominal <= 0:
+            raise ValueError("Nominal harus berupa angka positif!")
+        if not isinstance(tanggal, str) or not valid_tanggal(tanggal):
+            raise ValueError("Format tanggal salah! Gunakan YYYY-MM-DD")
+
+    def get(self, transaksi_id):
+        return self.transaksi.get(transaksi_id)
+
+    # Menambah transaksi baru dan mengembalikannya
+    def add(self, jenis, kategori, nominal, tanggal):
+        self.require_writable()
+        self.validate(jenis, kategori, nominal, tanggal)
+        transaksi = Transaksi(self.next_id, jenis, kategori.strip(), nominal, tanggal)
+        self.next_id += 1
+        generation = self.generation
+        with self.lock:
+            self.transaksi[transaksi.id] = transaksi
+            self.index_add(transaksi)
+            self.history.record('add', [(None, transaksi)])
+            self.persist('add', transaksi)
+        self.notify('add', [(None, transaksi)], generation)
+        return transaksi
+
+    # Menambah banyak transaksi sekaligus, misalnya hasil impor. `rows` berisi tuple
+    # (jenis, kategori, nominal, tanggal). Semua baris divalidasi dulu: jika ada yang tidak valid
+    # tidak ada yang ditambahkan (ValueError menyebut urutan barisnya). Index diperbarui sekali
+    # dan seluruh baris ditulis dalam satu batch. Mengembalikan list transaksi baru
+    def add_many(self, rows):
+        self.require_writable()
+        for i, (jenis, kategori, nominal, tanggal) in enumerate(rows, start=1):
+            try:
+                self.validate(jenis, kategori, nominal, tanggal)
+            except ValueError as e:
+                raise ValueError(f"Baris ke-{i}: {e}")
+        baru = []
+        for jenis, kategori, nominal, tanggal in rows:
+            baru.append(Transaksi(self.next_id, jenis, kategori.strip(), nominal, tanggal))
+            self.next_id += 1
+        if not baru:
+            return baru
+        generation = self.generation
+        with self.lock:
+            self.transaksi.update((t.id, t) for t in baru)
+            self.generation += 1
+            self.date_index.add_many(baru)
+            for t in baru:
+                self.totals.add(t)
+                self.expense_buckets.add(t)
+                self.rollup.add(t)
+                if self.columnar is not None:
+                    self.columnar.add(t)
+            changes = [(None, t) for t in baru]
+            self.history.record('import', changes)
+            self.persist_many([('add', t) for t in baru])
+        self.notify('import', changes, generation)
+        return baru
+
+    # Mengganti isi transaksi dengan id tertentu dan mengembalikan versi barunya
+    def edit(self, transaksi_id, jenis, kategori, nominal, tanggal):
+        self.require_writable()
+        if transaksi_id not in self.transaksi:
+            raise KeyError(transaksi_id)
+        self.validate(jenis, kategori, nominal, tanggal)
+        transaksi_updated = Transaksi(transaksi_id, jenis, kategori.strip(), nominal, tanggal)
+        transaksi_lama = self.transaksi[transaksi_id]
+        generation = self.generation
+        with self.lock:
+            self.index_remove(transaksi_lama)
+            self.index_add(transaksi_updated)
+            self.transaksi[transaksi_id] = transaksi_updated
+            self.history.record('edit', [(transaksi_lama, transaksi_updated)])
+            self.persist('edit', transaksi_updated)
+        self.notify('edit', [(transaksi_lama, transaksi_updated)], generation)
+        return transaksi_updated
+
+    # Menghapus transaksi dengan id tertentu dan mengembalikan transaksi yang dihapus
+    def delete(self, transaksi_id):
+        self.require_writable()
+        generation = self.generation
+        with self.lock:
+            transaksi = self.transaksi.pop(transaksi_id)
+            self.index_remove(transaksi)
+            self.history.record('delete', [(transaksi, None)])
+            self.persist('delete', transaksi_id)
+        self.notify('delete', [(transaksi, None)], generation)
+        return transaksi
+
+    # Memberi tahu pendengar tentang perubahan. Total per kategori di cache diagram yang dihitung
+    # sebelum perubahan (generasi `generation`) disesuaikan dengan selisihnya saja, tidak
+    # dihitung ulang
+    def notify(self, label, changes, generation):
+        event = ChangeEvent(label, changes)
+        for (filters, gen), totals in list(self.aggregate_cache.items()):
+            del self.aggregate_cache[(filters, gen)]
+            if gen == generation:
+                self.aggregate_cache[(filters, self.generation)] = self.patch_totals(totals, event, filters)
+        self.changes.emit(event)
+
+    # Salinan total per kategori (pemasukan, pengeluaran) setelah perubahan pada event. Salinan,
+    # bukan diubah di tempat, karena dict lama mungkin sedang digambar thread diagram
+    def patch_totals(self, totals, event, filters):
+        per_jenis = {'pemasukan': dict(totals[0]), 'pengeluaran': dict(totals[1])}
+        for posisi, tanda in ((0, -1), (1, 1)):
+            for t in (change[posisi] for change in event.changes):
+                if t is None or t.jenis not in per_jenis or (filters is not None and not match_filters(t, filters)):
+                    continue
+                kategori = per_jenis[t.jenis]
+                total = kategori.get(t.kategori, 0) + tanda * t.nominal
+                if total:
+                    kategori[t.kategori] = total
+                else:
+                    kategori.pop(t.kategori, None)
+        return per_jenis['pemasukan'], per_jenis['pengeluaran']
+
+    # True jika setiap transaksi masih dalam keadaan `sebelum` (None berarti tidak ada). Objek
+    # yang sama cukup dibandingkan identitasnya; isinya dibandingkan jika riwayat dibaca dari file
+    def changes_apply(self, changes):
+        for sebelum, sesudah in changes:
+            sekarang = self.transaksi.get((sebelum or sesudah).id)
+            if sekarang is not sebelum and sekarang != sebelum:
+                return False
+        return True
+
+    # Mengubah setiap transaksi dari keadaan sebelum ke sesudah tanpa mencatat riwayat, lalu
+    # menulis semuanya sebagai satu batch. Index tanggal diperbarui sekaligus seperti add_many.
+    # Pendengar diberi tahu dengan label `label` ('undo' atau 'redo')
+    def apply_changes(self, changes, label):
+        generation = self.generation
+        lama = [sebelum for sebelum, _ in changes if sebelum is not None]
+        baru = [sesudah for _, sesudah in changes if sesudah is not None]
+        with self.lock:
+            # Transaksi yang diedit tetap di posisinya dalam urutan tambah, seperti edit()
+            for sebelum, sesudah in changes:
+                if sesudah is None:
+                    del self.transaksi[sebelum.id]
+                else:
+                    self.transaksi[sesudah.id] = sesudah
+            self.generation += 1
+            self.date_index.remove_many(lama)
+            self.date_index.add_many(baru)
+            for t in lama:
+                self.totals.remove(t)
+                self.expense_buckets.remove(t)
+                self.rollup.remove(t)
+                if self.columnar is not None:
+                    self.columnar.remove(t)
+            for t in baru:
+                self.totals.add(t)
+                self.expense_buckets.add(t)
+                self.rollup.add(t)
+                if self.columnar is not None:
+                    self.columnar.add(t)
+            ops = []
+            for sebelum, sesudah in changes:
+                if sesudah is None:
+                    ops.append(('delete', sebelum.id))
+                else:
+                    ops.append(('add' if sebelum is None else 'edit', sesudah))
+            self.persist_many(ops)
+        self.notify(label, changes, generation)
+
+    # Membatalkan perintah terakhir (tambah, edit, hapus atau impor) dan mengembalikan
+    # (label, perubahan), None jika tidak ada. Perintah yang transaksinya sudah diubah dengan cara
+    # lain (misalnya lewat file yang diedit di luar aplikasi) dibuang dan dilewati
+    def undo(self):
+        self.require_writable()
+        while self.history.peek_undo() is not None:
+            label, changes = self.history.peek_undo()
+            kebalikan = [(sesudah, sebelum) for sebelum, sesudah in reversed(changes)]
+            if self.changes_apply(kebalikan):
+                self.apply_changes(kebalikan, 'undo')
+                self.history.undo()
+                return label, changes
+            self.history.drop_undo()
+        return None
+
+    # Mengulang perintah yang terakhir di-undo, seperti undo()
+    def redo(self):
+        self.require_writable()
+        while self.history.peek_redo() is not None:
+            label, changes = self.history.peek_redo()
+            if self.changes_apply(changes):
+                self.apply_changes(changes, 'redo')
+                self.history.redo()
+                return label, changes
+            self.history.drop_redo()
+        return None
+
+    # Transaksi yang lolos filter, urut tanggal. Hasil untuk data yang belum berubah diambil dari cache
+    def query(self, filters):
+        key = (filters, self.generation)
+        filtered = self.filter_cache.get(key)
+        if filtered is not None:
+            self.filter_cache.move_to_end(key)
+            return filtered
+        # Rentang tanggal dicari lewat index terurut; SQLite menjalankan query-nya sendiri
+        if self.use_pushdown():
+            filtered = self.storage.query(self.transaksi, filters)
+        elif not self.loaded and self.storage.lazy:
+            # Selama riwayat dimuat, backend berpartisi hanya membaca partisi dalam rentang filter
+            filtered = self.storage.query(None, filters)
+        else:
+            filtered = self.date_index.query(filters)
+        self.filter_cache[key] = filtered
+        # Hasil dari generasi data lama tidak akan terpakai lagi
+        for old_key in [k for k in self.filter_cache if k[1] != self.generation]:
+            del self.filter_cache[old_key]
+        while len(self.filter_cache) > FILTER_CACHE_SIZE:
+            self.filter_cache.popitem(last=False)
+        return filtered
+
+    # Saldo seluruh transaksi. Selama riwayat dimuat, dijawab dari rollup yang tersimpan
+    # (lihat reports_ready); dengan 'columnar_store' dihitung dari kolom NumPy
+    @property
+    def saldo(self):
+        if not self.loaded:
+            return self.rollup.saldo()
+        if self.columnar is not None:
+            return self.columnar.saldo()
+        return self.totals.saldo
+
+    # Penyimpanan kolom hanya dipakai setelah seluruh data dimuat (sebelumnya isinya kosong)
+    def use_columnar(self):
+        return self.columnar is not None and self.loaded
+
+    # Total (pemasukan, pengeluaran) transaksi yang lolos filter, untuk baris total tabel.
+    # Diturunkan dari category_totals (rollup, pushdown atau cache), atau dari kolom NumPy
+    def filter_totals(self, filters=None):
+        if self.use_columnar():
+            return self.columnar.totals(filters)
+        pemasukan, pengeluaran = self.category_totals(filters)
+        return sum(pemasukan.values()), sum(pengeluaran.values())
+
+    # Total per kategori (pemasukan, pengeluaran) untuk diagram, dari seluruh data jika filters None.
+    # Hasil untuk data yang belum berubah diambil dari cache, seperti query(). Dengan
+    # 'columnar_store' seluruh pengelompokan dijalankan sebagai operasi vektor NumPy
+    def category_totals(self, filters=None):
+        key = (filters, self.generation)
+        totals = self.aggregate_cache.get(key)
+        if totals is not None:
+            self.aggregate_cache.move_to_end(key)
+            return totals
+        if not self.loaded and self.storage.lazy:
+            # Selama riwayat dimuat, backend menghitung langsung dari file: snapshot biner lewat
+            # mmap, atau hanya partisi dalam rentang filter
+            totals = self.storage.category_totals(None, filters)
+        elif self.use_columnar():
+            totals = self.columnar.category_totals(filters)
+        elif filters is None:
+            totals = self.totals.category_totals()
+        else:
+            totals = self.rollup_category_totals(filters)
+        # Rentang kurang dari sebulan penuh dihitung dari transaksinya langsung
+        if totals is None:
+            if self.use_pushdown():
+                totals = self.storage.category_totals(self.transaksi, filters)
+            else:
+                totals = group_by_category(self.query(filters))
+        self.aggregate_cache[key] = totals
+        for old_key in [k for k in self.aggregate_cache if k[1] != self.generation]:
+            del self.aggregate_cache[old_key]
+        while len(self.aggregate_cache) > FILTER_CACHE_SIZE:
+            self.aggregate_cache.popitem(last=False)
+        return totals
+
+    # Total per kategori untuk filter dari rollup: bulan yang tercakup penuh dibaca dari sel rollup,
+    # hanya sisa hari di bulan pertama dan terakhir yang dipindai lewat index tanggal.
+    # None jika rentang filter tidak mencakup satu bulan penuh pun
+    def rollup_category_totals(self, filters):
+        jenis, kategori, tanggal_mulai, tanggal_akhir = filters
+        bulan_mulai = tanggal_mulai[:7] if tanggal_mulai[8:] == '01' else next_month(tanggal_mulai[:7])
+        bulan_akhir = tanggal_akhir[:7] if tanggal_akhir == month_end(tanggal_akhir[:7]) \
+            else previous_month(tanggal_akhir[:7])
+        if bulan_mulai > bulan_akhir:
+            return None
+        pemasukan, pengeluaran = self.rollup.category_totals(jenis, kategori, bulan_mulai, bulan_akhir)
+        sisa = []
+        if tanggal_mulai < bulan_mulai + '-01':
+            sisa += self.date_index.query((jenis, kategori, tanggal_mulai, month_end(tanggal_mulai[:7])))
+        if tanggal_akhir > month_end(bulan_akhir):
+            sisa += self.date_index.query((jenis, kategori, next_month(bulan_akhir) + '-01', tanggal_akhir))
+        for target, per_kategori in zip((pemasukan, pengeluaran), group_by_category(sisa)):
+            for nama, total in per_kategori.items():
+                target[nama] = target.get(nama, 0) + total
+        return pemasukan, pengeluaran
+
+    # Sumber ekspor untuk filter: (jumlah transaksi, iterator chunk transaksi). Dipanggil dari
+    # thread pemakai engine; iteratornya boleh dihabiskan di thread lain. SQLite membaca lewat
+    # cursor per chunk, backend lain memakai hasil query di memori (list referensi, bukan salinan)
+    def export_source(self, filters, chunk_size=EXPORT_CHUNK_SIZE):
+        if self.use_pushdown():
+            return (self.storage.count(self.transaksi, filters),
+                    self.storage.iter_query(self.transaksi, filters, chunk_size))
+        rows = self.query(filters)
+        return len(rows), (rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size))
+
+    # Laporan bulan ke bulan dari rollup: list (bulan, pemasukan, pengeluaran, jumlah transaksi)
+    def monthly_report(self, jenis="Semua", kategori="Semua"):
+        return self.rollup.monthly_report(jenis, kategori)
+
+    # Total pemasukan dan pengeluaran satu bulan ('YYYY-MM'), dari rollup
+    def month_totals(self, bulan):
+        return self.rollup.month_totals(bulan)
+
+    # Hari yang pengeluarannya bertambah karena transaksi ini (kosong untuk pemasukan)
+    def expense_days(self, transaksi):
+        if transaksi.jenis != 'pengeluaran':
+            return []
+        return [date.fromisoformat(transaksi.tanggal)]
+
+    # Jalankan semua aturan peringatan, hanya untuk hari yang pengeluarannya baru bertambah.
+    # Mengembalikan daftar (judul, pesan)
+    def check_alerts(self, changed_days=()):
+        alerts = []
+        for rule in self.alert_rules:
+            alert = rule.check(self.expense_buckets, self.totals, changed_days)
+            if alert is not None:
+                alerts.append(alert)
+        return alerts
@@ -0,0 +1,54 @@
+# Notifikasi perubahan buku kas. Setiap tambah, edit, hapus, impor, undo dan redo menghasilkan
+# satu ChangeEvent berisi transaksi yang berubah beserta hari, bulan dan kategori yang terkena,
+# sehingga pendengarnya (tabel, label ringkasan, target, peringatan, cache diagram) cukup
+# menerapkan perubahan itu saja tanpa menghitung ulang seluruh data
+from datetime import date
+
+from .records import match_filters
+
+
+# Satu perubahan buku kas. `changes` berupa tuple (sebelum, sesudah) per transaksi: (None, t)
+# untuk tambah, (t, None) untuk hapus, (lama, baru) untuk edit
+class ChangeEvent:
+    __slots__ = ('label', 'changes', 'days', 'months', 'categories')
+
+    def __init__(self, label, changes):
+        self.label = label
+        self.changes = tuple(changes)
+        days, categories = set(), set()
+        for change in self.changes:
+            for t in change:
+                if t is not None:
+                    days.add(t.tanggal)
+                    categories.add((t.jenis, t.kategori))
+        self.days = sorted(days)  # Tanggal 'YYYY-MM-DD' yang terkena
+        self.months = {hari[:7] for hari in days}
+        self.categories = categories  # (jenis, kategori) yang terkena
+
+    # Hari yang pengeluarannya bertambah, untuk aturan peringatan
+    def expense_days(self):
+        return sorted({date.fromisoformat(sesudah.tanggal) for _, sesudah in self.changes
+                       if sesudah is not None and sesudah.jenis == 'pengeluaran'})
+
+    # True jika ada transaksi (sebelum atau sesudah) yang lolos filter; filters None berarti semua
+    def touches(self, filters):
+        if filters is None:
+            return bool(self.changes)
+        return any(t is not None and match_filters(t, filters) for change in self.changes for t in change)
+
+
+# Daftar pendengar perubahan. Pendengar dipanggil berurutan di thread yang mengubah buku kas,
+# setelah index, total dan penyimpanan engine sudah diperbarui
+class ChangeBus:
+    def __init__(self):
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def emit(self, event):
+        for listener in list(self.listeners):
+            listener(event)
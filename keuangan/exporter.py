@@ -0,0 +1,86 @@
+# Ekspor transaksi ke CSV atau JSON Lines. Transaksi ditulis per chunk langsung ke file, sehingga
+# ukuran memori tidak bergantung pada banyaknya data yang diekspor. Hasil ekspor bisa dibaca lagi
+# oleh keuangan.importer.
+#
+#   python -m keuangan.exporter laporan.csv --dari 2024-01-01 --sampai 2024-12-31
+#   python -m keuangan.exporter semua.jsonl --dir folder-data
+import argparse
+import csv
+import json
+import os
+
+EXPORT_CHUNK_SIZE = 5000
+EXPORT_COLUMNS = ['id', 'jenis', 'kategori', 'nominal', 'tanggal']
+EXPORT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+# Filter yang mencakup seluruh transaksi
+SEMUA = ("Semua", "Semua", "0000-01-01", "9999-12-31")
+
+
+# Ekspor dihentikan lewat cancel sebelum selesai; file tujuan tidak diubah
+class ExportCancelled(Exception):
+    pass
+
+
+# Format dari ekstensi file tujuan, ValueError jika tidak dikenali
+def export_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"Format ekspor tidak dikenali: {ext or path} (gunakan .csv atau .jsonl)")
+    return EXPORT_FORMATS[ext]
+
+
+# Menulis chunk-chunk transaksi ke `path` (CSV atau JSON Lines sesuai ekstensinya). File ditulis
+# ke .tmp lalu diganti sekaligus. progress(selesai, total) dipanggil setiap chunk; `cancel`
+# (threading.Event) menghentikan ekspor. Mengembalikan jumlah transaksi yang ditulis
+def export_transactions(chunks, path, total=None, progress=None, cancel=None):
+    fmt = export_format(path)
+    tmp_file = path + '.tmp'
+    selesai = 0
+    try:
+        with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
+            if fmt == 'csv':
+                writer = csv.writer(f)
+                writer.writerow(EXPORT_COLUMNS)
+            for chunk in chunks:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                if fmt == 'csv':
+                    writer.writerows([getattr(t, kolom) for kolom in EXPORT_COLUMNS] for t in chunk)
+                else:
+                    f.write(''.join(json.dumps(t.to_dict(), ensure_ascii=False) + '\n' for t in chunk))
+                selesai += len(chunk)
+                if progress is not None:
+                    progress(selesai, total if total is not None else selesai)
+        os.replace(tmp_file, path)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return selesai
+
+
+def main(argv=None):
+    from .engine import LedgerEngine
+
+    parser = argparse.ArgumentParser(description="Ekspor transaksi ke CSV atau JSON Lines")
+    parser.add_argument('tujuan', help="file .csv, .jsonl atau .ndjson")
+    parser.add_argument('--dir', default='.', help="folder database.json / config.json")
+    parser.add_argument('--dari', default=SEMUA[2], help="tanggal awal YYYY-MM-DD")
+    parser.add_argument('--sampai', default=SEMUA[3], help="tanggal akhir YYYY-MM-DD")
+    parser.add_argument('--jenis', default="Semua")
+    parser.add_argument('--kategori', default="Semua")
+    args = parser.parse_args(argv)
+    export_format(args.tujuan)
+
+    engine = LedgerEngine(args.dir, background=False, read_only=True)
+    try:
+        total, chunks = engine.export_source((args.jenis, args.kategori, args.dari, args.sampai))
+        jumlah = export_transactions(chunks, args.tujuan, total)
+    finally:
+        engine.close()
+    print(f"{jumlah} transaksi diekspor ke {args.tujuan}")
+
+
+if __name__ == '__main__':
+    main()
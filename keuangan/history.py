@@ -0,0 +1,250 @@
+# Riwayat perintah untuk undo/redo bertingkat. Setiap perintah (tambah, edit, hapus, impor) disimpan
+# sebagai daftar perubahan (sebelum, sesudah) per transaksi, sehingga bisa dibalik maupun diulang
+# tanpa mencari transaksinya satu per satu. Riwayat ditulis ke file jurnal kecil di samping buku kas
+# agar undo/redo tetap tersedia setelah aplikasi dibuka lagi. Penulisan file bisa diserahkan ke
+# PersistenceWorker (lihat LedgerEngine), sehingga thread GUI tidak menunggu disk.
+#
+# Setiap baris file adalah list JSON:
+#   ["p", [[sebelum, sesudah], ...]]          potongan perubahan dari perintah yang ditulis berikutnya
+#   ["c", label, [[sebelum, sesudah], ...]]   perintah baru (redo dikosongkan)
+#   ["u"] / ["r"]                             undo / redo perintah teratas
+#   ["xu"] / ["xr"]                           perintah teratas dibuang karena sudah tidak berlaku
+#   ["s", [perintah undo...], [perintah redo...]]   isi lengkap setelah pemadatan
+#   ["su", label, [...]] / ["sr", label, [...]]     satu perintah undo / redo dari isi pemadatan
+# Perintah besar (impor) ditulis per HISTORY_CHUNK_RECORDS perubahan: baris "p" lalu satu baris
+# penutup ("c", "su" atau "sr"). Potongan tanpa penutup (file terpotong) diabaikan saat dibaca.
+# Transaksi ditulis sebagai [id, jenis, kategori, nominal, tanggal], null jika tidak ada
+import json
+import os
+from collections import deque
+
+from .transaksi import Transaksi
+
+HISTORY_FILE = 'database.history.jsonl'
+HISTORY_MAX_RECORDS = 10000  # Batas jumlah perubahan transaksi yang disimpan di riwayat
+HISTORY_COMPACT_BYTES = 1024 * 1024  # File riwayat dipadatkan jika lebih besar dari ini
+HISTORY_CHUNK_RECORDS = 5000  # Jumlah perubahan per baris file
+
+
+def _encode(t):
+    return None if t is None else [t.id, t.jenis, t.kategori, t.nominal, t.tanggal]
+
+
+def _decode(row):
+    return None if row is None else Transaksi(*row)
+
+
+def _encode_changes(changes):
+    return [[_encode(before), _encode(after)] for before, after in changes]
+
+
+def _decode_changes(rows):
+    return [(_decode(before), _decode(after)) for before, after in rows]
+
+
+def _encode_command(command):
+    label, changes = command
+    return [label, _encode_changes(changes)]
+
+
+def _decode_command(row):
+    label, changes = row
+    return label, tuple(_decode_changes(changes))
+
+
+# Stack undo dan redo beserta jurnalnya. Perintah berupa tuple (label, perubahan) dengan perubahan
+# berupa tuple (sebelum, sesudah): (None, t) untuk tambah, (t, None) untuk hapus, (lama, baru)
+# untuk edit. Jumlah perubahan di kedua stack dibatasi max_records dengan membuang perintah
+# tertua; perintah terbaru selalu disimpan walaupun lebih besar dari batas (misalnya impor besar).
+# Setiap perubahan stack dicatat sebagai event ('c', perintah), ('u',), ('r',), ('xu',) atau
+# ('xr',) ke self.file, lewat self.writer (PersistenceWorker) jika ada
+class CommandLog:
+    def __init__(self, path=None, max_records=HISTORY_MAX_RECORDS, compact_bytes=HISTORY_COMPACT_BYTES):
+        self.max_records = max_records
+        self.undo_stack = deque()  # Perintah terbaru di kanan
+        self.redo_stack = []       # Perintah yang di-redo berikutnya di akhir list
+        self.records = 0           # Jumlah perubahan di kedua stack
+        self.file = None if path is None else HistoryFile(path, max_records, compact_bytes)
+        self.writer = None         # PersistenceWorker untuk self.file; None berarti ditulis langsung
+
+    @property
+    def path(self):
+        return None if self.file is None else self.file.path
+
+    def _push_undo(self, command):
+        self.undo_stack.append(command)
+        self.records += len(command[1])
+        while self.records > self.max_records and len(self.undo_stack) > 1:
+            self.records -= len(self.undo_stack.popleft()[1])
+
+    def _clear_redo(self):
+        for command in self.redo_stack:
+            self.records -= len(command[1])
+        self.redo_stack.clear()
+
+    # Menerapkan satu event ke stack, tanpa mencatatnya
+    def apply(self, event):
+        kind = event[0]
+        if kind == 'c':
+            self._clear_redo()
+            self._push_undo(event[1])
+        elif kind == 'u' and self.undo_stack:
+            self.redo_stack.append(self.undo_stack.pop())
+        elif kind == 'r' and self.redo_stack:
+            self.undo_stack.append(self.redo_stack.pop())
+        elif kind == 'xu' and self.undo_stack:
+            self.records -= len(self.undo_stack.pop()[1])
+        elif kind == 'xr' and self.redo_stack:
+            self.records -= len(self.redo_stack.pop()[1])
+        elif kind == 's':
+            self.undo_stack = deque(event[1])
+            self.redo_stack = list(event[2])
+            self.records = sum(len(command[1]) for command in (*self.undo_stack, *self.redo_stack))
+
+    def _do(self, event):
+        self.apply(event)
+        if self.writer is not None:
+            self.writer.submit(event)
+        elif self.file is not None:
+            self.file.write_batch([event])
+
+    # Perintah baru membatalkan semua redo
+    def record(self, label, changes):
+        self._do(('c', (label, tuple(changes))))
+
+    def peek_undo(self):
+        return self.undo_stack[-1] if self.undo_stack else None
+
+    def peek_redo(self):
+        return self.redo_stack[-1] if self.redo_stack else None
+
+    # Perintah teratas dipindah dari undo ke redo (dipanggil setelah perintahnya dibalik)
+    def undo(self):
+        self._do(('u',))
+
+    def redo(self):
+        self._do(('r',))
+
+    # Perintah teratas tidak bisa diterapkan lagi (data sudah berubah di luar riwayat), dibuang
+    def drop_undo(self):
+        self._do(('xu',))
+
+    def drop_redo(self):
+        self._do(('xr',))
+
+    # Id terbesar yang disebut riwayat, agar id transaksi yang masih bisa di-redo tidak dipakai ulang
+    def max_id(self):
+        ids = [t.id for _, changes in (*self.undo_stack, *self.redo_stack)
+               for change in changes for t in change if t is not None]
+        return max(ids, default=0)
+
+    # Membaca ulang riwayat dari file (sebelum writer dijalankan)
+    def load(self):
+        if self.file is None:
+            return
+        isi = self.file.load()
+        self.apply(('s', isi.undo_stack, isi.redo_stack))
+
+
+# File riwayat. Dipakai dari satu thread saja (thread PersistenceWorker, atau pemanggil langsung):
+# write_batch(events) menambahkan baris-baris event dan memadatkan file jika sudah terlalu besar.
+# Isi stack sesuai file disimpan sendiri di self.state, sehingga pemadatan tidak perlu membaca
+# stack milik thread GUI. Antarmukanya sama dengan backend penyimpanan, jadi bisa ditulis oleh
+# PersistenceWorker
+class HistoryFile:
+    def __init__(self, path, max_records=HISTORY_MAX_RECORDS, compact_bytes=HISTORY_COMPACT_BYTES,
+                 chunk_records=HISTORY_CHUNK_RECORDS):
+        self.path = path
+        self.compact_bytes = compact_bytes
+        self.chunk_records = chunk_records
+        self.state = CommandLog(None, max_records)
+        self._compact_at = compact_bytes
+
+    # Isi stack dari file. Baris terakhir yang terpotong dibuang dari file agar baris berikutnya
+    # tidak tersambung dengannya; baris rusak lainnya dilewati beserta potongan perintah sebelumnya
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return self.state
+        utuh = data.rfind(b'\n') + 1
+        if utuh < len(data):
+            os.truncate(self.path, utuh)
+        potongan = []  # Perubahan dari baris "p" yang menunggu baris penutupnya
+        for line in data[:utuh].splitlines():
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                potongan = []
+                continue
+            kind = event[0]
+            if kind == 'p':
+                potongan.extend(_decode_changes(event[1]))
+                continue
+            if kind in ('c', 'su', 'sr'):
+                label, changes = _decode_command(event[1:])
+                command = (label, tuple(potongan) + changes)
+                if kind == 'c':
+                    self.state.apply(('c', command))
+                elif kind == 'su':
+                    self.state.undo_stack.append(command)
+                    self.state.records += len(command[1])
+                else:
+                    self.state.redo_stack.append(command)
+                    self.state.records += len(command[1])
+            elif kind == 's':
+                self.state.apply(('s', [_decode_command(row) for row in event[1]],
+                                  [_decode_command(row) for row in event[2]]))
+            else:
+                self.state.apply((kind,))
+            potongan = []
+        return self.state
+
+    # Perintah sebagai baris-baris file: potongan "p" lalu baris penutup `kind`
+    def _command_lines(self, kind, command):
+        label, changes = command
+        step = self.chunk_records
+        akhir = (len(changes) - 1) // step * step if changes else 0  # Awal potongan terakhir
+        lines = [json.dumps(['p', _encode_changes(changes[start:start + step])], separators=(',', ':'))
+                 for start in range(0, akhir, step)]
+        lines.append(json.dumps([kind, label, _encode_changes(changes[akhir:])], separators=(',', ':')))
+        return lines
+
+    # Menambahkan event ke file. Jika penulisan gagal di tengah, file dipotong kembali ke ukuran
+    # semula agar batch yang sama bisa ditulis ulang utuh oleh PersistenceWorker
+    def write_batch(self, ops, records=None):
+        lines = []
+        for event in ops:
+            if event[0] == 'c':
+                lines.extend(self._command_lines('c', event[1]))
+            else:
+                lines.append(json.dumps([event[0]]))
+        offset = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        try:
+            with open(self.path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+                size = f.tell()
+        except OSError:
+            if os.path.exists(self.path):
+                os.truncate(self.path, offset)
+            raise
+        for event in ops:
+            self.state.apply(event)
+        if size >= self._compact_at:
+            self.compact()
+
+    # Menulis ulang file riwayat hanya berisi isi stack saat ini. Jika isinya sendiri sudah besar
+    # (impor besar), pemadatan berikutnya baru dilakukan setelah file dua kali lebih besar
+    def compact(self):
+        lines = [json.dumps(['s', [], []])]
+        for command in self.state.undo_stack:
+            lines.extend(self._command_lines('su', command))
+        for command in self.state.redo_stack:
+            lines.extend(self._command_lines('sr', command))
+        tmp_file = self.path + '.tmp'
+        with open(tmp_file, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+            size = f.tell()
+        os.replace(tmp_file, self.path)
+        self._compact_at = max(self.compact_bytes, 2 * size)
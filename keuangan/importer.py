@@ -0,0 +1,283 @@
+# Impor massal dari CSV (ekspor mutasi rekening, spreadsheet) atau JSON Lines. Baris dibaca dan
+# divalidasi per batch; hasilnya diserahkan ke LedgerEngine.add_many() agar seluruh impor
+# ditulis sekali, index diperbarui sekali dan tabel cukup disegarkan sekali
+import csv
+import json
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from .transaksi import PEMASUKAN_CATEGORIES, PENGELUARAN_CATEGORIES
+
+IMPORT_BATCH_SIZE = 5000
+
+# Nama kolom yang dikenali (huruf kecil, tanpa spasi di tepi) untuk setiap field
+COLUMN_ALIASES = {
+    'tanggal': ['tanggal', 'tgl', 'date', 'tanggal transaksi', 'transaction date', 'tgl transaksi'],
+    'jenis': ['jenis', 'type', 'tipe'],
+    'kategori': ['kategori', 'category'],
+    'keterangan': ['keterangan', 'deskripsi', 'description', 'uraian', 'memo', 'catatan'],
+    'nominal': ['nominal', 'jumlah', 'amount', 'mutasi'],
+    'debit': ['debit', 'keluar', 'pengeluaran'],
+    'kredit': ['kredit', 'credit', 'masuk', 'pemasukan'],
+}
+
+# Format tanggal yang umum di ekspor bank dan spreadsheet
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%Y/%m/%d", "%d.%m.%Y"]
+
+# Nilai kolom jenis (atau penanda DB/CR di belakang nominal) beserta jenis transaksinya
+JENIS_ALIASES = {
+    'pemasukan': 'pemasukan', 'masuk': 'pemasukan', 'kredit': 'pemasukan', 'credit': 'pemasukan',
+    'cr': 'pemasukan', 'k': 'pemasukan', 'in': 'pemasukan', 'income': 'pemasukan',
+    'pengeluaran': 'pengeluaran', 'keluar': 'pengeluaran', 'debit': 'pengeluaran', 'db': 'pengeluaran',
+    'd': 'pengeluaran', 'out': 'pengeluaran', 'expense': 'pengeluaran',
+}
+
+# Kata kunci keterangan untuk memetakan baris tanpa kategori ke kategori standar. Dicek berurutan,
+# jadi kata kunci yang lebih spesifik (gofood) ditulis sebelum yang umum (gojek). Kata kunci
+# dicocokkan sebagai kata utuh ('kos' tidak cocok dengan "kosmetik"), jadi bentuk turunan yang
+# umum (makanan, reksadana) ditulis sendiri
+CATEGORY_KEYWORDS = {
+    'pengeluaran': [
+        (('gofood', 'grabfood', 'shopeefood', 'makan', 'makanan', 'minum', 'minuman', 'resto', 'restoran',
+          'warung', 'kopi', 'cafe', 'food'), "Makan & Minum"),
+        (('kos', 'sewa', 'kontrakan'), "Kos / Sewa Tempat Tinggal"),
+        (('gojek', 'grab', 'ojek', 'bensin', 'krl', 'transjakarta', 'parkir', 'tol', 'kereta'), "Transportasi"),
+        (('pulsa', 'kuota', 'internet', 'indihome', 'telkomsel', 'wifi'), "Kuota / Internet"),
+        (('buku', 'fotokopi', 'atk', 'alat tulis', 'print'), "Alat Kuliah"),
+        (('ukt', 'spp', 'kuliah', 'semester'), "Uang Kuliah / SPP"),
+        (('netflix', 'spotify', 'bioskop', 'game', 'nonton'), "Hiburan"),
+        (('shopee', 'tokopedia', 'lazada', 'belanja'), "Belanja Pribadi"),
+        (('cicilan', 'hutang', 'utang', 'paylater', 'angsuran'), "Cicilan / Hutang"),
+        (('tabungan', 'investasi', 'reksa', 'reksadana', 'saham'), "Tabungan / Investasi"),
+    ],
+    'pemasukan': [
+        (('beasiswa',), "Beasiswa"),
+        (('freelance', 'honor', 'fee', 'proyek'), "Freelance"),
+        (('jual', 'penjualan', 'order'), "Jualan"),
+        (('bonus', 'thr', 'hadiah'), "Bonus"),
+        (('dividen', 'bunga', 'investasi', 'reksa', 'reksadana'), "Investasi"),
+        (('bulanan', 'kiriman', 'ortu', 'orang tua'), "Uang bulanan"),
+    ],
+}
+
+_STANDARD_CATEGORIES = {
+    'pemasukan': {k.lower(): k for k in PEMASUKAN_CATEGORIES},
+    'pengeluaran': {k.lower(): k for k in PENGELUARAN_CATEGORIES},
+}
+_CATEGORY_PATTERNS = {
+    jenis: [(re.compile(r'\b(?:' + '|'.join(map(re.escape, keywords)) + r')\b'), nama) for keywords, nama in rules]
+    for jenis, rules in CATEGORY_KEYWORDS.items()
+}
+_GROUPED = {sep: re.compile(r'^\d{1,3}(?:' + re.escape(sep) + r'\d{3})+$') for sep in '.,'}
+_JENIS_SUFFIX = re.compile(r'\s*\b(DB|CR|D|K)$', re.IGNORECASE)
+
+
+# Baris yang tidak bisa diimpor, dilaporkan bersama nomor barisnya di file
+class ImportRowError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f"Baris {line}: {message}")
+        self.line = line
+        self.message = message
+
+
+# Angka tanpa tanda menjadi (bagian bulat, pecahan) sesuai pemisahnya. Jika titik dan koma sama-sama
+# ada, yang terakhir adalah pemisah desimal. Jika hanya satu jenis pemisah, satu pemisah dengan
+# 1-2 angka di belakangnya adalah desimal ("12,50", "150000.00") dan kelompok tiga angka adalah
+# ribuan ("1.500.000", "1,500"). Susunan lain ("1.500.00", "150000.000") ditolak dengan ValueError
+# karena tidak jelas maksudnya
+def _split_decimal(teks):
+    if teks.isdigit():
+        return teks, ''
+    titik, koma = teks.rfind('.'), teks.rfind(',')
+    if titik >= 0 and koma >= 0:
+        desimal = '.' if titik > koma else ','
+        ribuan = ',' if desimal == '.' else '.'
+        bulat, _, pecahan = teks.rpartition(desimal)
+        if 1 <= len(pecahan) <= 2 and pecahan.isdigit() and _GROUPED[ribuan].match(bulat):
+            return bulat.replace(ribuan, ''), pecahan
+    elif titik >= 0 or koma >= 0:
+        pemisah = '.' if titik >= 0 else ','
+        bulat, _, pecahan = teks.rpartition(pemisah)
+        if pemisah not in bulat and bulat.isdigit() and 1 <= len(pecahan) <= 2 and pecahan.isdigit():
+            return bulat, pecahan
+        if _GROUPED[pemisah].match(teks):
+            return teks.replace(pemisah, ''), ''
+    if not teks or not all(c.isdigit() or c in '.,' for c in teks):
+        return None, ''
+    raise ValueError(f"pemisah ribuan/desimal tidak jelas: {teks!r}")
+
+
+# Nominal dari ekspor bank menjadi (nilai bertanda, jenis dari penanda DB/CR atau None).
+# Menerima "Rp 1.500.000", "1.500.000,00", "1,500,000.00", "150000.00", "-25.000", "(25.000)"
+# dan "25.000 DB". Nilai None jika bukan angka atau berpecahan selain ,00 (nominal disimpan
+# sebagai bilangan bulat); ValueError jika pemisah ribuan/desimalnya tidak jelas
+def parse_amount(teks):
+    teks = (teks or '').strip()
+    jenis = None
+    suffix = _JENIS_SUFFIX.search(teks)
+    if suffix:
+        jenis = JENIS_ALIASES[suffix.group(1).lower()]
+        teks = teks[:suffix.start()]
+    teks = re.sub(r'(?i)\b(rp|idr)\.?', '', teks).replace(' ', '')
+    negatif = teks.startswith('-') or (teks.startswith('(') and teks.endswith(')'))
+    bulat, pecahan = _split_decimal(teks.strip('-()+'))
+    if bulat is None or (pecahan and int(pecahan)):
+        return None, jenis
+    nominal = int(bulat)
+    return (-nominal if negatif else nominal), jenis
+
+
+# Tanggal dalam salah satu DATE_FORMATS menjadi 'YYYY-MM-DD', None jika tidak dikenali.
+# Di-cache karena satu file berisi banyak baris dengan tanggal yang sama
+@lru_cache(maxsize=4096)
+def parse_date(teks):
+    teks = (teks or '').strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(teks, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+# Kategori dari kolom kategori (disamakan dengan penulisan kategori standar jika cocok),
+# atau dari kata kunci keterangan, atau "Lainnya"
+def map_category(jenis, kategori, keterangan=''):
+    kategori = (kategori or '').strip()
+    if kategori:
+        return _STANDARD_CATEGORIES[jenis].get(kategori.lower(), kategori)
+    keterangan = (keterangan or '').lower()
+    for pattern, nama in _CATEGORY_PATTERNS[jenis]:
+        if pattern.search(keterangan):
+            return nama
+    return "Lainnya"
+
+
+# Mencari nama kolom asli untuk setiap field berdasarkan COLUMN_ALIASES
+def map_columns(fieldnames):
+    kolom = {}
+    for nama in fieldnames or []:
+        kunci = (nama or '').strip().lower()
+        for field, aliases in COLUMN_ALIASES.items():
+            if kunci in aliases and field not in kolom:
+                kolom[field] = nama
+    if 'tanggal' not in kolom:
+        raise ValueError("Kolom tanggal tidak ditemukan")
+    if 'nominal' not in kolom and 'debit' not in kolom and 'kredit' not in kolom:
+        raise ValueError("Kolom nominal (atau debit/kredit) tidak ditemukan")
+    return kolom
+
+
+# Satu baris mentah (dict kolom -> teks) menjadi (jenis, kategori, nominal, tanggal).
+# ImportRowError jika baris tidak valid
+def normalize_row(line, row, kolom):
+    def ambil(field):
+        nama = kolom.get(field)
+        nilai = row.get(nama) if nama is not None else None
+        return '' if nilai is None else str(nilai).strip()
+
+    def amount(field):
+        try:
+            return parse_amount(ambil(field))
+        except ValueError as e:
+            raise ImportRowError(line, f"nominal tidak valid, {e}")
+
+    tanggal = parse_date(ambil('tanggal'))
+    if tanggal is None:
+        raise ImportRowError(line, f"tanggal tidak dikenali: {ambil('tanggal')!r}")
+
+    jenis = JENIS_ALIASES.get(ambil('jenis').lower()) if ambil('jenis') else None
+    if ambil('jenis') and jenis is None:
+        raise ImportRowError(line, f"jenis tidak dikenali: {ambil('jenis')!r}")
+    nominal = None
+    if ambil('debit') or ambil('kredit'):
+        # Ekspor dengan kolom debit dan kredit terpisah: yang bukan nol menentukan jenisnya
+        debit, _ = amount('debit')
+        kredit, _ = amount('kredit')
+        if debit:
+            nominal, jenis = debit, jenis or 'pengeluaran'
+        elif kredit:
+            nominal, jenis = kredit, jenis or 'pemasukan'
+    if nominal is None and ambil('nominal'):
+        nominal, penanda = amount('nominal')
+        if jenis is None and nominal is not None:
+            jenis = penanda or ('pengeluaran' if nominal < 0 else 'pemasukan')
+    if not nominal:
+        teks = ambil('nominal') or ambil('debit') or ambil('kredit')
+        raise ImportRowError(line, f"nominal tidak valid: {teks!r}")
+    kategori = map_category(jenis, ambil('kategori'), ambil('keterangan'))
+    return jenis, kategori, abs(nominal), tanggal
+
+
+# Baris mentah dari file: CSV (pemisah koma, titik koma atau tab ditebak dari isi file) atau
+# JSON Lines (.jsonl/.ndjson). Menghasilkan (nomor baris, dict) beserta pemetaan kolom, dan
+# melaporkan progress(byte terbaca, ukuran file)
+def _iter_raw_rows(f, path, progress):
+    ukuran = os.path.getsize(path)
+    if path.lower().endswith(('.jsonl', '.ndjson')):
+        kolom = None
+        for line, teks in enumerate(f, start=1):
+            if not teks.strip():
+                continue
+            try:
+                row = json.loads(teks)
+            except json.JSONDecodeError as e:
+                yield line, ImportRowError(line, f"JSON tidak valid: {e.msg}"), kolom
+                continue
+            if not isinstance(row, dict):
+                yield line, ImportRowError(line, "baris JSON harus berupa objek"), kolom
+                continue
+            if kolom is None:
+                kolom = map_columns(list(row))
+            yield line, row, kolom
+            if progress is not None and line % IMPORT_BATCH_SIZE == 0:
+                progress(f.buffer.tell(), ukuran)
+        return
+    contoh = f.read(4096)
+    f.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(contoh, delimiters=',;\t|')
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(f, dialect=dialect)
+    kolom = map_columns(reader.fieldnames)
+    for row in reader:
+        if not any((nilai or '').strip() for nilai in row.values() if isinstance(nilai, str)):
+            continue
+        yield reader.line_num, row, kolom
+        if progress is not None and reader.line_num % IMPORT_BATCH_SIZE == 0:
+            progress(f.buffer.tell(), ukuran)
+
+
+# Membaca dan memvalidasi file impor per batch. Setiap batch berupa (rows, errors): rows berisi
+# (jenis, kategori, nominal, tanggal) yang valid, errors berisi ImportRowError untuk baris yang
+# dilewati. ValueError jika susunan kolom file tidak dikenali
+def iter_import_batches(path, batch_size=IMPORT_BATCH_SIZE, progress=None, encoding='utf-8-sig'):
+    rows, errors = [], []
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        for line, row, kolom in _iter_raw_rows(f, path, progress):
+            if isinstance(row, ImportRowError):
+                errors.append(row)
+                continue
+            try:
+                rows.append(normalize_row(line, row, kolom))
+            except ImportRowError as e:
+                errors.append(e)
+            if len(rows) + len(errors) >= batch_size:
+                yield rows, errors
+                rows, errors = [], []
+    if progress is not None:
+        progress(os.path.getsize(path), os.path.getsize(path))
+    if rows or errors:
+        yield rows, errors
+
+
+# Seluruh file sekaligus: (rows, errors)
+def read_import(path, progress=None):
+    rows, errors = [], []
+    for batch_rows, batch_errors in iter_import_batches(path, progress=progress):
+        rows.extend(batch_rows)
+        errors.extend(batch_errors)
+    return rows, errors
@@ -0,0 +1,184 @@
+# Struktur data di memori yang diperbarui setiap ada perubahan: index tanggal,
+# total berjalan dan total pengeluaran harian
+import bisect
+
+from .records import match_filters
+
+
+# Index transaksi terurut berdasarkan tanggal, ditambah posting list per jenis dan per kategori.
+# Setiap entri berkunci (tanggal, id) sehingga rentang tanggal cukup dicari dengan bisect.
+class DateIndex:
+    _MAX_ID = float('inf')
+
+    def __init__(self, data=()):
+        self._rows = {}      # kunci -> transaksi
+        self._keys = []      # semua kunci, terurut
+        self._by_jenis = {}  # jenis -> kunci terurut
+        self._by_kategori = {}  # kategori (huruf kecil) -> kunci terurut
+        # Bangun index sekaligus lalu urutkan sekali, lebih cepat daripada insort satu per satu
+        for t in data:
+            key = self._register(t)
+            self._keys.append(key)
+            self._by_jenis.setdefault(t.jenis, []).append(key)
+            self._by_kategori.setdefault(t.kategori.lower(), []).append(key)
+        for keys in [self._keys, *self._by_jenis.values(), *self._by_kategori.values()]:
+            keys.sort()
+
+    def _register(self, t):
+        key = (t.tanggal, t.id)
+        self._rows[key] = t
+        return key
+
+    def add(self, t):
+        key = self._register(t)
+        bisect.insort(self._keys, key)
+        bisect.insort(self._by_jenis.setdefault(t.jenis, []), key)
+        bisect.insort(self._by_kategori.setdefault(t.kategori.lower(), []), key)
+
+    # Banyak transaksi sekaligus (impor): kunci baru ditambahkan lalu list diurutkan sekali,
+    # bukan insort satu per satu
+    def add_many(self, data):
+        touched = {id(self._keys): self._keys}
+        for t in data:
+            key = self._register(t)
+            self._keys.append(key)
+            for keys in (self._by_jenis.setdefault(t.jenis, []), self._by_kategori.setdefault(t.kategori.lower(), [])):
+                keys.append(key)
+                touched[id(keys)] = keys
+        for keys in touched.values():
+            keys.sort()
+
+    def remove(self, t):
+        key = (t.tanggal, t.id)
+        del self._rows[key]
+        for keys in (self._keys, self._by_jenis[t.jenis], self._by_kategori[t.kategori.lower()]):
+            del keys[bisect.bisect_left(keys, key)]
+
+    # Banyak transaksi sekaligus (undo impor): setiap list yang terkena disaring sekali,
+    # bukan dihapus satu per satu
+    def remove_many(self, data):
+        removed = set()
+        touched = {id(self._keys): self._keys}
+        for t in data:
+            key = (t.tanggal, t.id)
+            del self._rows[key]
+            removed.add(key)
+            for keys in (self._by_jenis[t.jenis], self._by_kategori[t.kategori.lower()]):
+                touched[id(keys)] = keys
+        for keys in touched.values():
+            keys[:] = [key for key in keys if key not in removed]
+
+    # Posisi awal dan akhir (eksklusif) rentang tanggal di dalam list kunci terurut
+    def _window(self, keys, tanggal_mulai, tanggal_akhir):
+        lo = bisect.bisect_left(keys, (tanggal_mulai,))
+        hi = bisect.bisect_right(keys, (tanggal_akhir, self._MAX_ID), lo)
+        return keys, lo, hi
+
+    # Transaksi yang cocok dengan filter, terurut berdasarkan tanggal
+    def query(self, filters):
+        jenis, kategori, tanggal_mulai, tanggal_akhir = filters
+        candidates = [self._keys]
+        if jenis != "Semua":
+            candidates.append(self._by_jenis.get(jenis, []))
+        if kategori != "Semua":
+            candidates.append(self._by_kategori.get(kategori.lower(), []))
+        # Mulai dari jendela terkecil, lalu cocokkan syarat sisanya langsung pada transaksinya
+        keys, lo, hi = min((self._window(keys, tanggal_mulai, tanggal_akhir) for keys in candidates),
+                           key=lambda window: window[2] - window[1])
+        if len(candidates) == 1:
+            return [self._rows[key] for key in keys[lo:hi]]
+        return [t for t in (self._rows[key] for key in keys[lo:hi]) if match_filters(t, filters)]
+
+
+# Total berjalan (saldo, per kategori, per bulan) yang diperbarui O(1) pada setiap
+# tambah, edit, hapus dan undo, sehingga tidak perlu menjumlah ulang seluruh riwayat
+class RunningTotals:
+    def __init__(self, data=()):
+        self.pemasukan = 0
+        self.pengeluaran = 0
+        self.per_kategori = {}  # (jenis, kategori) -> total
+        self.per_bulan = {}     # (bulan 'YYYY-MM', jenis) -> total
+        for t in data:
+            self.add(t)
+
+    @property
+    def saldo(self):
+        return self.pemasukan - self.pengeluaran
+
+    def add(self, t):
+        self._apply(t, t.nominal)
+
+    def remove(self, t):
+        self._apply(t, -t.nominal)
+
+    def _apply(self, t, nominal):
+        jenis = t.jenis
+        if jenis == 'pemasukan':
+            self.pemasukan += nominal
+        elif jenis == 'pengeluaran':
+            self.pengeluaran += nominal
+        else:
+            return
+        self._bump(self.per_kategori, (jenis, t.kategori), nominal)
+        self._bump(self.per_bulan, (t.tanggal[:7], jenis), nominal)
+
+    # Nominal selalu positif, jadi total nol berarti tidak ada transaksi tersisa di kunci itu
+    def _bump(self, totals, key, nominal):
+        total = totals.get(key, 0) + nominal
+        if total:
+            totals[key] = total
+        else:
+            totals.pop(key, None)
+
+    # Total per kategori, terpisah untuk pemasukan dan pengeluaran
+    def category_totals(self):
+        per_jenis = {'pemasukan': {}, 'pengeluaran': {}}
+        for (jenis, kategori), total in self.per_kategori.items():
+            per_jenis[jenis][kategori] = total
+        return per_jenis['pemasukan'], per_jenis['pengeluaran']
+
+    # Total pemasukan dan pengeluaran pada satu bulan ('YYYY-MM')
+    def month_totals(self, bulan):
+        return self.per_bulan.get((bulan, 'pemasukan'), 0), self.per_bulan.get((bulan, 'pengeluaran'), 0)
+
+
+# Total pengeluaran per hari (dan per hari/bulan per kategori), diperbarui setiap ada perubahan.
+# Dipakai aturan peringatan agar tidak perlu memindai seluruh transaksi untuk tiap hari.
+class DailyExpenseBuckets:
+    def __init__(self, data=()):
+        self.per_hari = {}            # tanggal -> total
+        self.per_hari_kategori = {}   # (tanggal, kategori) -> total
+        self.per_bulan = {}           # bulan 'YYYY-MM' -> total
+        self.per_bulan_kategori = {}  # (bulan, kategori) -> total
+        for t in data:
+            self.add(t)
+
+    def add(self, t):
+        self._apply(t, t.nominal)
+
+    def remove(self, t):
+        self._apply(t, -t.nominal)
+
+    def _apply(self, t, nominal):
+        if t.jenis != 'pengeluaran':
+            return
+        tanggal, bulan, kategori = t.tanggal, t.tanggal[:7], t.kategori
+        for totals, key in ((self.per_hari, tanggal), (self.per_hari_kategori, (tanggal, kategori)),
+                            (self.per_bulan, bulan), (self.per_bulan_kategori, (bulan, kategori))):
+            total = totals.get(key, 0) + nominal
+            if total:
+                totals[key] = total
+            else:
+                totals.pop(key, None)
+
+    # Total pengeluaran satu hari (objek date), opsional hanya untuk satu kategori
+    def day_total(self, hari, kategori=None):
+        tanggal = hari.isoformat()
+        if kategori is None:
+            return self.per_hari.get(tanggal, 0)
+        return self.per_hari_kategori.get((tanggal, kategori), 0)
+
+    def month_total(self, bulan, kategori=None):
+        if kategori is None:
+            return self.per_bulan.get(bulan, 0)
+        return self.per_bulan_kategori.get((bulan, kategori), 0)
@@ -0,0 +1,236 @@
+# Buku kas yang dipecah per bulan (atau per tahun) menjadi file-file JSON kecil di folder
+# database.parts, ditambah manifest berisi jumlah transaksi dan rentang tanggal setiap partisi.
+# Penulisan hanya menulis ulang partisi yang berubah, dan filter rentang tanggal hanya membuka
+# partisi yang rentangnya bersinggungan. Partisi yang sudah dibaca disimpan di cache LRU
+# yang dibatasi jumlah transaksinya.
+#
+# Aktifkan lewat config.json: {"storage_mode": "partitioned", "partition_by": "month"}
+# ("year" untuk satu file per tahun). Isi database.json dipindahkan sekali saat pertama dimuat
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from .records import group_by_category, index_by_id, match_filters
+from .storage import DB_FILE, LOAD_BATCH_SIZE, Storage, load_data
+from .transaksi import Transaksi, json_default
+
+PARTITION_DIR = 'database.parts'
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+PARTITION_BY = 'month'
+PARTITION_KEY_LENGTH = {'year': 4, 'month': 7}  # Panjang awalan tanggal yang menjadi nama partisi
+PARTITION_CACHE_RECORDS = 200000  # Batas jumlah transaksi di cache partisi
+
+
+# json.dumps sekaligus memakai encoder C, jauh lebih cepat daripada json.dump ke file
+def _write_json(path, isi):
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'w') as f:
+        f.write(json.dumps(isi, default=json_default, separators=(',', ':')))
+    os.replace(tmp_file, path)
+
+
+class PartitionedStorage(Storage):
+    def __init__(self, directory=PARTITION_DIR, db_file=DB_FILE, partition_by=PARTITION_BY,
+                 cache_records=PARTITION_CACHE_RECORDS):
+        if partition_by not in PARTITION_KEY_LENGTH:
+            raise ValueError(f"partition_by harus salah satu dari {', '.join(PARTITION_KEY_LENGTH)}")
+        self.directory = directory
+        self.db_file = db_file
+        self.manifest_file = os.path.join(directory, MANIFEST_FILE)
+        self.cache_records = cache_records
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()  # nama partisi -> dict id -> transaksi, terakhir dipakai di akhir
+        self._cached = 0             # Jumlah transaksi di cache
+        self.locations = {}          # id -> nama partisi, diisi setiap partisi dibaca
+        self._scanned = set()        # Partisi yang isinya sudah tercatat di locations
+        self.manifest = self._load_manifest()
+        # Pembagian partisi yang sudah ada di manifest tidak berubah walaupun konfigurasinya diganti
+        if self.manifest is not None:
+            partition_by = self.manifest['partition_by']
+        self.partition_by = partition_by
+        self.key_length = PARTITION_KEY_LENGTH[partition_by]
+
+    # Query sebelum seluruh data dimuat bisa dijawab dari partisi, setelah migrasi selesai
+    @property
+    def lazy(self):
+        return self.manifest is not None
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_file, 'r') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def _save_manifest(self):
+        _write_json(self.manifest_file, self.manifest)
+
+    def partition_key(self, tanggal):
+        return tanggal[:self.key_length]
+
+    def _partition_file(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    # Migrasi satu kali: isi database.json dibagi ke partisi-partisinya
+    def _migrate_once(self):
+        if self.manifest is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        data, _ = index_by_id(load_data(self.db_file))
+        partitions = {}
+        for t in data.values():
+            partitions.setdefault(self.partition_key(t.tanggal), {})[t.id] = t
+        self.manifest = {'version': MANIFEST_VERSION, 'partition_by': self.partition_by, 'partitions': {}}
+        for key, partition in partitions.items():
+            self._write_partition(key, partition)
+        self._save_manifest()
+
+    # Isi satu partisi dari cache atau file. Partisi yang dibaca masuk cache; partisi lama
+    # dibuang dari cache jika jumlah transaksinya melewati batas (kecuali yang baru dibaca)
+    def _partition(self, key):
+        partition = self._cache.get(key)
+        if partition is not None:
+            self._cache.move_to_end(key)
+            return partition
+        partition = self._read_partition(key)
+        self._cache[key] = partition
+        self._cached += len(partition)
+        while self._cached > self.cache_records and len(self._cache) > 1:
+            _, lama = self._cache.popitem(last=False)
+            self._cached -= len(lama)
+        return partition
+
+    def _read_partition(self, key):
+        if key not in self.manifest['partitions']:
+            return {}
+        partition = {}
+        for t in load_data(self._partition_file(key)):
+            t = Transaksi.from_dict(t)
+            partition[t.id] = t
+            self.locations[t.id] = key
+        self._scanned.add(key)
+        return partition
+
+    # Menulis satu partisi dan memperbarui entrinya di manifest (manifest ditulis pemanggil)
+    def _write_partition(self, key, partition):
+        path = self._partition_file(key)
+        if not partition:
+            if os.path.exists(path):
+                os.remove(path)
+            self.manifest['partitions'].pop(key, None)
+            return
+        _write_json(path, list(partition.values()))
+        tanggal = [t.tanggal for t in partition.values()]
+        self.manifest['partitions'][key] = {'count': len(partition), 'min': min(tanggal), 'max': max(tanggal)}
+
+    # Partisi yang rentang tanggalnya bersinggungan dengan [tanggal_mulai, tanggal_akhir], urut
+    def overlapping(self, tanggal_mulai, tanggal_akhir):
+        return sorted(key for key, info in self.manifest['partitions'].items()
+                      if info['min'] <= tanggal_akhir and info['max'] >= tanggal_mulai)
+
+    def load(self):
+        return [t for batch in self.load_batches() for t in batch]
+
+    # Satu partisi per langkah (dipecah per batch_size), progress dalam jumlah transaksi. Partisi
+    # yang dibaca di sini tidak masuk cache karena seluruh data akan dipegang engine
+    def load_batches(self, batch_size=LOAD_BATCH_SIZE, progress=None):
+        with self._lock:
+            self._migrate_once()
+            keys = sorted(self.manifest['partitions'])
+            total = sum(info['count'] for info in self.manifest['partitions'].values())
+        selesai = 0
+        for key in keys:
+            with self._lock:
+                partition = self._cache.get(key)
+                rows = list(partition.values()) if partition is not None else list(self._read_partition(key).values())
+            for start in range(0, len(rows), batch_size):
+                yield rows[start:start + batch_size]
+            selesai += len(rows)
+            if progress is not None:
+                progress(selesai, total)
+
+    # Halaman terbaru cukup dibaca dari partisi terakhir
+    def load_recent(self, limit):
+        with self._lock:
+            if self.manifest is None:
+                return None
+            rows = []
+            for key in sorted(self.manifest['partitions'], reverse=True):
+                rows.extend(self._partition(key).values())
+                if len(rows) >= limit:
+                    break
+        rows.sort(key=lambda t: (t.tanggal, t.id))
+        return rows[-limit:] if limit else []
+
+    # Perubahan dikelompokkan per partisi; hanya partisi yang tersentuh ditulis ulang
+    def write_batch(self, ops, records=None):
+        with self._lock:
+            self._migrate_once()
+            touched = {}  # Partisi yang diubah batch ini, tetap dipegang walaupun keluar dari cache
+            for op, value in ops:
+                transaksi_id = value if op == 'delete' else value['id']
+                if op != 'add':
+                    key = self._locate(transaksi_id)
+                    if key is not None:
+                        self._touch(touched, key).pop(transaksi_id, None)
+                        del self.locations[transaksi_id]
+                if op != 'delete':
+                    t = Transaksi.from_dict(value)
+                    key = self.partition_key(t.tanggal)
+                    self._touch(touched, key)[t.id] = t
+                    self.locations[t.id] = key
+            for key, partition in touched.items():
+                self._write_partition(key, partition)
+            self._save_manifest()
+            # Partisi yang tersentuh bisa sudah keluar dari cache di tengah batch
+            self._cached = sum(len(partition) for partition in self._cache.values())
+
+    # Partisi yang akan diubah batch. Partisi yang sudah diubah dipakai lagi dari `touched`, bukan
+    # dibaca ulang dari file, agar perubahan sebelumnya di batch yang sama tidak hilang jika
+    # partisinya sempat dibuang dari cache
+    def _touch(self, touched, key):
+        partition = touched.get(key)
+        if partition is None:
+            partition = touched[key] = self._partition(key)
+        return partition
+
+    # Partisi tempat transaksi berada. Id yang belum tercatat dicari di partisi yang belum
+    # pernah dibaca, mulai dari yang terbaru
+    def _locate(self, transaksi_id):
+        key = self.locations.get(transaksi_id)
+        if key is not None:
+            return key
+        for key in sorted(self.manifest['partitions'], reverse=True):
+            if key not in self._scanned and transaksi_id in self._partition(key):
+                return key
+        return None
+
+    def ledger_files(self):
+        return [self.manifest_file]
+
+    # Tanpa data di memori, hanya partisi yang bersinggungan dengan rentang tanggal yang dibuka
+    def query(self, data, filters):
+        if data is not None or self.manifest is None:
+            return super().query(data or {}, filters)
+        _, _, tanggal_mulai, tanggal_akhir = filters
+        with self._lock:
+            rows = [t for key in self.overlapping(tanggal_mulai, tanggal_akhir)
+                    for t in self._partition(key).values() if match_filters(t, filters)]
+        rows.sort(key=lambda t: (t.tanggal, t.id))
+        return rows
+
+    # Total per kategori tanpa data di memori, dari partisi dalam rentang filter (semua partisi
+    # jika filters None)
+    def category_totals(self, data, filters=None):
+        if data is not None or self.manifest is None:
+            return super().category_totals(data or {}, filters)
+        if filters is not None:
+            return group_by_category(self.query(None, filters))
+        with self._lock:
+            return group_by_category(t for key in sorted(self.manifest['partitions'])
+                                     for t in self._partition(key).values())
@@ -0,0 +1,150 @@
+# Penulisan perubahan ke backend penyimpanan di thread background
+import queue
+import threading
+import time
+
+from .timing import PROFILER
+
+# Perubahan ditulis ke disk di background. Penulisan ditunda sampai tidak ada perubahan baru
+# selama PERSIST_DEBOUNCE detik (paling lama PERSIST_MAX_DELAY detik), lalu digabung jadi satu
+PERSIST_DEBOUNCE = 0.3
+PERSIST_MAX_DELAY = 2.0
+
+
+# Thread penyimpanan di background. Perubahan yang datang beruntun dikumpulkan dan ditulis
+# sebagai satu batch, sehingga thread GUI tidak pernah menunggu disk. Hasil setiap penulisan
+# dilaporkan lewat callback on_saved(latensi_ms, jumlah_perubahan) atau on_failed(pesan).
+# after_write(state) (jika ada) dipanggil di thread ini setiap batch berhasil ditulis, untuk file
+# turunan seperti rollup bulanan. `state` adalah nilai yang dikirim bersama perubahan terakhir di
+# batch itu (misalnya salinan sel rollup), sehingga isinya sama persis dengan yang baru ditulis,
+# bukan dengan perubahan yang datang sesudahnya. Kegagalannya dilaporkan tanpa mengulang batch.
+# Dengan snapshot (callable yang mengembalikan (records, state)), salinan itu tidak dikirim per
+# perubahan tetapi diambil sekali saat batch akan ditulis, di bawah `lock` yang juga dipegang
+# pengirim selama mengubah data dan mengirim op-nya; perubahan yang sudah mengantre saat itu ikut
+# masuk batch, sehingga salinan dan ops selalu mencakup perubahan yang sama.
+# `storage` cukup punya write_batch(ops, records); span adalah nama penulisan di PROFILER
+class PersistenceWorker(threading.Thread):
+    _STOP = object()
+
+    def __init__(self, storage, on_saved=None, on_failed=None,
+                 debounce=PERSIST_DEBOUNCE, max_delay=PERSIST_MAX_DELAY, after_write=None, span='save_data',
+                 snapshot=None, lock=None):
+        super().__init__(daemon=True)
+        self.storage = storage
+        self.snapshot = snapshot
+        self.lock = lock if lock is not None else threading.Lock()
+        self.span = span
+        self.on_saved = on_saved
+        self.on_failed = on_failed
+        self.after_write = after_write
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._pending = 0  # Perubahan yang belum berhasil ditulis
+        self._pending_lock = threading.Lock()
+        # Perubahan (beserta salinan data dan state) dari batch yang gagal, dicoba lagi pada batch berikutnya
+        self._retry = ([], None, None)
+
+    # Dipanggil dari thread GUI setiap ada perubahan
+    def submit(self, op, records=None, state=None):
+        self.submit_many([op], records, state)
+
+    # Banyak perubahan sekaligus (misalnya impor), tetap ditulis dalam satu batch
+    def submit_many(self, ops, records=None, state=None):
+        with self._pending_lock:
+            self._pending += len(ops)
+        self._queue.put((list(ops), records, state))
+
+    def has_pending(self):
+        with self._pending_lock:
+            return self._pending > 0
+
+    # Tulis semua perubahan yang masih menunggu sekarang juga, lalu tunggu sampai selesai
+    def flush(self):
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    # Flush lalu hentikan thread (dipanggil saat aplikasi ditutup)
+    def stop(self):
+        self.flush()
+        self._queue.put(self._STOP)
+        self.join()
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            ops, records, state = list(self._retry[0]), self._retry[1], self._retry[2]
+            waiters = []
+            deadline = time.monotonic() + self.max_delay
+            # Kumpulkan perubahan sampai tidak ada yang baru selama `debounce` detik
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break  # Ada permintaan flush, langsung tulis
+                item_ops, item_records, item_state = item
+                ops.extend(item_ops)
+                if item_records is not None:
+                    records = item_records  # Cukup salinan terakhir
+                if item_state is not None:
+                    state = item_state
+                timeout = min(self.debounce, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    self._queue.put(item)
+                    break
+            if ops:
+                if self.snapshot is not None:
+                    records, state = self._take_snapshot(ops, waiters)
+                self._write(ops, records, state)
+            for waiter in waiters:
+                waiter.set()
+
+    # Salinan data untuk batch, beserta perubahan yang sudah mengantre sampai saat itu (ditambahkan
+    # ke ops). Permintaan flush yang terambil ikut menunggu batch ini
+    def _take_snapshot(self, ops, waiters):
+        with self.lock:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    self._queue.put(item)
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    ops.extend(item[0])
+            return self.snapshot()
+
+    def _write(self, ops, records, state=None):
+        start = time.perf_counter()
+        try:
+            with PROFILER.span(self.span):
+                self.storage.write_batch(ops, records)
+            PROFILER.count(f'{self.span}.perubahan', len(ops))
+        except Exception as e:
+            self._retry = (ops, records, state)
+            if self.on_failed is not None:
+                self.on_failed(str(e))
+            return
+        self._retry = ([], None, None)
+        with self._pending_lock:
+            self._pending -= len(ops)
+        if self.after_write is not None:
+            try:
+                self.after_write(state)
+            except Exception as e:
+                if self.on_failed is not None:
+                    self.on_failed(str(e))
+                return
+        if self.on_saved is not None:
+            self.on_saved((time.perf_counter() - start) * 1000, len(ops))
@@ -0,0 +1,39 @@
+# Fungsi bantu untuk transaksi: pencocokan filter, penomoran id dan pengelompokan kategori
+from .transaksi import Transaksi
+
+
+# Filter berupa tuple (jenis, kategori, tanggal_mulai, tanggal_akhir), "Semua" berarti tidak difilter
+def match_filters(t, filters):
+    jenis, kategori, tanggal_mulai, tanggal_akhir = filters
+    if jenis != "Semua" and t.jenis != jenis:
+        return False
+    # Kategori dibandingkan tanpa membedakan huruf besar/kecil
+    if kategori != "Semua" and t.kategori.lower() != kategori.lower():
+        return False
+    return tanggal_mulai <= t.tanggal <= tanggal_akhir
+
+
+# Menyusun dict id -> transaksi dari list hasil load, dengan setiap transaksi diubah menjadi
+# Transaksi. Data lama yang belum punya 'id' diberi id baru secara berurutan, dan id tersebut
+# ikut tersimpan pada penulisan berikutnya.
+# Mengembalikan dict tersebut beserta id berikutnya yang masih bebas.
+def index_by_id(records):
+    records = [Transaksi.from_dict(t) for t in records]
+    next_id = max((t.id for t in records if t.id is not None), default=0) + 1
+    data = {}
+    for t in records:
+        if t.id is None:
+            t.id = next_id
+            next_id += 1
+        data[t.id] = t
+    return data, next_id
+
+
+# Total nominal per kategori dari sekumpulan transaksi, terpisah untuk pemasukan dan pengeluaran
+def group_by_category(rows):
+    per_jenis = {'pemasukan': {}, 'pengeluaran': {}}
+    for t in rows:
+        if t.jenis in per_jenis:
+            kategori = per_jenis[t.jenis]
+            kategori[t.kategori] = kategori.get(t.kategori, 0) + t.nominal
+    return per_jenis['pemasukan'], per_jenis['pengeluaran']
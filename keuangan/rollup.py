@@ -0,0 +1,145 @@
+# Rollup bulanan: jumlah dan banyaknya transaksi per (bulan, jenis, kategori). Diperbarui setiap
+# ada perubahan dan disimpan di samping buku kas, sehingga laporan bulanan, tren kategori dan
+# progres target tabungan cukup membaca satu sel per bulan, bukan seluruh transaksi
+import calendar
+import json
+import os
+
+ROLLUP_FILE = 'database.rollup.json'
+ROLLUP_VERSION = 1
+
+
+# Penanda isi file-file buku kas (ukuran dan waktu ubah). Rollup yang tersimpan hanya dipakai
+# jika penandanya masih sama dengan file buku kas saat ini
+def ledger_stamp(paths):
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamp.append([os.path.basename(path), None, None])
+            continue
+        stamp.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+    return stamp
+
+
+# Bulan 'YYYY-MM' berikutnya
+def next_month(bulan):
+    tahun, nomor = int(bulan[:4]), int(bulan[5:7])
+    return f"{tahun + nomor // 12:04d}-{nomor % 12 + 1:02d}"
+
+
+# Bulan 'YYYY-MM' sebelumnya
+def previous_month(bulan):
+    tahun, nomor = int(bulan[:4]), int(bulan[5:7])
+    return f"{tahun - (nomor == 1):04d}-{(nomor - 2) % 12 + 1:02d}"
+
+
+# Tanggal terakhir pada bulan 'YYYY-MM' sebagai teks 'YYYY-MM-DD'. Tahun di luar jangkauan
+# datetime (misalnya batas filter SEMUA 0000 dan 9999) tetap bisa dihitung
+def month_end(bulan):
+    return f"{bulan}-{calendar.monthrange(int(bulan[:4]), int(bulan[5:7]))[1]:02d}"
+
+
+class RollupCube:
+    def __init__(self, data=()):
+        # (bulan, jenis, kategori) -> (total, jumlah transaksi). Nilainya tuple agar salinan
+        # dict.copy() dari thread lain selalu berisi sel yang utuh
+        self.cells = {}
+        for t in data:
+            self.add(t)
+
+    def add(self, t):
+        self._apply(t, t.nominal, 1)
+
+    def remove(self, t):
+        self._apply(t, -t.nominal, -1)
+
+    def _apply(self, t, nominal, jumlah):
+        key = (t.tanggal[:7], t.jenis, t.kategori)
+        total, count = self.cells.get(key, (0, 0))
+        count += jumlah
+        if count:
+            self.cells[key] = (total + nominal, count)
+        else:
+            self.cells.pop(key, None)
+
+    # Daftar bulan yang punya transaksi, urut
+    def months(self):
+        return sorted({bulan for bulan, _, _ in self.cells})
+
+    # Sel yang cocok dengan jenis/kategori ("Semua" berarti tanpa syarat, kategori tanpa beda
+    # huruf besar kecil seperti filter tabel) pada rentang bulan [bulan_mulai, bulan_akhir]
+    def _cells(self, jenis="Semua", kategori="Semua", bulan_mulai=None, bulan_akhir=None):
+        kategori = kategori.lower()
+        for (bulan, j, k), sel in self.cells.items():
+            if jenis != "Semua" and j != jenis:
+                continue
+            if kategori != "semua" and k.lower() != kategori:
+                continue
+            if (bulan_mulai is not None and bulan < bulan_mulai) or (bulan_akhir is not None and bulan > bulan_akhir):
+                continue
+            yield bulan, j, k, sel
+
+    # Total pemasukan dan pengeluaran satu bulan ('YYYY-MM')
+    def month_totals(self, bulan):
+        total = {'pemasukan': 0, 'pengeluaran': 0}
+        for _, jenis, _, (nominal, _) in self._cells(bulan_mulai=bulan, bulan_akhir=bulan):
+            if jenis in total:
+                total[jenis] += nominal
+        return total['pemasukan'], total['pengeluaran']
+
+    # Saldo seluruh transaksi: jumlah sel pemasukan dikurangi sel pengeluaran
+    def saldo(self):
+        saldo = 0
+        for (_, jenis, _), (nominal, _) in self.cells.items():
+            if jenis == 'pemasukan':
+                saldo += nominal
+            elif jenis == 'pengeluaran':
+                saldo -= nominal
+        return saldo
+
+    # Total per kategori (pemasukan, pengeluaran) untuk rentang bulan, seperti group_by_category
+    def category_totals(self, jenis="Semua", kategori="Semua", bulan_mulai=None, bulan_akhir=None):
+        per_jenis = {'pemasukan': {}, 'pengeluaran': {}}
+        for _, j, k, (nominal, _) in self._cells(jenis, kategori, bulan_mulai, bulan_akhir):
+            if j in per_jenis:
+                per_jenis[j][k] = per_jenis[j].get(k, 0) + nominal
+        return per_jenis['pemasukan'], per_jenis['pengeluaran']
+
+    # Laporan bulan ke bulan: list (bulan, pemasukan, pengeluaran, jumlah transaksi) urut bulan
+    def monthly_report(self, jenis="Semua", kategori="Semua"):
+        per_bulan = {}
+        for bulan, j, _, (nominal, count) in self._cells(jenis, kategori):
+            baris = per_bulan.setdefault(bulan, {'pemasukan': 0, 'pengeluaran': 0, 'jumlah': 0})
+            if j in baris:
+                baris[j] += nominal
+            baris['jumlah'] += count
+        return [(bulan, baris['pemasukan'], baris['pengeluaran'], baris['jumlah'])
+                for bulan, baris in sorted(per_bulan.items())]
+
+    # Disimpan sebagai list sel beserta penanda file buku kas saat rollup ditulis
+    def save(self, path, stamp, cells=None):
+        cells = self.cells if cells is None else cells
+        isi = {'version': ROLLUP_VERSION, 'stamp': stamp,
+               'cells': [[bulan, jenis, kategori, total, count]
+                         for (bulan, jenis, kategori), (total, count) in cells.items()]}
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(isi, f)
+        os.replace(tmp_file, path)
+
+    # Rollup tersimpan, atau None jika file tidak ada, rusak, atau penandanya berbeda
+    @classmethod
+    def load(cls, path, stamp):
+        try:
+            with open(path, 'r') as f:
+                isi = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(isi, dict) or isi.get('version') != ROLLUP_VERSION or isi.get('stamp') != stamp:
+            return None
+        cube = cls()
+        for bulan, jenis, kategori, total, count in isi['cells']:
+            cube.cells[(bulan, jenis, kategori)] = (total, count)
+        return cube
@@ -0,0 +1,15 @@
+# Fungsi bantu format dan parsing nominal Rupiah
+
+
+# Format angka ke gaya Rupiah, misalnya 1000000 -> 1.000.000
+def format_rupiah(nominal):
+    return f"{nominal:,}".replace(',', '.')
+
+
+# Mengubah string nominal format rupiah (misal "1.000.000") menjadi integer, None jika tidak valid
+def parse_nominal(nominal_text):
+    try:
+        clean_text = nominal_text.replace('.', '').strip()
+        return int(clean_text)
+    except (AttributeError, ValueError):
+        return None
@@ -0,0 +1,287 @@
+# Mode server: buku kas dilayani sebagai JSON lewat HTTP dengan asyncio, sehingga skrip, dasbor
+# dan komputer lain di jaringan lokal bisa membaca dan mengubah buku kas yang sama tanpa saling
+# menimpa database.json. Hanya satu proses yang boleh memegang buku kas: jalankan server atau
+# aplikasi, jangan keduanya pada folder yang sama.
+#
+#   python -m keuangan.server --dir folder-data --port 8765
+#
+#   GET    /transaksi?jenis=&kategori=&dari=&sampai=&offset=&limit=   transaksi yang lolos filter
+#   GET    /transaksi/<id>
+#   POST   /transaksi        {"jenis", "kategori", "nominal", "tanggal"}
+#   PUT    /transaksi/<id>   {"jenis", "kategori", "nominal", "tanggal"}
+#   DELETE /transaksi/<id>
+#   GET    /ringkasan?...    total pemasukan, pengeluaran dan saldo untuk filter
+#   GET    /kategori?...     total per kategori untuk filter
+#   GET    /laporan?jenis=&kategori=   laporan bulan ke bulan
+#   POST   /undo, /redo
+#
+# Semua perubahan masuk ke satu antrean dan dijalankan satu per satu oleh satu task penulis.
+# Setiap perubahan diterapkan utuh di antara dua titik await, sehingga pembacaan (yang dilayani
+# langsung, tanpa ikut antre) selalu melihat data di memori dalam keadaan konsisten
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from .engine import LedgerEngine, valid_tanggal
+from .exporter import SEMUA
+
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+PAGE_LIMIT = 100       # Jumlah transaksi per halaman jika limit tidak diisi
+PAGE_LIMIT_MAX = 5000  # Batas limit per permintaan
+MAX_BODY_BYTES = 1024 * 1024
+
+STATUS_TEXT = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+# Kesalahan permintaan yang dikirim ke klien sebagai {"error": pesan} dengan status HTTP-nya
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# Filter (jenis, kategori, dari, sampai) dari query string; yang kosong berarti tanpa syarat
+def filters_from_query(query):
+    filters = tuple(query.get(nama, [bawaan])[0] or bawaan
+                    for nama, bawaan in zip(('jenis', 'kategori', 'dari', 'sampai'), SEMUA))
+    for tanggal, bawaan in zip(filters[2:], SEMUA[2:]):
+        if tanggal != bawaan and not valid_tanggal(tanggal):
+            raise HttpError(400, "Format tanggal salah! Gunakan YYYY-MM-DD")
+    return filters
+
+
+def _int_param(query, nama, bawaan):
+    try:
+        return int(query.get(nama, [bawaan])[0])
+    except ValueError:
+        raise HttpError(400, f"Parameter {nama} harus berupa angka")
+
+
+def _transaksi_id(teks):
+    try:
+        return int(teks)
+    except ValueError:
+        raise HttpError(404, f"Transaksi {teks} tidak ditemukan")
+
+
+# Isi transaksi dari body JSON, dalam urutan argumen engine.add/edit
+def _fields(body):
+    if not isinstance(body, dict):
+        raise HttpError(400, "Body harus berupa objek JSON")
+    try:
+        return body['jenis'], body['kategori'], body['nominal'], body['tanggal']
+    except KeyError as e:
+        raise HttpError(400, f"Field {e.args[0]} wajib diisi")
+
+
+# Perintah undo/redo sebagai JSON: label dan transaksi yang berubah
+def _command(command):
+    if command is None:
+        return {'perintah': None, 'jumlah': 0}
+    label, changes = command
+    return {'perintah': label, 'jumlah': len(changes)}
+
+
+# Server HTTP/1.1 sederhana (keep-alive, body JSON dengan Content-Length) di atas LedgerEngine.
+# Engine dipakai hanya dari thread event loop; penulisan ke disk tetap lewat PersistenceWorker
+class LedgerServer:
+    def __init__(self, engine, host=SERVER_HOST, port=SERVER_PORT):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.server = None
+        self.writes = None   # Antrean (fungsi, argumen, future) untuk task penulis
+        self.writer = None
+        self.requests = 0
+
+    # Membuka socket dan menjalankan task penulis. Port 0 berarti pilih port bebas; port yang
+    # dipakai tersedia di self.port
+    async def start(self):
+        self.writes = asyncio.Queue()
+        self.writer = asyncio.create_task(self.write_loop())
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.writer.cancel()
+
+    # Satu-satunya tempat engine diubah; hasil atau exception dikembalikan lewat future
+    async def write_loop(self):
+        while True:
+            fn, args, future = await self.writes.get()
+            try:
+                result = fn(*args)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    async def write(self, fn, *args):
+        future = asyncio.get_running_loop().create_future()
+        await self.writes.put((fn, args, future))
+        return await future
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': e.message}
+                except ValueError as e:
+                    status, payload = 400, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                self.requests += 1
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(self.response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HttpError as e:
+            writer.write(self.response(e.status, {'error': e.message}, False))
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    # (method, target, headers, body) dari satu permintaan, None jika koneksi ditutup klien
+    async def read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise HttpError(400, "Baris permintaan tidak valid")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            nama, _, nilai = line.decode('latin-1').partition(':')
+            headers[nama.strip().lower()] = nilai.strip()
+        try:
+            panjang = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, "Content-Length tidak valid")
+        if panjang > MAX_BODY_BYTES:
+            raise HttpError(413, "Body terlalu besar")
+        body = await reader.readexactly(panjang) if panjang else b''
+        return method.upper(), target, headers, body
+
+    def response(self, status, payload, keep_alive=True):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode('latin-1') + body
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [p for p in url.path.split('/') if p]
+        query = parse_qs(url.query)
+        if body:
+            try:
+                body = json.loads(body)
+            except json.JSONDecodeError:
+                raise HttpError(400, "Body bukan JSON yang valid")
+        engine = self.engine
+
+        if parts == ['transaksi']:
+            if method == 'GET':
+                return 200, self.list_transaksi(query)
+            if method == 'POST':
+                transaksi = await self.write(engine.add, *_fields(body))
+                return 201, transaksi.to_dict()
+        elif len(parts) == 2 and parts[0] == 'transaksi':
+            transaksi_id = _transaksi_id(parts[1])
+            if method == 'GET':
+                transaksi = engine.get(transaksi_id)
+                if transaksi is None:
+                    raise HttpError(404, f"Transaksi {transaksi_id} tidak ditemukan")
+                return 200, transaksi.to_dict()
+            try:
+                if method == 'PUT':
+                    return 200, (await self.write(engine.edit, transaksi_id, *_fields(body))).to_dict()
+                if method == 'DELETE':
+                    return 200, (await self.write(engine.delete, transaksi_id)).to_dict()
+            except KeyError:
+                raise HttpError(404, f"Transaksi {transaksi_id} tidak ditemukan")
+        elif parts == ['ringkasan']:
+            if method == 'GET':
+                return 200, self.summary(filters_from_query(query))
+        elif parts == ['kategori']:
+            if method == 'GET':
+                pemasukan, pengeluaran = engine.category_totals(filters_from_query(query))
+                return 200, {'pemasukan': pemasukan, 'pengeluaran': pengeluaran}
+        elif parts == ['laporan']:
+            if method == 'GET':
+                jenis, kategori = filters_from_query(query)[:2]
+                return 200, [{'bulan': bulan, 'pemasukan': pem, 'pengeluaran': peng, 'jumlah': jumlah}
+                             for bulan, pem, peng, jumlah in engine.monthly_report(jenis, kategori)]
+        elif parts in (['undo'], ['redo']):
+            if method == 'POST':
+                return 200, _command(await self.write(getattr(engine, parts[0])))
+        else:
+            raise HttpError(404, f"Alamat {url.path} tidak dikenal")
+        raise HttpError(405, f"Metode {method} tidak didukung untuk {url.path}")
+
+    # Satu halaman transaksi yang lolos filter, urut tanggal
+    def list_transaksi(self, query):
+        offset = max(_int_param(query, 'offset', 0), 0)
+        limit = min(max(_int_param(query, 'limit', PAGE_LIMIT), 0), PAGE_LIMIT_MAX)
+        rows = self.engine.query(filters_from_query(query))
+        return {'total': len(rows), 'offset': offset,
+                'items': [t.to_dict() for t in rows[offset:offset + limit]]}
+
+    # Total untuk filter dari total per kategori (rollup dan cache yang sama dengan diagram)
+    def summary(self, filters):
+        pemasukan, pengeluaran = self.engine.category_totals(filters)
+        total_pemasukan, total_pengeluaran = sum(pemasukan.values()), sum(pengeluaran.values())
+        return {'pemasukan': total_pemasukan, 'pengeluaran': total_pengeluaran,
+                'saldo': total_pemasukan - total_pengeluaran}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layani buku kas sebagai JSON lewat HTTP")
+    parser.add_argument('--dir', default='.', help="folder database.json / config.json")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    args = parser.parse_args(argv)
+
+    engine = LedgerEngine(args.dir)
+    server = LedgerServer(engine, args.host, args.port)
+    print(f"Buku kas {args.dir} dilayani di http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+
+
+if __name__ == '__main__':
+    main()
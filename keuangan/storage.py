@@ -0,0 +1,565 @@
+# Backend penyimpanan transaksi: file JSON, jurnal append-only dan SQLite
+import os
+import re
+import json
+import json.scanner
+import codecs
+import sqlite3
+import threading
+
+from .records import match_filters, index_by_id, group_by_category
+from .transaksi import Transaksi, json_default
+
+# Nama file untuk menyimpan data transaksi dan konfigurasi target tabungan
+DB_FILE = 'database.json'
+CONFIG_FILE = 'config.json'
+
+# Mode penyimpanan: 'json' menulis ulang seluruh database.json setiap ada perubahan,
+# 'journal' hanya menambahkan satu baris kecil per perubahan ke file jurnal,
+# 'sqlite' menyimpan transaksi di database SQLite dengan index,
+# 'binary' menulis ulang snapshot biner ringkas (database.bin) yang dibuka lewat mmap,
+# 'partitioned' memecah transaksi per tahun/bulan ke folder database.parts.
+# Bisa diganti lewat kunci 'storage_mode' di config.json
+STORAGE_MODE = 'json'
+JOURNAL_FILE = 'database.journal'
+SNAPSHOT_FILE = 'database.snapshot.json'
+SQLITE_FILE = 'database.sqlite3'
+JOURNAL_COMPACT_BYTES = 1024 * 1024  # Jurnal dipadatkan menjadi snapshot setelah melewati 1 MB
+
+# Pemuatan bertahap: database.json dibaca per LOAD_CHUNK_BYTES dan transaksinya diserahkan
+# per LOAD_BATCH_SIZE, sehingga memori untuk parsing tidak bergantung pada ukuran file
+LOAD_BATCH_SIZE = 5000
+LOAD_CHUNK_BYTES = 1024 * 1024
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+
+
+# Fungsi memuat data transaksi dari file JSON
+def load_data(path=DB_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        # Jika file tidak ada atau corrupt, kembalikan list kosong
+        return []
+
+
+# Membaca array transaksi di database.json sedikit demi sedikit dan menghasilkan list transaksi
+# per batch. progress(byte_dibaca, total_byte) dipanggil setiap satu batch selesai.
+# File yang tidak ada dianggap kosong; isi yang rusak menimbulkan json.JSONDecodeError
+def iter_data_batches(path=DB_FILE, batch_size=LOAD_BATCH_SIZE, progress=None, chunk_bytes=LOAD_CHUNK_BYTES):
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        total = os.fstat(f.fileno()).st_size
+        scan_once = json.scanner.make_scanner(json.JSONDecoder())
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        buf, pos, dibaca = '', 0, 0
+
+        # Tambah potongan file berikutnya ke buffer, bagian yang sudah diproses dibuang
+        def read_more():
+            nonlocal buf, pos, dibaca
+            chunk = f.read(chunk_bytes)
+            dibaca += len(chunk)
+            buf = buf[pos:] + text_decoder.decode(chunk, final=not chunk)
+            pos = 0
+            return bool(chunk)
+
+        def skip_whitespace():
+            nonlocal pos
+            pos = _WHITESPACE.match(buf, pos).end()
+            while pos == len(buf) and read_more():
+                pos = _WHITESPACE.match(buf, pos).end()
+
+        skip_whitespace()
+        if pos == len(buf):
+            return  # File kosong diperlakukan seperti list kosong
+        if buf[pos:pos + 1] != '[':
+            raise json.JSONDecodeError("Expecting '['", buf, pos)
+        pos += 1
+        skip_whitespace()
+        if buf[pos:pos + 1] == ']':
+            return
+
+        batch = []
+        while True:
+            # Transaksi yang terpotong di ujung buffer diurai ulang setelah buffer ditambah
+            while True:
+                try:
+                    record, pos = scan_once(buf, pos)
+                    break
+                except (StopIteration, json.JSONDecodeError):
+                    if not read_more():
+                        raise json.JSONDecodeError("Expecting value", buf, pos)
+                    pos = _WHITESPACE.match(buf, pos).end()
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+                if progress is not None:
+                    progress(dibaca, total)
+            # Koma atau kurung tutup beserta spasi di sekitarnya dilewati dengan satu regex
+            match = _SEPARATOR.match(buf, pos)
+            while match is None and _WHITESPACE.match(buf, pos).end() == len(buf) and read_more():
+                match = _SEPARATOR.match(buf, pos)
+            if match is None:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos = match.end()
+            if match.group(1) == ']':
+                break
+        if batch:
+            yield batch
+        if progress is not None:
+            progress(total, total)
+
+
+# Fungsi menyimpan data transaksi ke file JSON. Ditulis ke file sementara lalu diganti
+# sekaligus, sehingga database.json tidak pernah setengah tertulis
+def save_data(data, path=DB_FILE):
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(data, f, indent=2, default=json_default)
+    os.replace(tmp_file, path)
+
+
+# Fungsi memuat konfigurasi target tabungan dari file JSON
+def load_config(path=CONFIG_FILE, create=True):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        # Jika file tidak ada, buat konfigurasi default (kecuali create=False)
+        conf = {'target_tabungan': 0}
+        if create:
+            save_config(conf, path)
+        return conf
+
+
+# Fungsi menyimpan konfigurasi target tabungan ke file JSON
+def save_config(conf, path=CONFIG_FILE):
+    with open(path, 'w') as f:
+        json.dump(conf, f, indent=2)
+
+
+# Dasar semua backend penyimpanan. `data` selalu dict id -> transaksi (urut sesuai waktu tambah).
+# Query di sini dijalankan dengan memindai data di memori, backend yang punya mesin query
+# sendiri (SQLite) menimpanya.
+class Storage:
+    pushdown = False  # True jika query lebih baik dijalankan oleh backend daripada index di memori
+    needs_snapshot = False  # True jika penulisan butuh salinan seluruh transaksi
+    lazy = False  # True jika query(None, ...) dan category_totals(None, ...) bisa dijawab sebelum data dimuat
+
+    # Mengembalikan list transaksi
+    def load(self):
+        raise NotImplementedError
+
+    # Menghasilkan seluruh transaksi per batch (list) sambil melaporkan progress(selesai, total).
+    # Bawaan: satu batch berisi hasil load()
+    def load_batches(self, batch_size=LOAD_BATCH_SIZE, progress=None):
+        records = self.load()
+        if progress is not None:
+            progress(1, 1)
+        if records:
+            yield records
+
+    # Transaksi terbaru (paling banyak `limit`, urut tanggal) untuk ditampilkan sebelum seluruh
+    # riwayat selesai dimuat. None jika backend tidak bisa mengambilnya tanpa membaca semua data
+    def load_recent(self, limit):
+        return None
+
+    # Menulis sekumpulan perubahan sekaligus. Setiap op berupa ('add', transaksi),
+    # ('edit', transaksi) atau ('delete', id). `records` berisi seluruh transaksi setelah
+    # perubahan, hanya diisi untuk backend dengan needs_snapshot
+    def write_batch(self, ops, records=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    # File yang isinya berubah setiap kali buku kas ditulis, untuk penanda rollup tersimpan
+    def ledger_files(self):
+        return []
+
+    # Transaksi yang cocok dengan filter
+    def query(self, data, filters):
+        return [t for t in data.values() if match_filters(t, filters)]
+
+    # Banyaknya transaksi yang cocok dengan filter
+    def count(self, data, filters):
+        return len(self.query(data, filters))
+
+    # Transaksi yang cocok dengan filter per chunk (list), untuk ekspor
+    def iter_query(self, data, filters, chunk_size=LOAD_BATCH_SIZE):
+        rows = self.query(data, filters)
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+    # Total pemasukan dan pengeluaran, filters=None berarti semua data
+    def totals(self, data, filters=None):
+        total = {'pemasukan': 0, 'pengeluaran': 0}
+        for t in data.values():
+            if t.jenis in total and (filters is None or match_filters(t, filters)):
+                total[t.jenis] += t.nominal
+        return total['pemasukan'], total['pengeluaran']
+
+    # Total nominal per kategori, terpisah untuk pemasukan dan pengeluaran
+    def category_totals(self, data, filters=None):
+        return group_by_category(t for t in data.values() if filters is None or match_filters(t, filters))
+
+
+# Penyimpanan default: seluruh data ditulis ulang ke database.json
+class JsonStorage(Storage):
+    needs_snapshot = True
+
+    def __init__(self, db_file=DB_FILE):
+        self.db_file = db_file
+
+    def load(self):
+        return load_data(self.db_file)
+
+    # database.json diurai bertahap, progress dalam byte
+    def load_batches(self, batch_size=LOAD_BATCH_SIZE, progress=None):
+        return iter_data_batches(self.db_file, batch_size, progress)
+
+    # Berapapun jumlah perubahannya, cukup satu kali tulis ulang
+    def write_batch(self, ops, records=None):
+        save_data(records, self.db_file)
+
+    def ledger_files(self):
+        return [self.db_file]
+
+
+# Penyimpanan berbasis jurnal: setiap perubahan (tambah, edit, hapus) ditulis sebagai
+# satu baris JSON di akhir file jurnal. Saat dimuat, snapshot dibaca lalu jurnal diputar
+# ulang di atasnya. Jika jurnal sudah terlalu besar, snapshot baru ditulis di background.
+class TransactionJournal(Storage):
+    def __init__(self, journal_file=JOURNAL_FILE, snapshot_file=SNAPSHOT_FILE,
+                 compact_bytes=JOURNAL_COMPACT_BYTES, db_file=DB_FILE):
+        self.journal_file = journal_file
+        self.db_file = db_file
+        self.snapshot_file = snapshot_file
+        self.compact_bytes = compact_bytes
+        self.seq = 0  # Nomor urut perubahan terakhir yang sudah ditulis
+        self._lock = threading.Lock()
+        self._compact_thread = None
+
+    def load(self):
+        data, self.seq = self._replay(truncate=True)
+        return list(data.values())
+
+    # Memuat snapshot lalu menerapkan semua perubahan jurnal yang lebih baru.
+    # Mengembalikan data beserta seq catatan terakhir yang diterapkan
+    def _replay(self, truncate=False):
+        records, snapshot_seq = self._load_snapshot()
+        data, _ = index_by_id(records)
+        seq = snapshot_seq
+        try:
+            with open(self.journal_file, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Baris terakhir terpotong (misal aplikasi mati saat menulis),
+                        # buang agar baris berikutnya tidak tersambung dengannya
+                        if truncate:
+                            f.close()
+                            os.truncate(self.journal_file, offset)
+                        break
+                    offset += len(line)
+                    # Baris rusak di tengah (bukan JSON, bukan catatan dengan seq, atau isinya tidak
+                    # lengkap) dilewati, catatan sesudahnya tetap dipakai
+                    try:
+                        record = json.loads(line)
+                        record_seq = record['seq']
+                        if record_seq <= snapshot_seq:
+                            continue  # Sudah termasuk di dalam snapshot
+                        self._apply(data, record)
+                    except (ValueError, KeyError, TypeError, IndexError):
+                        continue
+                    seq = record_seq
+        except FileNotFoundError:
+            pass
+        return data, seq
+
+    # Snapshot berisi data lengkap beserta nomor urut jurnal terakhir yang sudah tercakup.
+    # Jika snapshot belum ada, data awal diambil dari database.json biasa
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+            return snapshot['transaksi'], snapshot['seq']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return load_data(self.db_file), 0
+
+    # Menerapkan satu catatan jurnal ke data. Catatan lama (sebelum ada id transaksi)
+    # menunjuk transaksi lewat posisinya ('idx')
+    def _apply(self, data, record):
+        op = record['op']
+        if 'idx' in record:
+            transaksi_id = list(data)[record['idx']]
+        elif op == 'delete':
+            transaksi_id = record['id']
+        else:
+            transaksi_id = record['data'].get('id')
+        if op == 'add':
+            transaksi = record['data']
+            if transaksi_id is None:
+                transaksi['id'] = transaksi_id = max(data, default=0) + 1
+            data[transaksi_id] = transaksi
+        elif op == 'edit':
+            data[transaksi_id] = dict(record['data'], id=transaksi_id)
+        elif op == 'delete':
+            data.pop(transaksi_id, None)
+
+    # Semua perubahan dalam satu batch ditambahkan ke jurnal dengan satu kali tulis. Jika
+    # penulisan gagal di tengah, jurnal dipotong kembali ke ukuran semula agar batch yang sama
+    # bisa ditulis ulang tanpa menyisakan potongan baris
+    def write_batch(self, ops, records=None):
+        with self._lock:
+            seq = self.seq
+            lines = []
+            for op, value in ops:
+                seq += 1
+                if op == 'delete':
+                    record = {'seq': seq, 'op': op, 'id': value}
+                else:
+                    record = {'seq': seq, 'op': op, 'data': value}
+                lines.append(json.dumps(record, default=json_default) + '\n')
+            offset = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+            try:
+                with open(self.journal_file, 'a') as f:
+                    f.write(''.join(lines))
+                    size = f.tell()
+            except OSError:
+                if os.path.exists(self.journal_file):
+                    os.truncate(self.journal_file, offset)
+                raise
+            self.seq = seq
+            if size >= self.compact_bytes and not self.is_compacting():
+                self._compact_thread = threading.Thread(target=self._compact, daemon=True)
+                self._compact_thread.start()
+
+    def is_compacting(self):
+        return self._compact_thread is not None and self._compact_thread.is_alive()
+
+    # Menulis snapshot baru lalu membuang catatan jurnal yang sudah tercakup di dalamnya.
+    # Isi snapshot dibangun ulang dari file (bukan dari data di memori aplikasi), sehingga
+    # penulisan jurnal dapat terus berjalan selama pemadatan
+    def _compact(self):
+        data, seq = self._replay()
+        tmp_file = self.snapshot_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({'seq': seq, 'transaksi': list(data.values())}, f, default=json_default)
+        os.replace(tmp_file, self.snapshot_file)
+
+        with self._lock:
+            # Catatan dengan seq lebih besar ditambahkan selama snapshot sedang ditulis
+            with open(self.journal_file, 'r') as f:
+                sisa = [line for line in f if self._seq_of(line) > seq]
+            tmp_file = self.journal_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                f.writelines(sisa)
+            os.replace(tmp_file, self.journal_file)
+
+    @staticmethod
+    def _seq_of(line):
+        try:
+            return json.loads(line)['seq']
+        except (ValueError, KeyError, TypeError):
+            return 0  # Baris rusak tidak dibawa ke jurnal baru
+
+    # Menunggu proses pemadatan selesai (dipanggil saat aplikasi ditutup)
+    def wait(self):
+        if self._compact_thread is not None:
+            self._compact_thread.join()
+
+    def close(self):
+        self.wait()
+
+    def ledger_files(self):
+        return [self.journal_file, self.snapshot_file]
+
+
+# Penyimpanan SQLite. Tanggal, jenis dan kategori diberi index sehingga filter,
+# SUM dan GROUP BY untuk saldo maupun diagram dikerjakan langsung oleh SQLite.
+class SqliteStorage(Storage):
+    pushdown = True
+
+    def __init__(self, sqlite_file=SQLITE_FILE, db_file=DB_FILE):
+        self.db_file = db_file
+        self.sqlite_file = sqlite_file
+        # Koneksi dipakai bersama oleh thread GUI (query) dan thread penyimpanan (tulis)
+        self.conn = sqlite3.connect(sqlite_file, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS transaksi (
+                id INTEGER PRIMARY KEY,
+                jenis TEXT NOT NULL,
+                kategori TEXT NOT NULL,
+                nominal INTEGER NOT NULL,
+                tanggal TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_transaksi_tanggal ON transaksi (tanggal);
+            CREATE INDEX IF NOT EXISTS idx_transaksi_jenis ON transaksi (jenis, tanggal);
+            CREATE INDEX IF NOT EXISTS idx_transaksi_kategori ON transaksi (kategori COLLATE NOCASE, tanggal);
+        """)
+
+    # Id transaksi sama dengan id baris SQLite
+    def load(self):
+        with self._lock:
+            self._migrate_once()
+            rows = self.conn.execute(
+                "SELECT id, jenis, kategori, nominal, tanggal FROM transaksi ORDER BY id")
+            return [self._to_dict(row) for row in rows]
+
+    # user_version dipakai sebagai penanda bahwa migrasi dari database.json sudah pernah dilakukan
+    def _migrate_once(self):
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            migrate_json_to_sqlite(self.conn, load_data(self.db_file))
+
+    # Baris dibaca per batch dengan fetchmany, progress dalam jumlah baris
+    def load_batches(self, batch_size=LOAD_BATCH_SIZE, progress=None):
+        with self._lock:
+            self._migrate_once()
+            total = self.conn.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0]
+            cursor = self.conn.execute(
+                "SELECT id, jenis, kategori, nominal, tanggal FROM transaksi ORDER BY id")
+        selesai = 0
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            selesai += len(rows)
+            yield [self._to_dict(row) for row in rows]
+            if progress is not None:
+                progress(selesai, total)
+
+    # Halaman terbaru diambil lewat index tanggal tanpa membaca seluruh tabel
+    def load_recent(self, limit):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, jenis, kategori, nominal, tanggal FROM transaksi "
+                "ORDER BY tanggal DESC, id DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(row) for row in reversed(rows)]
+
+    def _to_dict(self, row):
+        return Transaksi(*row)
+
+    # Satu batch perubahan dijalankan dalam satu transaksi SQLite
+    def write_batch(self, ops, records=None):
+        with self._lock, self.conn:
+            for op, value in ops:
+                if op == 'add':
+                    self.conn.execute(
+                        "INSERT INTO transaksi (id, jenis, kategori, nominal, tanggal) VALUES (?, ?, ?, ?, ?)",
+                        (value['id'], value['jenis'], value['kategori'], value['nominal'], value['tanggal']))
+                elif op == 'edit':
+                    self.conn.execute(
+                        "UPDATE transaksi SET jenis = ?, kategori = ?, nominal = ?, tanggal = ? WHERE id = ?",
+                        (value['jenis'], value['kategori'], value['nominal'], value['tanggal'], value['id']))
+                elif op == 'delete':
+                    self.conn.execute("DELETE FROM transaksi WHERE id = ?", (value,))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def ledger_files(self):
+        return [self.sqlite_file]
+
+    # Menyusun klausa WHERE dari tuple filter
+    def _where(self, filters):
+        if filters is None:
+            return "", []
+        jenis, kategori, tanggal_mulai, tanggal_akhir = filters
+        clauses = ["tanggal BETWEEN ? AND ?"]
+        params = [tanggal_mulai, tanggal_akhir]
+        if jenis != "Semua":
+            clauses.append("jenis = ?")
+            params.append(jenis)
+        if kategori != "Semua":
+            clauses.append("kategori = ? COLLATE NOCASE")
+            params.append(kategori)
+        return " WHERE " + " AND ".join(clauses), params
+
+    def query(self, data, filters):
+        where, params = self._where(filters)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, jenis, kategori, nominal, tanggal FROM transaksi" + where + " ORDER BY tanggal, id",
+                params).fetchall()
+        if data is not None:
+            # Hasil memakai objek transaksi yang sudah ada di memori, tanpa salinan baru
+            return [data[row[0]] for row in rows]
+        return [self._to_dict(row) for row in rows]
+
+    def count(self, data, filters):
+        where, params = self._where(filters)
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM transaksi" + where, params).fetchone()[0]
+
+    # Baris dibaca per chunk lewat cursor, tanpa memuat seluruh hasil query sekaligus
+    def iter_query(self, data, filters, chunk_size=LOAD_BATCH_SIZE):
+        where, params = self._where(filters)
+        with self._lock:
+            cursor = self.conn.execute(
+                "SELECT id, jenis, kategori, nominal, tanggal FROM transaksi" + where + " ORDER BY tanggal, id",
+                params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield [self._to_dict(row) for row in rows]
+
+    def totals(self, data, filters=None):
+        where, params = self._where(filters)
+        with self._lock:
+            total = dict(self.conn.execute(
+                "SELECT jenis, SUM(nominal) FROM transaksi" + where + " GROUP BY jenis", params))
+        return total.get('pemasukan', 0), total.get('pengeluaran', 0)
+
+    def category_totals(self, data, filters=None):
+        where, params = self._where(filters)
+        per_jenis = {'pemasukan': {}, 'pengeluaran': {}}
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT jenis, kategori, SUM(nominal) FROM transaksi" + where + " GROUP BY jenis, kategori",
+                params).fetchall()
+        for jenis, kategori, total in rows:
+            if jenis in per_jenis:
+                per_jenis[jenis][kategori] = total
+        return per_jenis['pemasukan'], per_jenis['pengeluaran']
+
+
+# Migrasi satu kali dari isi database.json ke tabel SQLite
+def migrate_json_to_sqlite(conn, records):
+    data, _ = index_by_id(records)
+    with conn:
+        conn.executemany(
+            "INSERT INTO transaksi (id, jenis, kategori, nominal, tanggal) VALUES (?, ?, ?, ?, ?)",
+            [(t['id'], t['jenis'], t['kategori'], t['nominal'], t['tanggal']) for t in data.values()])
+        conn.execute("PRAGMA user_version = 1")
+
+
+# Membuat backend penyimpanan sesuai mode di konfigurasi. Semua file berada di `directory`.
+# `config` berisi opsi tambahan backend (misalnya pembagian partisi)
+def create_storage(mode, directory='.', config=None):
+    config = config or {}
+    db_file = os.path.join(directory, DB_FILE)
+    if mode == 'journal':
+        return TransactionJournal(os.path.join(directory, JOURNAL_FILE),
+                                  os.path.join(directory, SNAPSHOT_FILE), db_file=db_file)
+    if mode == 'sqlite':
+        return SqliteStorage(os.path.join(directory, SQLITE_FILE), db_file=db_file)
+    if mode == 'binary':
+        from .binary import BINARY_FILE, BinaryStorage
+        return BinaryStorage(os.path.join(directory, BINARY_FILE), db_file=db_file)
+    if mode == 'partitioned':
+        from .partitions import PARTITION_DIR, PARTITION_BY, PARTITION_CACHE_RECORDS, PartitionedStorage
+        return PartitionedStorage(os.path.join(directory, PARTITION_DIR), db_file=db_file,
+                                  partition_by=config.get('partition_by', PARTITION_BY),
+                                  cache_records=config.get('partition_cache_records', PARTITION_CACHE_RECORDS))
+    return JsonStorage(db_file)
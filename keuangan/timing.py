@@ -0,0 +1,187 @@
+# Pencatat waktu per fase, misalnya untuk laporan waktu startup aplikasi, dan profiler jalur
+# panas (muat, simpan, filter, tabel, diagram) yang bisa dinyalakan saat aplikasi berjalan
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# Batas atas setiap kotak histogram latensi dalam milidetik; kotak terakhir untuk sisanya
+LATENCY_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+TRACE_MAX_EVENTS = 100000  # Event trace terbaru yang disimpan untuk diekspor
+
+
+# Setiap mark() mencatat lama sejak mark sebelumnya dan sejak titik awal
+class PhaseTimer:
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []  # (nama, durasi_ms, sejak_awal_ms)
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000, (now - self.start) * 1000))
+        self.last = now
+
+    def report(self):
+        lines = [f"{'Fase':<32}{'Durasi':>12}{'Sejak awal':>14}"]
+        for name, durasi, sejak_awal in self.phases:
+            lines.append(f"{name:<32}{durasi:>9.1f} ms{sejak_awal:>11.1f} ms")
+        return '\n'.join(lines)
+
+
+# Jumlah panggilan, total, maksimum dan histogram latensi satu titik ukur
+class LatencyHistogram:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, durasi_ms):
+        self.count += 1
+        self.total_ms += durasi_ms
+        if durasi_ms > self.max_ms:
+            self.max_ms = durasi_ms
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, durasi_ms)] += 1
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    # Perkiraan persentil dari batas atas kotak histogram (maksimum untuk kotak terakhir)
+    def percentile(self, p):
+        target = p / 100 * self.count
+        jumlah = 0
+        for batas, isi in zip(LATENCY_BUCKETS_MS, self.buckets):
+            jumlah += isi
+            if isi and jumlah >= target:
+                return min(batas, self.max_ms)
+        return self.max_ms
+
+
+# Span yang tidak mencatat apa-apa, dipakai saat profiler mati
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+# Profiler titik ukur bernama. Saat mati (bawaan) span() dan fungsi yang dibungkus profiled()
+# hanya memeriksa satu atribut. Saat hidup setiap span menambah histogram namanya dan satu event
+# trace (format Chrome trace, bisa dibuka di chrome://tracing atau Perfetto). Aman dipakai dari
+# beberapa thread
+class Profiler:
+    def __init__(self, enabled=False, trace_max=TRACE_MAX_EVENTS):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.histograms = {}  # nama -> LatencyHistogram
+        self.counters = {}    # nama -> jumlah
+        self.trace = deque(maxlen=trace_max)  # (nama, mulai, selesai, id thread)
+        self.thread_names = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    # Mencatat satu span yang sudah diukur sendiri (waktu dari time.perf_counter())
+    def record(self, name, start, end):
+        thread = threading.current_thread()
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.add((end - start) * 1000)
+            self.trace.append((name, start, end, thread.ident))
+            self.thread_names[thread.ident] = thread.name
+
+    def count(self, name, jumlah=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + jumlah
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.trace.clear()
+
+    # Ringkasan per titik ukur, urut total waktu terbesar:
+    # list (nama, jumlah, total_ms, rata2_ms, p50_ms, p95_ms, maks_ms)
+    def stats(self):
+        with self._lock:
+            histograms = list(self.histograms.items())
+        baris = [(nama, h.count, h.total_ms, h.mean_ms, h.percentile(50), h.percentile(95), h.max_ms)
+                 for nama, h in histograms]
+        return sorted(baris, key=lambda b: b[2], reverse=True)
+
+    def report(self):
+        lines = [f"{'Titik ukur':<24}{'Jumlah':>8}{'Total':>12}{'Rata2':>10}{'p50':>10}{'p95':>10}{'Maks':>10}"]
+        for nama, jumlah, total, rata2, p50, p95, maks in self.stats():
+            lines.append(f"{nama:<24}{jumlah:>8}{total:>9.1f} ms{rata2:>7.2f} ms{p50:>7.2f} ms"
+                         f"{p95:>7.2f} ms{maks:>7.1f} ms")
+        for nama, jumlah in sorted(self.counters.items()):
+            lines.append(f"{nama:<24}{jumlah:>8}")
+        return '\n'.join(lines)
+
+    # Menulis trace dalam format Chrome trace event (JSON). Mengembalikan jumlah event span
+    def export_trace(self, path):
+        pid = os.getpid()
+        with self._lock:
+            trace = list(self.trace)
+            thread_names = dict(self.thread_names)
+            counters = dict(self.counters)
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': nama}}
+                  for tid, nama in thread_names.items()]
+        events += [{'name': nama, 'ph': 'X', 'pid': pid, 'tid': tid,
+                    'ts': (mulai - self.origin) * 1e6, 'dur': (selesai - mulai) * 1e6}
+                   for nama, mulai, selesai, tid in trace]
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'counters': counters}}, f)
+        os.replace(tmp_file, path)
+        return len(trace)
+
+
+# Profiler bersama untuk seluruh aplikasi, dinyalakan lewat variabel lingkungan KEUANGAN_PROFILE=1
+# atau panel performa di aplikasi
+PROFILER = Profiler(enabled=os.environ.get('KEUANGAN_PROFILE', '') not in ('', '0'))
+
+
+# Dekorator: setiap panggilan fungsi dicatat sebagai span `name` di PROFILER
+def profiled(name):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            mulai = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                PROFILER.record(name, mulai, time.perf_counter())
+        return wrapper
+    return decorator
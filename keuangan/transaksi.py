@@ -0,0 +1,80 @@
+# Tipe data transaksi yang hemat memori. Transaksi tetap bisa diakses seperti dict
+# (t['kategori'], t.get('id'), dict(t)) sehingga kode lama tidak perlu diubah,
+# dan disimpan ke JSON dengan susunan yang sama seperti sebelumnya
+import sys
+from collections.abc import Mapping
+
+# Daftar kategori pemasukan dan pengeluaran standar
+PEMASUKAN_CATEGORIES = [
+    "Uang bulanan", "Beasiswa", "Freelance",
+    "Jualan", "Bonus", "Investasi", "Lainnya"
+]
+PENGELUARAN_CATEGORIES = [
+    "Makan & Minum", "Kos / Sewa Tempat Tinggal", "Transportasi",
+    "Kuota / Internet", "Alat Kuliah", "Uang Kuliah / SPP",
+    "Hiburan", "Belanja Pribadi", "Cicilan / Hutang",
+    "Tabungan / Investasi", "Lainnya"
+]
+JENIS = ["pemasukan", "pengeluaran"]
+
+# Jenis dan kategori standar selalu memakai objek string dari tabel di atas
+_INTERNED = {teks: teks for teks in JENIS + PEMASUKAN_CATEGORIES + PENGELUARAN_CATEGORIES}
+
+
+# String yang sama isinya dipakai bersama oleh semua transaksi. Kategori di luar tabel standar
+# dan teks tanggal (paling banyak satu objek per hari) lewat sys.intern
+def intern_text(teks):
+    return _INTERNED.get(teks) or sys.intern(teks)
+
+
+# Satu transaksi dengan __slots__: tanpa dict per objek, dan jenis, kategori serta tanggal
+# menunjuk ke string bersama. id None berarti transaksi lama yang belum diberi id (index_by_id
+# mengisinya lewat atribut). Sebagai Mapping hanya bisa dibaca (t['nominal']), dan karena
+# Mapping membandingkan isi lewat __eq__, Transaksi tidak bisa di-hash: pakai t.id sebagai kunci
+class Transaksi(Mapping):
+    __slots__ = ('id', 'jenis', 'kategori', 'nominal', 'tanggal')
+    __hash__ = None
+
+    def __init__(self, id, jenis, kategori, nominal, tanggal):
+        self.id = id
+        self.jenis = intern_text(jenis)
+        self.kategori = intern_text(kategori)
+        self.nominal = nominal
+        self.tanggal = intern_text(tanggal)
+
+    # Dict hasil load (atau Transaksi yang sudah jadi) menjadi Transaksi
+    @classmethod
+    def from_dict(cls, t):
+        if isinstance(t, Transaksi):
+            return t
+        return cls(t.get('id'), t['jenis'], t['kategori'], t['nominal'], t['tanggal'])
+
+    # Susunan kunci sama dengan database.json; id tidak ditulis jika belum ada
+    def to_dict(self):
+        t = {"id": self.id} if self.id is not None else {}
+        t.update(jenis=self.jenis, kategori=self.kategori, nominal=self.nominal, tanggal=self.tanggal)
+        return t
+
+    def __getitem__(self, key):
+        if key in self.__slots__ and (key != 'id' or self.id is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and (key != 'id' or self.id is not None)
+
+    def __iter__(self):
+        return iter(self.__slots__ if self.id is not None else self.__slots__[1:])
+
+    def __len__(self):
+        return 5 if self.id is not None else 4
+
+    def __repr__(self):
+        return f"Transaksi({self.to_dict()!r})"
+
+
+# Dipakai sebagai `default` untuk json.dump/json.dumps agar Transaksi ditulis sebagai objek JSON
+def json_default(o):
+    if isinstance(o, Transaksi):
+        return o.to_dict()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
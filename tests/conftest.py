@@ -0,0 +1,5 @@
+# Paket keuangan diimpor dari akar repositori, tanpa perlu dipasang
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
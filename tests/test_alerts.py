@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from keuangan import (CategoryCapRule, DailyExpenseBuckets, LedgerEngine, NegativeBalanceRule, RollingWindowRule,
+                      Transaksi, build_alert_rules)
+
+
+def test_configured_rules_are_built():
+    rules = build_alert_rules({'aturan_peringatan': [
+        {'tipe': 'saldo_negatif'},
+        {'tipe': 'batas_kategori', 'kategori': 'Hiburan', 'batas': 500000, 'periode': 'bulanan'},
+        {'tipe': 'jendela_bergulir', 'hari': 30, 'batas': 3000000},
+    ]}, 7, 1000000)
+    assert [type(rule) for rule in rules] == [NegativeBalanceRule, CategoryCapRule, RollingWindowRule]
+    assert rules[1].periode == 'bulanan' and rules[2].kategori is None
+
+
+# Salah ketik tipe atau kunci wajib yang hilang tidak boleh membuat peringatan hilang diam-diam
+@pytest.mark.parametrize('spec, pesan', [
+    ({'tipe': 'batas_kategory', 'kategori': 'Hiburan', 'batas': 1}, 'batas_kategory'),
+    ({'tipe': 'batas_kategori', 'kategori': 'Hiburan'}, 'batas'),
+    ({'tipe': 'jendela_bergulir', 'batas': 1}, 'hari'),
+    ('saldo_negatif', 'saldo_negatif'),
+])
+def test_bad_spec_is_reported(spec, pesan):
+    with pytest.raises(ValueError, match=pesan):
+        build_alert_rules({'aturan_peringatan': [spec]}, 7, 1000000)
+
+
+def _buckets(*rows):
+    return DailyExpenseBuckets([Transaksi(i, jenis, kategori, nominal, tanggal)
+                                for i, (jenis, kategori, nominal, tanggal) in enumerate(rows, 1)])
+
+
+@pytest.mark.parametrize('periode, changed, over', [
+    ('harian', ['2024-05-01', '2024-05-02'], ['2024-05-02']),
+    ('harian', ['2024-05-01'], None),
+    ('bulanan', ['2024-05-01'], ['2024-05']),
+    ('bulanan', ['2024-06-01'], None),
+])
+def test_category_cap(periode, changed, over):
+    buckets = _buckets(('pengeluaran', 'Hiburan', 40000, '2024-05-01'),
+                       ('pengeluaran', 'Hiburan', 60000, '2024-05-02'),
+                       ('pengeluaran', 'Makan', 90000, '2024-05-01'),
+                       ('pemasukan', 'Hiburan', 90000, '2024-05-01'),
+                       ('pengeluaran', 'Hiburan', 10000, '2024-06-01'))
+    batas = 50000 if periode == 'harian' else 90000
+    alert = CategoryCapRule('Hiburan', batas, periode).check(buckets, None, [date.fromisoformat(d) for d in changed])
+    if over is None:
+        assert alert is None
+    else:
+        assert alert[0] == "Peringatan Batas Kategori"
+        assert alert[1].endswith(f"pada {', '.join(over)}.")
+
+
+# Hari yang berubah bisa berada di awal, tengah atau akhir jendela yang melewati batas
+@pytest.mark.parametrize('changed', ['2024-05-01', '2024-05-03', '2024-05-05'])
+def test_rolling_window_finds_window_containing_changed_day(changed):
+    buckets = _buckets(('pengeluaran', 'Makan', 30000, '2024-05-01'),
+                       ('pengeluaran', 'Hiburan', 30000, '2024-05-03'),
+                       ('pengeluaran', 'Makan', 30000, '2024-05-05'))
+    alert = RollingWindowRule(5, 80000).check(buckets, None, [date.fromisoformat(changed)])
+    assert alert[0] == "Peringatan Pengeluaran Bergulir"
+    assert "(2024-05-01 s/d 2024-05-05)" in alert[1]
+    assert RollingWindowRule(4, 80000).check(buckets, None, [date.fromisoformat(changed)]) is None
+    assert RollingWindowRule(5, 50000, 'Makan').check(buckets, None, [date.fromisoformat(changed)])[1] \
+        .startswith("Pengeluaran kategori Makan selama 5 hari")
+
+
+def test_engine_checks_configured_rules(tmp_path):
+    engine = LedgerEngine(str(tmp_path), background=False, config={'aturan_peringatan': [
+        {'tipe': 'saldo_negatif'},
+        {'tipe': 'batas_kategori', 'kategori': 'Hiburan', 'batas': 50000},
+    ]})
+    t = engine.add('pengeluaran', 'Hiburan', 60000, '2024-05-01')
+    judul = [judul for judul, _ in engine.check_alerts(engine.expense_days(t))]
+    assert judul == ["Peringatan Saldo Negatif", "Peringatan Batas Kategori"]
+    engine.close()
@@ -0,0 +1,62 @@
+import pytest
+
+from keuangan import BinarySnapshot, LedgerEngine, Transaksi, group_by_category, match_filters, save_binary
+from keuangan.binary import encode_records
+
+
+def _rows():
+    return [
+        {'id': 1, 'jenis': 'pemasukan', 'kategori': 'Gaji', 'nominal': 3000000, 'tanggal': '2024-01-01'},
+        {'id': 2, 'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': 25000, 'tanggal': '2024-01-15'},
+        {'id': 3, 'jenis': 'pengeluaran', 'kategori': 'makan', 'nominal': 40000, 'tanggal': '2024-02-03'},
+        {'id': 4, 'jenis': 'pengeluaran', 'kategori': 'Transportasi', 'nominal': 12000, 'tanggal': '2024-02-28'},
+        {'id': 5, 'jenis': 'pemasukan', 'kategori': 'Bonus', 'nominal': 500000, 'tanggal': '2024-03-01'},
+    ]
+
+
+# Agregasi dan query dari buffer mmap sama dengan match_filters/group_by_category atas dict-nya
+def test_snapshot_filters_match_python_filters(tmp_path):
+    path = str(tmp_path / 'database.bin')
+    save_binary(_rows(), path)
+    with BinarySnapshot(path) as snapshot:
+        for filters in [None, ('Semua', 'Semua', '2024-01-10', '2024-02-28'),
+                        ('pengeluaran', 'MAKAN', '2024-01-01', '2024-12-31'),
+                        ('pemasukan', 'Makan', '2024-01-01', '2024-12-31')]:
+            rows = [Transaksi.from_dict(t) for t in _rows()]
+            expect = [t for t in rows if filters is None or match_filters(t, filters)]
+            assert snapshot.category_totals(filters) == group_by_category(expect)
+            if filters is not None:
+                assert [t.id for t in snapshot.query(filters)] == [t.id for t in expect]
+
+
+# Selama riwayat belum dimuat, engine dengan backend biner menjawab diagram dan filter dari snapshot
+def test_engine_answers_from_snapshot_before_load(tmp_path):
+    config = {'storage_mode': 'binary'}
+    engine = LedgerEngine(str(tmp_path), config=config, background=False)
+    for t in _rows():
+        engine.add(t['jenis'], t['kategori'], t['nominal'], t['tanggal'])
+    filters = ('pengeluaran', 'Semua', '2024-02-01', '2024-02-29')
+    expect = engine.category_totals(None), engine.category_totals(filters), engine.query(filters)
+    engine.close()
+
+    lazy = LedgerEngine(str(tmp_path), config=config, background=False, load=False)
+    assert lazy.can_query
+    assert lazy.category_totals(None) == expect[0]
+    assert lazy.category_totals(filters) == expect[1] == ({}, {'makan': 40000, 'Transportasi': 12000})
+    assert [t.id for t in lazy.query(filters)] == [t.id for t in expect[2]]
+    lazy.close()
+
+
+# Baris yang tanggalnya sama diurutkan menurut id, seperti DateIndex setelah data dimuat
+def test_snapshot_query_orders_same_day_rows_by_id(tmp_path):
+    path = str(tmp_path / 'database.bin')
+    rows = [dict(t, tanggal='2024-01-01') for t in reversed(_rows())]
+    save_binary(rows, path)
+    with BinarySnapshot(path) as snapshot:
+        assert [t.id for t in snapshot.query(('Semua', 'Semua', '2024-01-01', '2024-01-01'))] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize('nilai', [{'nominal': True}, {'id': False}, {'nominal': 2 ** 63}, {'id': -2 ** 64}])
+def test_encode_rejects_bool_and_out_of_range(nilai):
+    with pytest.raises(ValueError):
+        encode_records([dict(_rows()[0], **nilai)])
@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('matplotlib')
+
+from keuangan import chart  # noqa: E402
+from keuangan.chart import ChartWorker, PieChartRenderer  # noqa: E402
+
+
+def test_renderer_returns_rgba_of_requested_size():
+    rgba, lebar, tinggi = PieChartRenderer().render({"Gaji": 900000}, {"Makan": 300000, "Hiburan": 0}, 320, 200)
+    assert (lebar, tinggi) == (320, 200)
+    assert len(rgba) == lebar * tinggi * 4
+
+
+# Permintaan yang menumpuk selama menggambar digabung: hanya yang terakhir digambar
+def test_worker_coalesces_pending_requests(monkeypatch):
+    calls = []
+    lanjut = threading.Event()
+
+    class Renderer:
+        def render(self, pemasukan, pengeluaran, width, height):
+            calls.append((pemasukan, pengeluaran, width, height))
+            if len(calls) == 1:
+                lanjut.wait(5)
+            return b'', width, height
+    monkeypatch.setattr(chart, 'PieChartRenderer', Renderer)
+
+    rendered = []
+    selesai = threading.Event()
+
+    def on_rendered(rgba, lebar, tinggi, durasi_ms):
+        rendered.append((lebar, tinggi))
+        if lebar == 40:
+            selesai.set()
+    worker = ChartWorker(on_rendered)
+    worker.start()
+    pemasukan = {"Gaji": 1}
+    worker.request(pemasukan, {}, 10, 10)
+    while not calls:
+        time.sleep(0.001)
+    for lebar in (20, 30, 40):
+        worker.request(pemasukan, {}, lebar, lebar)
+    pemasukan["Gaji"] = 2  # Permintaan menyimpan salinan, bukan dict milik pemanggil
+    lanjut.set()
+    assert selesai.wait(5)
+    worker.stop()
+    assert rendered == [(10, 10), (40, 40)]
+    assert calls[1] == ({"Gaji": 1}, {}, 40, 40)
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from keuangan import LedgerEngine, Transaksi, group_by_category
+
+np = pytest.importorskip('numpy')
+from keuangan.columnar import ColumnarStore  # noqa: E402
+
+
+def _t(transaksi_id, jenis, nominal, tanggal, kategori):
+    return Transaksi(transaksi_id, jenis, kategori, nominal, tanggal)
+
+
+def _check(store, records, filters=None):
+    expect = group_by_category(records)
+    assert store.category_totals(filters) == (dict(expect[0]), dict(expect[1]))
+
+
+# Baris tetap urut id setelah hapus, sisip ulang (undo) dan pemadatan, dan total selalu sama
+# dengan group_by_category atas data yang tersisa
+def test_category_totals_follow_add_remove_and_reinsert():
+    rng = random.Random(8)
+    records = {i: _t(i, rng.choice(['pemasukan', 'pengeluaran']), rng.randint(1, 10**6),
+                     '2024-0%d-1%d' % (rng.randint(1, 9), rng.randint(0, 9)),
+                     rng.choice(['Gaji', 'Makan', 'makan', 'Transportasi']))
+               for i in range(1, 3001)}
+    store = ColumnarStore(reversed(list(records.values())), capacity=16)
+    _check(store, records.values())
+    removed = []
+    for i in rng.sample(sorted(records), 2000):
+        store.remove(records[i])
+        removed.append(records.pop(i))
+    _check(store, records.values())
+    for t in removed[:500]:
+        store.add(t)
+        records[t.id] = t
+    assert list(store.ids[:store.size]) == sorted(store.ids[:store.size])
+    _check(store, records.values())
+    filters = ('Semua', 'Makan', '2024-02-01', '2024-06-30')
+    ref = [t for t in records.values() if t.kategori.lower() == 'makan' and '2024-02-01' <= t.tanggal <= '2024-06-30']
+    _check(store, ref, filters)
+    with pytest.raises(KeyError):
+        store.remove(removed[-1])
+
+
+def test_engine_columnar_matches_python_aggregation(tmp_path):
+    engine = LedgerEngine(str(tmp_path), config={'columnar_store': True}, background=False)
+    a = engine.add('pemasukan', 'Gaji', 500000, '2024-01-01')
+    b = engine.add('pengeluaran', 'Makan', 20000, '2024-01-02')
+    engine.add('pengeluaran', 'Transportasi', 7000, '2024-01-03')
+    engine.edit(b.id, 'pengeluaran', 'Makan', 25000, '2024-01-02')
+    engine.delete(a.id)
+    engine.undo()
+    assert engine.columnar.category_totals() == ({'Gaji': 500000}, {'Makan': 25000, 'Transportasi': 7000})
+    engine.close()
+
+
+# Dengan 'columnar_store' saldo, total baris tabel dan diagram (termasuk rentang per bulan penuh
+# yang biasanya dari rollup) dihitung dari kolom NumPy, hasilnya sama dengan engine tanpa kolom
+def test_engine_routes_aggregates_through_columnar(tmp_path, monkeypatch):
+    (tmp_path / 'biasa').mkdir()
+    (tmp_path / 'kolom').mkdir()
+    biasa = LedgerEngine(str(tmp_path / 'biasa'), config={}, background=False)
+    kolom = LedgerEngine(str(tmp_path / 'kolom'), config={'columnar_store': True}, background=False)
+    for engine in (biasa, kolom):
+        engine.add('pemasukan', 'Gaji', 500000, '2024-01-01')
+        engine.add('pengeluaran', 'Makan', 20000, '2024-01-02')
+        engine.add('pengeluaran', 'Transportasi', 7000, '2024-02-03')
+    calls = []
+    for name in ('saldo', 'totals', 'category_totals'):
+        method = getattr(kolom.columnar, name)
+        monkeypatch.setattr(kolom.columnar, name, lambda *a, _m=method, _n=name: calls.append(_n) or _m(*a))
+    filters = ('Semua', 'Semua', '2024-01-01', '2024-02-29')
+    assert kolom.saldo == biasa.saldo == 473000
+    assert kolom.filter_totals(filters) == biasa.filter_totals(filters) == (500000, 27000)
+    assert kolom.category_totals(filters) == biasa.category_totals(filters)
+    assert kolom.category_totals(None) == biasa.category_totals(None)
+    assert set(calls) == {'saldo', 'totals', 'category_totals'} and calls.count('category_totals') == 2
+    biasa.close()
+    kolom.close()
+
+
+def test_more_than_uint16_categories():
+    store = ColumnarStore(_t(i, 'pengeluaran', 1, '2024-01-01', 'k%d' % i) for i in range(1, 70002))
+    pemasukan, pengeluaran = store.category_totals()
+    assert len(pengeluaran) == 70001 and pengeluaran['k70001'] == 1
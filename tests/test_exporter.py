@@ -0,0 +1,88 @@
+import json
+import threading
+
+import pytest
+
+from keuangan import ExportCancelled, LedgerEngine, Transaksi, export_transactions, read_import
+from keuangan.exporter import main
+
+
+def _rows(n):
+    return [Transaksi(i, 'pengeluaran' if i % 2 else 'pemasukan', "Hiburan" if i % 2 else "Gaji",
+                      1000 * i, f'2024-05-{i % 28 + 1:02d}') for i in range(1, n + 1)]
+
+
+def _chunks(rows, size=3):
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+
+# Hasil ekspor bisa diimpor lagi tanpa perubahan
+@pytest.mark.parametrize('nama', ['hasil.csv', 'hasil.jsonl', 'hasil.ndjson'])
+def test_export_round_trips_through_import(tmp_path, nama):
+    rows = _rows(10)
+    path = str(tmp_path / nama)
+    progress = []
+    jumlah = export_transactions(_chunks(rows), path, 10, lambda selesai, total: progress.append((selesai, total)))
+    assert jumlah == 10
+    assert progress == [(3, 10), (6, 10), (9, 10), (10, 10)]
+    imported, errors = read_import(path)
+    assert errors == []
+    assert imported == [(t.jenis, t.kategori, t.nominal, t.tanggal) for t in rows]
+    assert not (tmp_path / (nama + '.tmp')).exists()
+
+
+def test_jsonl_keeps_ids(tmp_path):
+    path = tmp_path / 'hasil.jsonl'
+    export_transactions(_chunks(_rows(4)), str(path))
+    assert [json.loads(line)['id'] for line in path.read_text(encoding='utf-8').splitlines()] == [1, 2, 3, 4]
+
+
+# Ekspor yang dibatalkan di tengah jalan tidak menyentuh file tujuan yang sudah ada
+def test_cancel_leaves_existing_target(tmp_path):
+    path = tmp_path / 'hasil.csv'
+    path.write_text('lama\n', encoding='utf-8')
+    cancel = threading.Event()
+
+    def progress(selesai, total):
+        assert (tmp_path / 'hasil.csv.tmp').exists()
+        if selesai >= 6:
+            cancel.set()
+    with pytest.raises(ExportCancelled):
+        export_transactions(_chunks(_rows(10)), str(path), 10, progress, cancel)
+    assert path.read_text(encoding='utf-8') == 'lama\n'
+    assert not (tmp_path / 'hasil.csv.tmp').exists()
+
+
+# Kegagalan di tengah chunk (misalnya saat membaca data) juga membuang file .tmp
+def test_failure_removes_tmp_file(tmp_path):
+    def chunks():
+        yield _rows(3)
+        raise OSError("gagal membaca")
+    with pytest.raises(OSError):
+        export_transactions(chunks(), str(tmp_path / 'hasil.jsonl'))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_extension_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='.xlsx'):
+        export_transactions([_rows(1)], str(tmp_path / 'hasil.xlsx'))
+    assert list(tmp_path.iterdir()) == []
+
+
+# Ekspor dari baris perintah memakai filter dan tidak menulis apa pun ke folder data
+def test_main_exports_filtered_rows(tmp_path, capsys):
+    data = tmp_path / 'data'
+    data.mkdir()
+    engine = LedgerEngine(str(data), config={}, background=False)
+    engine.add('pengeluaran', 'Hiburan', 50000, '2024-05-01')
+    engine.add('pemasukan', 'Gaji', 900000, '2024-05-02')
+    engine.add('pengeluaran', 'Makan', 20000, '2024-06-01')
+    engine.close()
+    isi = sorted(p.name for p in data.iterdir())
+
+    tujuan = tmp_path / 'mei.csv'
+    main([str(tujuan), '--dir', str(data), '--dari', '2024-05-01', '--sampai', '2024-05-31',
+          '--jenis', 'pengeluaran'])
+    assert "1 transaksi diekspor" in capsys.readouterr().out
+    assert read_import(str(tujuan)) == ([('pengeluaran', 'Hiburan', 50000, '2024-05-01')], [])
+    assert sorted(p.name for p in data.iterdir()) == isi
@@ -0,0 +1,163 @@
+import json
+
+import pytest
+
+from keuangan import CommandLog, LedgerEngine, Transaksi
+from keuangan.history import HistoryFile
+
+
+def _t(transaksi_id, nominal=1000):
+    return Transaksi(transaksi_id, 'pengeluaran', 'Makan', nominal, '2024-05-01')
+
+
+def _reload(path, **kwargs):
+    log = CommandLog(path, **kwargs)
+    log.load()
+    return log
+
+
+def test_commands_survive_reload(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    log = CommandLog(path)
+    log.record('add', [(None, _t(1))])
+    log.record('edit', [(_t(1), _t(1, 2000))])
+    log.record('delete', [(_t(1, 2000), None)])
+    log.undo()
+    log.undo()
+    log.redo()
+    again = _reload(path)
+    assert [c[0] for c in again.undo_stack] == ['add', 'edit']
+    assert [c[0] for c in again.redo_stack] == ['delete']
+    assert again.peek_undo()[1] == ((_t(1), _t(1, 2000)),)
+    assert again.records == 3
+
+
+def test_large_command_is_written_in_chunks(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    log = CommandLog(path)
+    log.file.chunk_records = 100
+    changes = [(None, _t(i)) for i in range(1, 351)]
+    log.record('import', changes)
+    with open(path) as f:
+        kinds = [json.loads(line)[0] for line in f]
+    assert kinds == ['p', 'p', 'p', 'c']
+    assert _reload(path).peek_undo() == ('import', tuple(changes))
+
+
+def test_chunks_without_closing_line_are_ignored(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    log = CommandLog(path)
+    log.record('add', [(None, _t(1))])
+    log.file.chunk_records = 2
+    log.record('import', [(None, _t(i)) for i in range(2, 7)])
+    with open(path) as f:
+        lines = f.readlines()
+    # Aplikasi berhenti di tengah penulisan impor: penutup hilang dan potongan terakhir terpotong
+    with open(path, 'w') as f:
+        f.writelines(lines[:-2])
+        f.write(lines[-2][:10])
+    again = _reload(path)
+    assert [c[0] for c in again.undo_stack] == ['add']
+    again.record('delete', [(_t(1), None)])
+    assert [c[0] for c in _reload(path).undo_stack] == ['add', 'delete']
+
+
+def test_compaction_keeps_both_stacks(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    log = CommandLog(path, compact_bytes=2000)
+    log.file.chunk_records = 3
+    for i in range(1, 101):
+        log.record('import', [(None, _t(i * 10 + j)) for j in range(5)])
+    for _ in range(10):
+        log.undo()
+    again = _reload(path)
+    assert list(again.undo_stack) == list(log.undo_stack)
+    assert again.redo_stack == log.redo_stack
+    assert again.records == log.records == 500
+
+
+def test_max_records_evicts_oldest_but_keeps_newest():
+    log = CommandLog(None, max_records=3)
+    for i in range(5):
+        log.record('add', [(None, _t(i))])
+    assert len(log.undo_stack) == 3
+    log.record('import', [(None, _t(i)) for i in range(10)])
+    assert len(log.undo_stack) == 1 and log.records == 10
+
+
+def test_failed_append_is_rolled_back(tmp_path, monkeypatch):
+    path = str(tmp_path / 'history.jsonl')
+    history = HistoryFile(path)
+    history.write_batch([('c', ('add', ((None, _t(1)),)))])
+    ukuran = (tmp_path / 'history.jsonl').stat().st_size
+
+    import builtins
+    asli = builtins.open
+
+    class Torn:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def write(self, teks):
+            self.f.write(teks[:7])
+            self.f.flush()
+            raise OSError("disk penuh")
+
+    monkeypatch.setattr(builtins, 'open', lambda *a, **k: Torn(asli(*a, **k)) if a[1:2] == ('a',) else asli(*a, **k))
+    with pytest.raises(OSError):
+        history.write_batch([('c', ('add', ((None, _t(2)),)))])
+    monkeypatch.undo()
+    assert (tmp_path / 'history.jsonl').stat().st_size == ukuran
+    history.write_batch([('c', ('add', ((None, _t(2)),)))])
+    assert [c[1][0][1].id for c in _reload(path).undo_stack] == [1, 2]
+
+
+@pytest.mark.parametrize('background', [False, True])
+def test_engine_undo_redo_survives_restart(tmp_path, background):
+    engine = LedgerEngine(str(tmp_path), config={}, background=background)
+    a = engine.add('pengeluaran', 'Makan', 5000, '2024-01-02')
+    b = engine.add('pemasukan', 'Gaji', 90000, '2024-01-03')
+    engine.edit(a.id, 'pengeluaran', 'Makan', 7000, '2024-01-05')
+    engine.delete(b.id)
+    engine.add_many([('pengeluaran', 'X', 1, '2024-02-01')] * 3)
+    assert engine.undo()[0] == 'import' and len(engine.transaksi) == 1
+    assert engine.undo()[0] == 'delete' and engine.get(b.id) == b
+    assert engine.undo()[0] == 'edit' and engine.get(a.id) == a
+    assert engine.redo()[0] == 'edit'
+    engine.close()
+
+    engine = LedgerEngine(str(tmp_path), config={}, background=background)
+    assert engine.get(a.id).nominal == 7000 and engine.get(b.id) == b
+    assert engine.redo()[0] == 'delete' and engine.get(b.id) is None
+    assert engine.redo()[0] == 'import' and len(engine.transaksi) == 4
+    assert engine.redo() is None
+    while engine.undo() is not None:
+        pass
+    assert not engine.transaksi
+    baru = engine.add('pemasukan', 'Y', 1, '2024-01-01')
+    assert baru.id > 5  # Id yang masih disebut riwayat tidak dipakai ulang
+    engine.close()
+
+
+# Perintah baru setelah undo membuang redo, juga di file riwayat
+def test_new_command_clears_redo(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    log = CommandLog(path)
+    log.record('add', [(None, _t(1))])
+    log.record('add', [(None, _t(2))])
+    log.undo()
+    assert log.peek_redo() == ('add', ((None, _t(2)),))
+    log.record('edit', [(_t(1), _t(1, 5000))])
+    again = _reload(path)
+    assert [c[0] for c in again.undo_stack] == ['add', 'edit'] and again.redo_stack == []
+    assert again.records == 2
+    assert again.peek_undo() == ('edit', ((_t(1), _t(1, 5000)),))
+    again.undo()
+    again.redo()
+    assert again.peek_redo() is None and again.peek_undo()[0] == 'edit'
@@ -0,0 +1,97 @@
+import pytest
+
+from keuangan import ImportRowError, iter_import_batches, parse_amount, read_import
+from keuangan.importer import map_category, parse_date
+
+
+@pytest.mark.parametrize('teks, expected', [
+    ('1.500.000', 1500000),
+    ('Rp 1.500.000', 1500000),
+    ('1.500.000,00', 1500000),
+    ('1,500,000.00', 1500000),
+    ('1,500', 1500),
+    ('150000.00', 150000),
+    ('-150000.00', -150000),
+    ('(25.000)', -25000),
+    ('IDR 75000', 75000),
+    ('12,00', 12),
+])
+def test_parse_amount(teks, expected):
+    assert parse_amount(teks) == (expected, None)
+
+
+@pytest.mark.parametrize('teks', ['12.50', '1.5', '12,50', 'abc', ''])
+def test_parse_amount_rejects_fractions_and_text(teks):
+    assert parse_amount(teks) == (None, None)
+
+
+@pytest.mark.parametrize('teks', ['1.500.00', '150000.000', '1,500.000'])
+def test_parse_amount_ambiguous_separators(teks):
+    with pytest.raises(ValueError):
+        parse_amount(teks)
+
+
+def test_parse_amount_debit_credit_suffix():
+    assert parse_amount('25.000 DB') == (25000, 'pengeluaran')
+    assert parse_amount('1.000.000 CR') == (1000000, 'pemasukan')
+
+
+@pytest.mark.parametrize('teks, expected', [
+    ('2024-05-01', '2024-05-01'),
+    ('01/05/2024', '2024-05-01'),
+    ('01-05-2024', '2024-05-01'),
+    ('01/05/24', '2024-05-01'),
+    ('2024/05/01', '2024-05-01'),
+    ('01.05.2024', '2024-05-01'),
+    ('31/02/2024', None),
+    ('kemarin', None),
+])
+def test_parse_date(teks, expected):
+    assert parse_date(teks) == expected
+
+
+def test_category_keywords_match_whole_words():
+    assert map_category('pengeluaran', '', 'bayar kos juni') == "Kos / Sewa Tempat Tinggal"
+    assert map_category('pengeluaran', '', 'beli kosmetik') == "Lainnya"
+    assert map_category('pengeluaran', '', 'TOL CIPULARANG') == "Transportasi"
+    assert map_category('pengeluaran', '', 'kontrol dokter') == "Lainnya"
+    assert map_category('pengeluaran', '', 'makanan kucing') == "Makan & Minum"
+
+
+def test_read_csv(tmp_path):
+    path = tmp_path / 'mutasi.csv'
+    path.write_text("Tanggal;Keterangan;Mutasi\n"
+                    "01/05/2024;GOFOOD;25.000 DB\n"
+                    "02/05/2024;Gaji;1.500.000,00 CR\n"
+                    "03/05/2024;Salah;1.500.00\n"
+                    "bukan tanggal;X;1.000\n", encoding='utf-8')
+    rows, errors = read_import(str(path))
+    assert rows == [('pengeluaran', "Makan & Minum", 25000, '2024-05-01'),
+                    ('pemasukan', "Lainnya", 1500000, '2024-05-02')]
+    assert [e.line for e in errors] == [4, 5]
+    assert all(isinstance(e, ImportRowError) for e in errors)
+
+
+def test_read_jsonl_reports_non_object_lines(tmp_path):
+    path = tmp_path / 'transaksi.jsonl'
+    path.write_text('{"tanggal": "2024-05-01", "jenis": "pengeluaran", "kategori": "Hiburan", "nominal": 50000}\n'
+                    '[1, 2]\n'
+                    '"x"\n'
+                    '{"tanggal": "2024-05-02", "jenis": "pemasukan", "kategori": "Bonus", "nominal": "150000.00"}\n',
+                    encoding='utf-8')
+    rows, errors = read_import(str(path))
+    assert rows == [('pengeluaran', "Hiburan", 50000, '2024-05-01'), ('pemasukan', "Bonus", 150000, '2024-05-02')]
+    assert [e.line for e in errors] == [2, 3]
+
+
+# File dibaca per batch; baris yang gagal ikut dihitung dalam ukuran batch
+def test_import_batches(tmp_path):
+    path = tmp_path / 'mutasi.csv'
+    path.write_text("tanggal,nominal,keterangan\n" +
+                    "".join(f"2024-05-{i:02d},{'x' if i == 3 else i * 1000},Gaji\n" for i in range(1, 8)),
+                    encoding='utf-8')
+    progress = []
+    batches = list(iter_import_batches(str(path), batch_size=3, progress=lambda *a: progress.append(a)))
+    assert [(len(rows), [e.line for e in errors]) for rows, errors in batches] == [(2, [4]), (3, []), (1, [])]
+    assert batches[0][0][0] == ('pemasukan', "Lainnya", 1000, '2024-05-01')
+    assert progress[-1] == (path.stat().st_size, path.stat().st_size)
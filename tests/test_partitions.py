@@ -0,0 +1,52 @@
+import json
+import os
+
+from keuangan import PartitionedStorage
+
+
+def _row(transaksi_id, tanggal):
+    return {'id': transaksi_id, 'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': 1000, 'tanggal': tanggal}
+
+
+def _stored_ids(directory):
+    ids = set()
+    for name in os.listdir(directory):
+        if name != 'manifest.json':
+            with open(os.path.join(directory, name)) as f:
+                ids.update(t['id'] for t in json.load(f))
+    return ids
+
+
+# Partisi yang diubah di awal batch lalu dibuang dari cache LRU tidak boleh dibaca ulang dari
+# file di tengah batch yang sama; perubahan sebelumnya akan hilang
+def test_write_batch_keeps_changes_of_evicted_partition(tmp_path):
+    directory = str(tmp_path / 'database.parts')
+    rows = [_row(bulan * 10 + i, f'2024-{bulan:02d}-{i + 1:02d}') for bulan in range(1, 7) for i in range(10)]
+    PartitionedStorage(directory, db_file=str(tmp_path / 'database.json')).write_batch([('add', t) for t in rows])
+
+    # Cache kosong: setiap partisi dibaca dari file dan paling banyak satu partisi muat di cache
+    storage = PartitionedStorage(directory, db_file=str(tmp_path / 'database.json'), cache_records=15)
+
+    ops = [('add', _row(100, '2024-01-20'))]
+    ops += [('add', _row(100 + bulan, f'2024-{bulan:02d}-25')) for bulan in range(2, 7)]
+    ops += [('add', _row(200, '2024-01-21'))]
+    storage.write_batch(ops)
+
+    expected = {t['id'] for t in rows} | {op[1]['id'] for op in ops}
+    assert _stored_ids(directory) == expected
+    reopened = PartitionedStorage(directory, db_file=str(tmp_path / 'database.json'))
+    assert {t.id for t in reopened.load()} == expected
+    assert reopened.manifest['partitions']['2024-01']['count'] == 12
+
+
+def test_range_query_opens_only_overlapping_partitions(tmp_path):
+    directory = str(tmp_path / 'database.parts')
+    storage = PartitionedStorage(directory, db_file=str(tmp_path / 'database.json'))
+    storage.write_batch([('add', _row(i + 1, f'2024-{i + 1:02d}-10')) for i in range(12)])
+    reopened = PartitionedStorage(directory, db_file=str(tmp_path / 'database.json'))
+    rows = reopened.query(None, ('Semua', 'Semua', '2024-03-01', '2024-04-30'))
+    assert [t.id for t in rows] == [3, 4]
+    assert reopened._scanned == {'2024-03', '2024-04'}
+    assert reopened.category_totals(None, ('Semua', 'Semua', '2024-03-01', '2024-04-30')) == ({}, {'Makan': 2000})
+    assert reopened._scanned == {'2024-03', '2024-04'}
+    assert reopened.category_totals(None) == ({}, {'Makan': 12000})
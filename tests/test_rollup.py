@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from keuangan import LedgerEngine, RollupCube, Transaksi
+
+
+def _t(transaksi_id, jenis, nominal, tanggal, kategori='Makan'):
+    return Transaksi(transaksi_id, jenis, kategori, nominal, tanggal)
+
+
+def test_cells_follow_add_and_remove():
+    gaji = _t(1, 'pemasukan', 100000, '2024-01-05', 'Gaji')
+    makan = _t(2, 'pengeluaran', 30000, '2024-02-10')
+    cube = RollupCube([gaji, makan, _t(3, 'pengeluaran', 5000, '2024-02-11')])
+    assert cube.month_totals('2024-02') == (0, 35000)
+    assert cube.saldo() == 65000
+    cube.remove(makan)
+    assert cube.saldo() == 95000
+    assert cube.monthly_report() == [('2024-01', 100000, 0, 1), ('2024-02', 0, 5000, 1)]
+
+
+# Sisa target dibandingkan dengan saldo seluruh transaksi; selama riwayat belum dimuat saldo
+# itu dijawab dari rollup yang tersimpan
+def test_saldo_from_stored_rollup_before_load(tmp_path):
+    engine = LedgerEngine(str(tmp_path), config={}, background=False)
+    engine.add('pemasukan', 'Gaji', 2000000, '2023-11-01')
+    engine.add('pengeluaran', 'Makan', 150000, '2024-01-15')
+    b = engine.add('pengeluaran', 'Makan', 50000, '2024-02-15')
+    engine.delete(b.id)
+    saldo = engine.saldo
+    engine.close()
+
+    lazy = LedgerEngine(str(tmp_path), config={}, background=False, load=False)
+    assert not lazy.loaded and lazy.reports_ready
+    assert lazy.saldo == saldo == 1850000
+    lazy.close()
+
+
+
+# Rollup yang ditulis setelah satu batch hanya boleh berisi perubahan di batch itu, walaupun
+# perubahan berikutnya sudah masuk ke memori selagi batch ditulis
+def test_saved_rollup_matches_the_flushed_batch(tmp_path):
+    engine = LedgerEngine(str(tmp_path), config={}, background=True)
+    worker = engine.persistence
+    tulis = worker.storage.write_batch
+    saved = []
+
+    def write_batch(ops, records=None):
+        tulis(ops, records)
+        if not saved:
+            engine.add('pengeluaran', 'Makan', 999, '2024-03-01')
+
+    def save(path, stamp, cells=None):
+        saved.append(dict(cells))
+    worker.storage.write_batch = write_batch
+    engine.rollup.save = save
+    engine.add('pemasukan', 'Gaji', 1000, '2024-03-01')
+    engine.close()
+    assert saved[0] == {('2024-03', 'pemasukan', 'Gaji'): (1000, 1)}
+    assert saved[-1] == engine.rollup.cells
+
+
+# Engine baca-saja (ekspor, benchmark) tidak menulis rollup maupun config.json ke folder pengguna
+def test_read_only_engine_leaves_directory_untouched(tmp_path):
+    from keuangan import save_data
+    from keuangan.exporter import main as export_main
+
+    data = tmp_path / 'data'
+    data.mkdir()
+    save_data([{'id': 1, 'jenis': 'pemasukan', 'kategori': 'Gaji', 'nominal': 1000, 'tanggal': '2024-01-01'}],
+              str(data / 'database.json'))
+    engine = LedgerEngine(str(data), background=False, read_only=True)
+    assert engine.saldo == 1000
+    with pytest.raises(RuntimeError):
+        engine.add('pengeluaran', 'Makan', 500, '2024-01-02')
+    engine.close()
+    export_main([str(tmp_path / 'hasil.csv'), '--dir', str(data)])
+    assert sorted(os.listdir(data)) == ['database.json']
+    assert (tmp_path / 'hasil.csv').exists()
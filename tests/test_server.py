@@ -0,0 +1,121 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from keuangan import LedgerEngine
+from keuangan.client import LedgerClient, ServerError
+from keuangan.server import LedgerServer
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = LedgerEngine(str(tmp_path), config={}, background=False)
+    server = LedgerServer(engine, port=0)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(5)
+    klien = LedgerClient(port=server.port)
+    yield klien
+    klien.close()
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    engine.close()
+
+
+def test_add_edit_delete_undo(client):
+    t = client.add('pengeluaran', 'Makan & Minum', 25000, '2024-05-01')
+    client.add('pemasukan', 'Bonus', 100000, '2024-05-02')
+    assert client.summary(dari='2024-05-01', sampai='2024-05-31') == \
+        {'pemasukan': 100000, 'pengeluaran': 25000, 'saldo': 75000}
+    client.edit(t['id'], 'pengeluaran', 'Makan & Minum', 30000, '2024-05-01')
+    assert client.get(t['id'])['nominal'] == 30000
+    client.delete(t['id'])
+    assert client.query()['total'] == 1
+    assert client.undo() == {'perintah': 'delete', 'jumlah': 1}
+    assert client.get(t['id'])['nominal'] == 30000
+
+
+@pytest.mark.parametrize('body', [
+    {'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': True, 'tanggal': '2024-05-01'},
+    {'jenis': 'pengeluaran', 'kategori': 5, 'nominal': 1000, 'tanggal': '2024-05-01'},
+    {'jenis': ['pengeluaran'], 'kategori': 'Makan', 'nominal': 1000, 'tanggal': '2024-05-01'},
+    {'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': 1000, 'tanggal': '01/05/2024'},
+    {'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': 1000},
+])
+def test_invalid_body_is_400(client, body):
+    with pytest.raises(ServerError) as e:
+        client.request('POST', '/transaksi', body)
+    assert e.value.status == 400
+    assert client.query()['total'] == 0
+
+
+def test_unknown_transaction_is_404(client):
+    with pytest.raises(ServerError) as e:
+        client.delete(99)
+    assert e.value.status == 404
+
+
+# Alamat yang dikenal dengan metode yang salah dijawab 405, bukan 404
+@pytest.mark.parametrize('method, path', [('POST', '/ringkasan'), ('DELETE', '/kategori'), ('PUT', '/laporan'),
+                                          ('GET', '/undo'), ('DELETE', '/transaksi')])
+def test_wrong_method_is_405(client, method, path):
+    with pytest.raises(ServerError) as e:
+        client.request(method, path)
+    assert e.value.status == 405
+
+
+# Baris permintaan yang tidak valid dijawab 400 lalu koneksinya ditutup
+def test_invalid_request_line_is_400(client):
+    import socket
+
+    with socket.create_connection((client.host, client.port), timeout=5) as sock:
+        sock.sendall(b'SAMPAH\r\n\r\n')
+        jawaban = b''
+        while chunk := sock.recv(4096):
+            jawaban += chunk
+    assert jawaban.startswith(b'HTTP/1.1 400 ')
+    assert 'Baris permintaan tidak valid' in jawaban.decode('utf-8')
+    assert b'Connection: close' in jawaban
+
+
+# GUI mengimpor keuangan saat startup; mode server tidak boleh ikut memuat asyncio
+def test_package_import_does_not_load_server():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    kode = ("import sys, keuangan; assert 'asyncio' not in sys.modules and 'http.client' not in sys.modules; "
+            "from keuangan import LedgerServer, LedgerClient, ServerError; "
+            "assert set(keuangan.__all__) <= set(dir(keuangan)) | set(keuangan._LAZY)")
+    subprocess.run([sys.executable, '-c', kode], cwd=root, check=True)
+
+
+# Filter, halaman, total per kategori, laporan bulanan dan redo lewat satu koneksi keep-alive
+def test_query_reports_and_redo(client):
+    for i in range(5):
+        kategori = 'Hiburan' if i % 2 else 'Makan & Minum'
+        client.add('pengeluaran', kategori, 1000 * (i + 1), f'2024-0{5 + i // 3}-0{i + 1}')
+    client.add('pemasukan', 'Gaji', 50000, '2024-05-01')
+    halaman = client.query(jenis='pengeluaran', offset=1, limit=2)
+    assert halaman['total'] == 5 and halaman['offset'] == 1
+    assert [t['tanggal'] for t in halaman['items']] == ['2024-05-02', '2024-05-03']
+    assert client.query(kategori='hiburan')['total'] == 2
+    assert client.category_totals(dari='2024-05-01', sampai='2024-05-31') == \
+        {'pemasukan': {'Gaji': 50000}, 'pengeluaran': {'Makan & Minum': 4000, 'Hiburan': 2000}}
+    assert client.monthly_report(jenis='pengeluaran') == [
+        {'bulan': '2024-05', 'pemasukan': 0, 'pengeluaran': 6000, 'jumlah': 3},
+        {'bulan': '2024-06', 'pemasukan': 0, 'pengeluaran': 9000, 'jumlah': 2}]
+    client.undo()
+    assert client.query()['total'] == 5
+    assert client.redo() == {'perintah': 'add', 'jumlah': 1}
+    assert client.summary()['saldo'] == 50000 - 15000
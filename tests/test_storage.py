@@ -0,0 +1,120 @@
+import builtins
+import json
+import os
+
+import pytest
+
+from keuangan import LedgerEngine, TransactionJournal, create_storage
+
+STORAGE_MODES = ['json', 'journal', 'sqlite', 'binary', 'partitioned']
+
+
+def _snapshot(engine):
+    return sorted((t.id, t.jenis, t.kategori, t.nominal, t.tanggal) for t in engine.transaksi.values())
+
+
+@pytest.mark.parametrize('mode', STORAGE_MODES)
+@pytest.mark.parametrize('background', [False, True])
+def test_engine_round_trip(tmp_path, mode, background):
+    config = {'storage_mode': mode}
+    engine = LedgerEngine(str(tmp_path), config=dict(config), background=background)
+    a = engine.add('pengeluaran', 'Makan & Minum', 25000, '2024-01-31')
+    b = engine.add('pemasukan', 'Beasiswa', 1500000, '2024-02-01')
+    engine.add_many([('pengeluaran', 'Transportasi', 1000 + i, f'2023-12-{i + 1:02d}') for i in range(20)])
+    engine.edit(a.id, 'pengeluaran', 'Hiburan', 30000, '2024-03-01')
+    engine.delete(b.id)
+    expected = _snapshot(engine)
+    engine.close()
+
+    reopened = LedgerEngine(str(tmp_path), config=dict(config), background=False)
+    assert _snapshot(reopened) == expected
+    assert reopened.totals.pengeluaran == sum(t[3] for t in expected)
+    assert reopened.next_id == max(t[0] for t in expected) + 1
+    reopened.close()
+
+
+# Backend json/biner menulis ulang seluruh transaksi; salinannya diambil sekali per batch oleh
+# PersistenceWorker, bukan di thread pemanggil untuk setiap perubahan
+@pytest.mark.parametrize('mode', ['json', 'binary'])
+def test_background_snapshot_is_taken_once_per_batch(tmp_path, mode):
+    engine = LedgerEngine(str(tmp_path), config={'storage_mode': mode}, background=True)
+    worker = engine.persistence
+    snapshot = worker.snapshot
+    calls = []
+    worker.snapshot = lambda: calls.append(1) or snapshot()
+    for i in range(50):
+        engine.add('pengeluaran', 'Makan', 1000 + i, '2024-01-01')
+    expected = _snapshot(engine)
+    engine.close()
+    assert 1 <= len(calls) < 10
+    reopened = LedgerEngine(str(tmp_path), config={'storage_mode': mode}, background=False)
+    assert _snapshot(reopened) == expected
+    reopened.close()
+
+
+@pytest.mark.parametrize('mode', STORAGE_MODES)
+def test_existing_database_json_is_picked_up(tmp_path, mode):
+    rows = [{'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': 5000, 'tanggal': '2024-01-02'},
+            {'id': 7, 'jenis': 'pemasukan', 'kategori': 'Gaji', 'nominal': 9000, 'tanggal': '2024-01-03'}]
+    (tmp_path / 'database.json').write_text(json.dumps(rows))
+    storage = create_storage(mode, str(tmp_path))
+    loaded = sorted(storage.load(), key=lambda t: t['tanggal'])
+    assert [t['nominal'] for t in loaded] == [5000, 9000]
+    storage.close()
+
+
+def _journal(tmp_path):
+    return TransactionJournal(str(tmp_path / 'database.journal'), str(tmp_path / 'database.snapshot.json'),
+                              db_file=str(tmp_path / 'database.json'))
+
+
+def _add(transaksi_id):
+    return ('add', {'id': transaksi_id, 'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': 1000,
+                    'tanggal': '2024-01-01'})
+
+
+# Penulisan yang gagal di tengah lalu diulang tidak boleh menyisakan potongan baris yang
+# menyambung dengan catatan berikutnya
+def test_journal_failed_append_is_rolled_back(tmp_path, monkeypatch):
+    journal = _journal(tmp_path)
+    journal.write_batch([_add(1)])
+    asli = builtins.open
+
+    class Torn:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def write(self, teks):
+            self.f.write(teks[:10])
+            self.f.flush()
+            raise OSError("disk penuh")
+
+    monkeypatch.setattr(builtins, 'open', lambda *a, **k: Torn(asli(*a, **k)) if a[1:2] == ('a',) else asli(*a, **k))
+    with pytest.raises(OSError):
+        journal.write_batch([_add(2)])
+    monkeypatch.undo()
+    journal.write_batch([_add(2)])
+    journal.write_batch([_add(3)])
+    assert sorted(t['id'] for t in _journal(tmp_path).load()) == [1, 2, 3]
+
+
+def test_journal_skips_bad_line_and_truncates_torn_tail(tmp_path):
+    journal = _journal(tmp_path)
+    journal.write_batch([_add(1)])
+    with open(journal.journal_file, 'a') as f:
+        f.write('{"seq": 2, "op": "ad\n')
+        f.write('[1,2]\n{}\n{"op": "add", "data": {}}\n{"seq": "5", "op": "add"}\n{"seq": 6, "op": "edit"}\n')
+    journal.write_batch([_add(3)])
+    with open(journal.journal_file, 'a') as f:
+        f.write('{"seq": 9, "op"')
+    reopened = _journal(tmp_path)
+    assert sorted(t['id'] for t in reopened.load()) == [1, 3]
+    reopened.write_batch([_add(4)])
+    assert sorted(t['id'] for t in _journal(tmp_path).load()) == [1, 3, 4]
+    assert os.path.getsize(journal.journal_file) > 0
@@ -0,0 +1,74 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('PyQt6.QtWidgets')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from keuangan import Transaksi  # noqa: E402
+
+_APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '- PROJECT AKHIR { STD }.py')
+
+
+@pytest.fixture(scope='module')
+def app_module():
+    spec = importlib.util.spec_from_file_location('aplikasi', _APP_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _t(transaksi_id, tanggal='2024-05-01'):
+    return Transaksi(transaksi_id, 'pengeluaran', 'Makan', 1000, tanggal)
+
+
+def test_row_of_follows_inserts_and_removals(app_module):
+    model = app_module.TransaksiTableModel()
+    rows = [_t(i) for i in range(1, 11)]
+    model.set_rows(rows)
+    assert model.row_of(7) == 6
+    model.insert_row(model.rowCount(), _t(11))
+    assert model.row_of(11) == 10
+    model.remove_row(10)
+    assert model.row_of(11) is None
+    model.remove_row(2)
+    assert model.row_of(7) == 5 and model.row_of(3) is None
+    model.replace_row(0, _t(1, '2024-06-01'))
+    assert model.row_of(1) == 0
+    assert len(rows) == 10  # List dari engine tidak ikut diubah
+
+
+def test_position_keeps_date_order(app_module):
+    model = app_module.TransaksiTableModel()
+    model.set_rows([_t(1, '2024-01-01'), _t(3, '2024-01-03'), _t(4, '2024-01-03')])
+    baru = _t(2, '2024-01-03')
+    model.insert_row(model.position(baru), baru)
+    assert [t.id for t in model.own_rows()] == [1, 2, 3, 4]
+
+
+class _NoScan(list):
+    def __iter__(self):
+        raise AssertionError("baris tidak boleh dipindai")
+
+
+# Footer untuk seluruh data atau hasil filter diambil dari engine, tanpa memindai baris tabel;
+# halaman sebagian selama memuat tetap dijumlah per baris
+def test_footer_totals_come_from_engine(app_module, tmp_path):
+    from types import SimpleNamespace
+
+    from keuangan import LedgerEngine
+
+    engine = LedgerEngine(str(tmp_path), config={}, background=False)
+    engine.add('pemasukan', 'Gaji', 500000, '2024-01-01')
+    engine.add('pengeluaran', 'Makan', 20000, '2024-01-15')
+    engine.add('pengeluaran', 'Makan', 7000, '2024-03-03')
+    footer_totals = app_module.MHSApp.footer_totals
+    window = SimpleNamespace(engine=engine, current_filters=None)
+    assert footer_totals(window, _NoScan()) == {'pemasukan': 500000, 'pengeluaran': 27000}
+    window.current_filters = ('Semua', 'Semua', '2024-01-01', '2024-01-31')
+    assert footer_totals(window, _NoScan()) == {'pemasukan': 500000, 'pengeluaran': 20000}
+    engine.loaded = False
+    window.current_filters = None
+    assert footer_totals(window, [_t(1)]) == {'pemasukan': 0, 'pengeluaran': 1000}
+    engine.close()
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from keuangan import timing
+from keuangan.timing import LatencyHistogram, Profiler, profiled
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for durasi in [0.05] * 50 + [3] * 45 + [40] * 4 + [7000]:
+        histogram.add(durasi)
+    assert histogram.count == 100 and histogram.max_ms == 7000
+    assert histogram.mean_ms == pytest.approx((0.05 * 50 + 3 * 45 + 40 * 4 + 7000) / 100)
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(95) == 5
+    assert histogram.percentile(99) == 50
+    # Di atas kotak terakhir persentil memakai nilai maksimum
+    assert histogram.percentile(100) == 7000
+
+
+# Batas atas kotak tidak melebihi nilai terbesar yang pernah dicatat
+def test_histogram_percentile_capped_at_max():
+    histogram = LatencyHistogram()
+    histogram.add(1.5)
+    assert histogram.percentile(50) == 1.5
+    assert LatencyHistogram().percentile(50) == 0.0
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.span('query'):
+        pass
+    profiler.count('cache_hit')
+    assert profiler.stats() == [] and profiler.counters == {}
+
+
+def test_spans_and_counters():
+    profiler = Profiler(enabled=True)
+    with profiler.span('query'):
+        pass
+    profiler.record('render', 1.0, 1.25)
+    profiler.record('render', 2.0, 2.0005)
+    profiler.count('cache_hit', 3)
+    stats = profiler.stats()
+    assert [(nama, jumlah) for nama, jumlah, *_ in stats] == [('render', 2), ('query', 1)]
+    assert stats[0][2] == pytest.approx(250.5) and stats[0][6] == pytest.approx(250)
+    assert 'cache_hit' in profiler.report()
+    profiler.reset()
+    assert profiler.stats() == [] and profiler.counters == {} and not profiler.trace
+
+
+def test_trace_keeps_newest_events():
+    profiler = Profiler(enabled=True, trace_max=3)
+    for i in range(5):
+        profiler.record(f'span{i}', i, i + 1)
+    assert [event[0] for event in profiler.trace] == ['span2', 'span3', 'span4']
+    assert profiler.histograms['span0'].count == 1
+
+
+def test_export_trace(tmp_path):
+    profiler = Profiler(enabled=True)
+    profiler.record('query', profiler.origin + 0.5, profiler.origin + 0.75)
+    profiler.count('cache_hit')
+    path = tmp_path / 'trace.json'
+    assert profiler.export_trace(str(path)) == 1
+    isi = json.loads(path.read_text())
+    meta = [e for e in isi['traceEvents'] if e['ph'] == 'M']
+    spans = [e for e in isi['traceEvents'] if e['ph'] == 'X']
+    assert [e['args']['name'] for e in meta] == ['MainThread']
+    assert spans[0]['name'] == 'query' and spans[0]['tid'] == meta[0]['tid']
+    assert spans[0]['ts'] == pytest.approx(500000) and spans[0]['dur'] == pytest.approx(250000)
+    assert isi['otherData'] == {'counters': {'cache_hit': 1}}
+    assert [p.name for p in tmp_path.iterdir()] == ['trace.json']
+
+
+def test_profiled_uses_global_profiler(monkeypatch):
+    profiler = Profiler(enabled=True)
+    monkeypatch.setattr(timing, 'PROFILER', profiler)
+
+    @profiled('hitung')
+    def hitung(x):
+        if x < 0:
+            raise ValueError(x)
+        return x * 2
+    assert hitung(4) == 8 and hitung.__name__ == 'hitung'
+    with pytest.raises(ValueError):
+        hitung(-1)
+    assert profiler.histograms['hitung'].count == 2
+    profiler.enabled = False
+    hitung(1)
+    assert profiler.histograms['hitung'].count == 2
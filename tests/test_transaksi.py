@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from keuangan import Transaksi, index_by_id, json_default
+
+
+def test_mapping_is_read_only_and_unhashable():
+    t = Transaksi(1, 'pengeluaran', 'Makan', 5000, '2024-01-01')
+    assert dict(t) == {'id': 1, 'jenis': 'pengeluaran', 'kategori': 'Makan', 'nominal': 5000, 'tanggal': '2024-01-01'}
+    with pytest.raises(TypeError):
+        t['nominal'] = 1
+    with pytest.raises(TypeError):
+        hash(t)
+
+
+# Transaksi lama tanpa id diberi id berurutan setelah id terbesar, dan ikut tertulis ke JSON
+def test_legacy_rows_get_ids():
+    data, next_id = index_by_id([{'jenis': 'pemasukan', 'kategori': 'Gaji', 'nominal': 1, 'tanggal': '2024-01-01'},
+                                 {'id': 7, 'jenis': 'pemasukan', 'kategori': 'Gaji', 'nominal': 2, 'tanggal': '2024-01-02'}])
+    assert list(data) == [8, 7] and next_id == 9
+    assert json.loads(json.dumps(data[8], default=json_default))['id'] == 8
+    assert 'id' not in Transaksi(None, 'pemasukan', 'Gaji', 1, '2024-01-01')